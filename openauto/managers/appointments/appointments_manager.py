@@ -96,6 +96,10 @@ class AppointmentsManager:
 
         self.sql_monitor.small_customers_update.connect(self.ui.customer_table_small.update_customers)
         self.sql_monitor.small_vehicles_update.connect(self.ui.vehicle_table_small.update_vehicles)
+        for table in (self.ui.customer_table_small, self.ui.vehicle_table_small):
+            self.sql_monitor.rows_inserted.connect(table.apply_row_changes)
+            self.sql_monitor.rows_updated.connect(table.apply_row_changes)
+            self.sql_monitor.rows_deleted.connect(table.apply_row_deletes)
 
 
 ### CONNECTS SIGNALS TO ELIMINATE TABLE CELLS USING LINE EDIT AS SEARCH BAR, AND CELLCLICKED ON custoemr_table_small
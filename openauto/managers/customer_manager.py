@@ -1,11 +1,20 @@
 from PyQt6 import QtWidgets, QtCore
 from openauto.ui import new_customer_form
 from openauto.repositories.customer_repository import CustomerRepository
+from openauto.repositories.search_repository import SearchRepository
 from openauto.utils.validator import Validator
 
+SEARCH_DEBOUNCE_MS = 150
+SEARCH_RESULT_LIMIT = 500
+
 class CustomerManager:
     def __init__(self, main_window):
         self.ui = main_window
+        self._search_text = ""
+        self._search_timer = QtCore.QTimer()
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._run_customer_search)
 
 ### OPENS new_customer_form ###
     def open_new_customer(self):
@@ -54,13 +63,32 @@ class CustomerManager:
         QtCore.QTimer.singleShot(0, lambda: QtWidgets.QMessageBox.information(self.ui, "Customer Added",
                         "Customer has been added."))
 
+### DEBOUNCED: ONLY THE TEXT STANDING AFTER A SHORT PAUSE IN TYPING IS SEARCHED ###
     def customer_search_filter(self, text):
-        for row in range(self.ui.customer_table.rowCount()):
-            match = any(
-                text.lower() in (self.ui.customer_table.item(row, col).text().lower() if self.ui.customer_table.item(row, col) else "")
-                for col in range(self.ui.customer_table.columnCount())
-            )
-            self.ui.customer_table.setRowHidden(row, not match)
+        self._search_text = text
+        self._search_timer.start()
+
+    # answered by the in-memory index (services/search_index.py) or FULLTEXT (OPENAUTO_SEARCH=server),
+    # then just the hits are read from MySQL
+    def _run_customer_search(self):
+        text = self._search_text.strip()
+        if not text:
+            self.ui.customer_table.set_search("")
+            return
+        if SearchRepository.enabled():
+            # ranked FULLTEXT hits; a changed row stays only if it was one of them
+            ids = SearchRepository.search_customers(text, limit=SEARCH_RESULT_LIMIT)
+            hits = {str(i) for i in ids}
+            self.ui.customer_table.show_matches(ids, lambda row: str(row[9]) in hits)
+            return
+        index = self.ui.customer_search_index
+        if not index.loaded:
+            # still building on its worker (started at startup); page through the table's LIKE search meanwhile
+            index.load_async()
+            self.ui.customer_table.set_search(text)
+            return
+        ids = index.search(text, limit=SEARCH_RESULT_LIMIT)
+        self.ui.customer_table.show_matches(ids, lambda row: index.matches(row[9], text))
 
 
     def _show_message(self, text):
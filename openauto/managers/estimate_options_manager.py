@@ -64,8 +64,7 @@ class EstimateOptionsManager:
 
     def _open_ro_page(self):
         selected_estimate_row = self.ui.estimates_table.currentRow()
-        model: ROTreeModel = self.ui.ro_items_table.model()
-        model.clear()
+        # no model.clear() here: it would drop the open RO's unsaved journal, and the load may wait on a save
         ro_id = self.estimate_id
         self.ui.ro_hub_manager.load_ro_into_hub(ro_id)
         self.widget_manager.close_and_delete("estimate_options")
@@ -89,6 +89,10 @@ class NewROManager:
 
         self.sql_monitor.small_customers_update.connect(self.ui.customer_table_small.update_customers)
         self.sql_monitor.small_vehicles_update.connect(self.ui.vehicle_table_small.update_vehicles)
+        for table in (self.ui.customer_table_small, self.ui.vehicle_table_small):
+            self.sql_monitor.rows_inserted.connect(table.apply_row_changes)
+            self.sql_monitor.rows_updated.connect(table.apply_row_changes)
+            self.sql_monitor.rows_deleted.connect(table.apply_row_deletes)
 
     def _connect_signals(self):
         self.ui.new_ro_page_ui.customer_search__appt_line.textChanged.connect(self._filter_customers_and_vehicles)
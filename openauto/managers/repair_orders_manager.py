@@ -1,44 +1,213 @@
 from PyQt6 import QtWidgets, QtCore
 from openauto.subclassed_widgets.views import ro_tiles
 from openauto.repositories.repair_orders_repository import RepairOrdersRepository
+from openauto.repositories.ro_totals_repository import ROTotalsRepository
 from openauto.managers.estimate_options_manager import EstimateOptionsManager
 from mysql.connector import Error as MySQLError
 
 from functools import partial
 
 
+# board lane (ui attribute) for each RO status shown on the boards
+LANES = {
+    "open": "estimate_tiles",
+    "approved": "approved_tiles",
+    "working": "working_tiles",
+    "checkout": "checkout_tiles",
+}
 
+# rows per keyset page; a lane loads the next page when scrolled near its bottom
+PAGE_SIZE = 200
+
+
+# board order: NULL ro_numbers first, then ro_number, then id (RepairOrdersRepository._after_sql)
+def _board_key(ro_number, ro_id):
+    return ro_number is not None, str(ro_number or ""), ro_id
+
+
+### KEEPS THE FOUR RO BOARDS IN STEP WITH THE DATABASE, KEYED BY ro_id ###
+    # Tiles are created once and then moved, updated or removed; nothing is cleared and rebuilt.
+    # Each lane shows a keyset window of its status: the first PAGE_SIZE ROs plus any pages loaded by scrolling.
 class RepairOrdersManager:
     def __init__(self, ui):
         self.ui = ui
+        self._wired_lanes = set()
+        self._exhausted: dict[str, bool] = {}
+        self._loading = False
+        RepairOrdersRepository.ensure_board_index()
+        try:
+            ROTotalsRepository.ensure_schema()
+        except Exception as e:
+            print(f"[RepairOrdersManager] Stored RO totals unavailable, summing lines instead: {e}")
         # self.refresh_all()
 
+    def _lane(self, status):
+        status = (status or "").strip().lower()
+        attr = LANES.get(status)
+        container = getattr(self.ui, attr, None) if attr else None
+        if container is not None and id(container) not in self._wired_lanes:
+            self._wire(status, container)
+        return container
+
+    def _lanes(self):
+        return {status: self._lane(status) for status in LANES}
+
+    def _wire(self, status, container):
+        if hasattr(container, "moreRequested"):
+            container.moreRequested.connect(partial(self.load_more, status))
+        if self._is_board(container):
+            container.roActivated.connect(self._open_estimate_options)
+        self._wired_lanes.add(id(container))
+
+    # ROBoardView lanes (OPENAUTO_BOARD=list) take snapshot rows directly; there are no tiles to place
+    @staticmethod
+    def _is_board(container) -> bool:
+        return hasattr(container, "apply_rows")
+
+    def _find_tile(self, ro_id):
+        for container in self._lanes().values():
+            tile = container.tile_for(ro_id) if hasattr(container, "tile_for") else None
+            if tile is not None:
+                return container, tile
+        return None, None
+
+    ### False WHEN row SORTS PAST THE LAST LOADED RO OF A LANE THAT HAS MORE PAGES ###
+    # such a row arrives with its page; showing it early would make the next keyset page skip the ROs between
+    def _in_window(self, status, container, row) -> bool:
+        if self._exhausted.get(status, True):
+            return True
+        last = container.last_key()
+        return last is None or _board_key(row.get("ro_number"), row["ro_id"]) <= _board_key(*last)
+
+    # refreshes re-read as many rows as the lane already shows, so pages loaded by scrolling stay
+    def _snapshot(self, status, container):
+        limit = max(PAGE_SIZE, len(container.ro_ids()))
+        rows = RepairOrdersRepository.board_snapshot(status=status, limit=limit)
+        self._exhausted[status] = len(rows) < limit
+        return rows
+
+    ### FULL RECONCILE: ONE SNAPSHOT QUERY PER LANE, THEN ONLY THE TILES THAT DIFFER ARE TOUCHED ###
+    # set_order drops tiles whose RO left the lane; tiles that changed lanes are moved by _place first
     def refresh_all(self):
-        self.update_tiles(self.ui.estimate_tiles, "open")
-        self.update_tiles(self.ui.approved_tiles, "approved")
-        self.update_tiles(self.ui.working_tiles,  "working")
-        self.update_tiles(self.ui.checkout_tiles, "checkout")
+        wanted = {}
+        for status, container in self._lanes().items():
+            if container is not None:
+                wanted[status] = self._snapshot(status, container)
+
+        for status in [s for s in wanted if self._is_board(self._lane(s))]:
+            self._lane(status).apply_rows(wanted.pop(status))
+
+        # place every row before reordering any lane, so a tile changing lanes is moved, not dropped and rebuilt
+        orders = {status: [self._place(row, self._lane(status), insert=False) for row in rows]
+                  for status, rows in wanted.items()}
+        for status, order in orders.items():
+            self._lane(status).set_order(order)
 
     def update_tiles(self, container, status):
-        container.clear()
-        rows = RepairOrdersRepository.load_repair_orders(status=status, limit=200, offset=0)
-
-        for (ro_id, ro_number, created_at, customer_name, year, make, model, tech, writer, total) in rows:
-            vehicle = f"{year} {make} {model}".strip()
-            tile = ro_tiles.ROTile(
-                ro_id=ro_id,
-                ro_number=ro_number,
-                customer_name=customer_name or "Unknown",
-                vehicle=vehicle or "Unknown",
-                tech=tech or "Unassigned",
-                writer=writer or "Unassigned",
-                concern="No concern entered",
-                status=status,
-                page_context="estimates",
-            )
-            tile.clicked.connect(partial(self._open_estimate_options, ro_id))
-            tile.statusChangeRequested.connect(self._on_status_change_requested)
-            container.add_tile(tile)
+        rows = self._snapshot(status, container)
+        if self._is_board(container):
+            container.apply_rows(rows)
+            return
+        container.set_order([self._place(row, container, insert=False) for row in rows])
+
+    ### NEXT KEYSET PAGE OF A LANE, APPENDED BEHIND ITS LAST RO (moreRequested WHILE SCROLLING) ###
+    def load_more(self, status):
+        container = self._lane(status)
+        if container is None or self._loading or self._exhausted.get(status, True):
+            return
+        self._loading = True
+        try:
+            rows = RepairOrdersRepository.board_snapshot(status=status, limit=PAGE_SIZE, after=container.last_key())
+            self._exhausted[status] = len(rows) < PAGE_SIZE
+            if self._is_board(container):
+                container.append_rows(rows)
+                return
+            order = container.tiles()
+            shown = {id(t) for t in order}
+            for row in rows:
+                tile = self._place(row, container, insert=False)
+                if id(tile) not in shown:
+                    order.append(tile)
+                    shown.add(id(tile))
+            container.set_order(order)
+        finally:
+            self._loading = False
+
+    ### RECONCILES ONLY THE GIVEN ROs (A STATUS CHANGE MOVES ONE TILE) ###
+    def refresh_ros(self, ro_ids):
+        ro_ids = [r for r in (ro_ids or []) if r is not None]
+        if not ro_ids:
+            return
+        rows = RepairOrdersRepository.board_snapshot(ro_ids=ro_ids, limit=len(ro_ids))
+        found = {row["ro_id"] for row in rows}
+        boards = [c for c in self._lanes().values() if self._is_board(c)]
+        if boards:
+            for row in rows:
+                status = (row.get("status") or "").strip().lower()
+                target = self._lane(status)
+                for board in boards:
+                    if board is target and self._in_window(status, board, row):
+                        board.upsert_row(row)
+                    else:
+                        board.remove_ro(row["ro_id"])
+            for ro_id in set(ro_ids) - found:
+                for board in boards:
+                    board.remove_ro(ro_id)
+            return
+
+        for ro_id in ro_ids:
+            if ro_id not in found:
+                container, _tile = self._find_tile(ro_id)
+                if container is not None:
+                    container.remove_tile(ro_id)
+        for row in rows:
+            status = (row.get("status") or "").strip().lower()
+            container = self._lane(status)
+            if container is None or not self._in_window(status, container, row):
+                # archived or otherwise off the boards, or past the loaded pages of its lane
+                old, _tile = self._find_tile(row["ro_id"])
+                if old is not None:
+                    old.remove_tile(row["ro_id"])
+                continue
+            self._place(row, container, insert=True)
+
+    # returns the live tile for row, moved into container and updated, creating it only if it doesn't exist
+    def _place(self, row, container, insert: bool):
+        ro_id = row["ro_id"]
+        old, tile = self._find_tile(ro_id)
+        if tile is None:
+            return self._new_tile(row, container, insert)
+
+        moved = old is not container
+        renumbered = str(tile.ro_number) != str(row.get("ro_number"))
+        tile.apply_snapshot(row)
+        if insert and (moved or renumbered):
+            old.take_tile(ro_id)
+            container.insert_tile(tile)
+        elif moved:
+            old.take_tile(ro_id)
+        return tile
+
+    def _new_tile(self, row, container, insert: bool):
+        ro_id = row["ro_id"]
+        vehicle = f"{row['year']} {row['make']} {row['model']}".strip()
+        tile = ro_tiles.ROTile(
+            ro_id=ro_id,
+            ro_number=row["ro_number"],
+            customer_name=row["customer"] or "Unknown",
+            vehicle=vehicle or "Unknown",
+            tech=row["tech"] or "Unassigned",
+            writer=row["writer"] or "Unassigned",
+            concern="No concern entered",
+            status=row.get("status"),
+            page_context="estimates",
+            meta=row,
+        )
+        tile.clicked.connect(partial(self._open_estimate_options, ro_id))
+        tile.statusChangeRequested.connect(self._on_status_change_requested)
+        if insert:
+            container.insert_tile(tile)
+        return tile
 
 
     def _open_estimate_options(self, ro_id: int):
@@ -54,4 +223,4 @@ class RepairOrdersManager:
         except (ValueError, MySQLError) as e:
             QtWidgets.QMessageBox.critical(self.ui, "Status Update Failed", str(e))
         finally:
-            self.refresh_all()
+            self.refresh_ros([ro_id])
@@ -1,8 +1,25 @@
+import statistics
+import time
+from collections import deque
+
 from PyQt6 import QtCore, QtWidgets
 from openauto.managers.ro_hub.save_estimate_service import SaveEstimateService
 
+
+### DEBOUNCED AUTOSAVE OF THE OPEN RO ###
+    # A save is two steps: SaveEstimateService.snapshot() takes the model's change journal on the GUI thread,
+    # then SaveEstimateService.persist() writes it on a single worker thread. One snapshot is written at a time;
+    # snapshots taken meanwhile are merged into the queued one, so a burst of edits becomes one write.
+    # Results (new job/item ids) come back through _finished and are handed to the model on the GUI thread.
+    # Without a journal (an RO with no estimate yet) the full save still runs synchronously.
 class AutosaveController(QtCore.QObject):
     saved = QtCore.pyqtSignal(int)  # emits estimate_id
+    saving = QtCore.pyqtSignal()
+    saveFailed = QtCore.pyqtSignal(str)
+    _finished = QtCore.pyqtSignal(object, object, object)  # SaveSnapshot, result | None, error | None (worker -> GUI)
+
+    RETRY_MS = 800
+    FAILED_RETRY_MS = 5000
 
     def __init__(self, ui, interval_ms: int = 2500):
         super().__init__(ui)
@@ -10,6 +27,21 @@ class AutosaveController(QtCore.QObject):
         self._dirty = False
         self._paused = 0
         self._timer = None
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._queue = []
+        self._in_flight = None
+        # run once the queue drains (e.g. the RO load waiting for the saves of the RO on screen)
+        self._when_idle = None
+        # job/item ids of earlier saves, read and written on the worker only (SaveEstimateService.persist)
+        self._known = {}
+        self._indicator = None
+        self._state = "idle"
+        # end-to-end (snapshot to ids back in the model) and DB-only times of recent saves, in ms
+        self.latencies = deque(maxlen=50)
+        self.persist_times = deque(maxlen=50)
+        self.failures = 0
+        self._finished.connect(self._on_finished)
         try:
             app = QtWidgets.QApplication.instance()
             if app:
@@ -37,22 +69,126 @@ class AutosaveController(QtCore.QObject):
     def mark_dirty(self):
         self._dirty = True
 
+    # force: try again even without the debounce timer (waiting on the worker, or after a failed write)
+    def _retry(self, ms: int, force: bool = False):
+        if self._timer:
+            self._timer.start(ms)
+        elif force:
+            QtCore.QTimer.singleShot(ms, self.flush_if_dirty)
+
     def _do_save(self):
         if self._paused > 0 or self._is_editing_anything():
-            if self._timer:
-                self._timer.start(800)
+            self._retry(self.RETRY_MS)
             return
 
         if not self._dirty:
             return
+        service = SaveEstimateService(self.ui)
+        snapshot = service.snapshot()
+        if snapshot is None:
+            # the full save reads the tree itself, so it can't leave the GUI thread; queued deltas land first
+            if self.is_busy():
+                self._retry(self.RETRY_MS, force=True)
+                return
+            self._dirty = False
+            self._save_now(service)
+            return
         self._dirty = False
-        est_id = SaveEstimateService(self.ui).save(silent=True)
+        if snapshot.is_empty():
+            return
+        if self._queue and self._queue[-1].can_merge(snapshot):
+            self._queue[-1] = self._queue[-1].merged(snapshot)
+        else:
+            self._queue.append(snapshot)
+        self._start_next()
+
+    def _save_now(self, service):
+        started = time.perf_counter()
+        self._set_state("saving")
+        try:
+            est_id = service.save(silent=True)
+        except Exception as e:
+            print(f"[AutosaveController] Save failed: {e}")
+            self._failed(str(e))
+            return
+        elapsed = (time.perf_counter() - started) * 1000.0
+        self.latencies.append(elapsed)
+        self.persist_times.append(elapsed)
+        self._set_state("saved")
         if est_id:
-            try:
-                self.ui.current_estimate_id = est_id
-            except Exception:
-                pass
-            self.saved.emit(int(est_id))
+            self._emit_saved(est_id)
+
+    def _start_next(self):
+        if self._in_flight is not None or not self._queue:
+            return
+        snapshot = self._in_flight = self._queue.pop(0)
+        known = self._known
+        controller = self
+        self._set_state("saving")
+        self.saving.emit()
+
+        class Task(QtCore.QRunnable):
+            def run(self_nonlocal):
+                try:
+                    result = SaveEstimateService.persist(snapshot, known)
+                except Exception as e:
+                    print(f"[AutosaveController] Save of RO {snapshot.ro_id} failed: {e}")
+                    controller._finished.emit(snapshot, None, str(e))
+                    return
+                controller._finished.emit(snapshot, result, None)
+
+        self._pool.start(Task())
+
+    def _on_finished(self, snapshot, result, error):
+        self._in_flight = None
+        if error is not None:
+            # the changes go back in the journal; the next snapshot picks them up again
+            snapshot.model.restore_changes(snapshot.changes)
+            self._dirty = True
+            self._failed(error)
+            self._retry(self.FAILED_RETRY_MS, force=True)
+            # whatever waited on this save would replace the model holding the unsaved changes
+            if self._when_idle is not None:
+                print("[AutosaveController] Save failed, cancelled the action waiting on it")
+                self._when_idle = None
+        else:
+            SaveEstimateService(self.ui).finish(snapshot, result)
+            self.latencies.append((time.perf_counter() - snapshot.taken_at) * 1000.0)
+            self.persist_times.append(result.get("persist_ms", 0.0))
+            if not self._queue:
+                self._set_state("saved")
+            self._emit_saved(result["estimate_id"])
+        self._start_next()
+        if self._when_idle is not None and not self.is_busy():
+            callback, self._when_idle = self._when_idle, None
+            callback()
+
+    def _emit_saved(self, est_id):
+        try:
+            self.ui.current_estimate_id = est_id
+        except Exception:
+            pass
+        self.saved.emit(int(est_id))
+
+    def _failed(self, error: str):
+        self.failures += 1
+        self._set_state("failed", error)
+        self.saveFailed.emit(error)
+
+    def is_busy(self) -> bool:
+        return self._in_flight is not None or bool(self._queue)
+
+    ### RUNS callback ONCE QUEUED SAVES ARE WRITTEN AND THEIR IDS ARE BACK IN THE MODEL (e.g. BEFORE LOADING AN RO) ###
+    # Right away when nothing is queued, otherwise from _on_finished, so the event loop keeps running meanwhile.
+    # A later call replaces a callback still waiting (only the last RO clicked gets loaded); a failed save
+    # cancels it. Returns True if callback already ran.
+    def call_when_idle(self, callback) -> bool:
+        if not self.is_busy():
+            self._when_idle = None
+            callback()
+            return True
+        self._when_idle = callback
+        return False
 
     def flush_if_dirty(self):
         if not self._dirty:
@@ -71,4 +207,48 @@ class AutosaveController(QtCore.QObject):
             if int(state) != int(QtCore.Qt.ApplicationState.ApplicationActive):
                 self.flush_if_dirty()
         except Exception:
-            pass
\ No newline at end of file
+            pass
+
+    # ---------- saved / saving indicator ----------
+    def attach_indicator(self, label: QtWidgets.QLabel):
+        self._indicator = label
+        self._set_state(self._state)
+
+    ### (last, median, p95) END-TO-END SAVE LATENCY IN ms OVER THE RECENT SAVES, None BEFORE THE FIRST ###
+    def latency_stats(self):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+        return self.latencies[-1], statistics.median(ordered), p95
+
+    def _set_state(self, state: str, error: str = ""):
+        self._state = state
+        label = self._indicator
+        if label is None:
+            return
+        if state == "saving":
+            text = "Saving…"
+        elif state == "saved":
+            text = f"Saved {time.strftime('%I:%M:%S %p')}"
+        elif state == "failed":
+            text = "Save failed, retrying"
+        else:
+            text = ""
+        label.setText(text)
+        tip = []
+        stats = self.latency_stats()
+        if stats:
+            last, median, p95 = stats
+            tip.append(f"Last save {last:.0f} ms · median {median:.0f} ms · p95 {p95:.0f} ms ({len(self.latencies)} saves)")
+        if self.persist_times:
+            tip.append(f"Database time (median): {statistics.median(self.persist_times):.0f} ms")
+        if self.failures:
+            tip.append(f"Failed saves: {self.failures}")
+        if error:
+            tip.append(error)
+        label.setToolTip("\n".join(tip))
+        label.setProperty("saveState", state)
+        style = label.style()
+        style.unpolish(label)
+        style.polish(label)
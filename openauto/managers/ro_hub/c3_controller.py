@@ -29,10 +29,10 @@ class C3Controller(QtCore.QObject):
             self._button_correction.clicked.connect(lambda: self._switch_tab(1))
 
 
-    # Call whenever an ro is opened/changed
-    def set_ro_id(self, ro_id: Optional[int]):
+    # Call whenever an ro is opened/changed; lines: the RO's C3 rows if the caller already has them (ROSnapshot.c3)
+    def set_ro_id(self, ro_id: Optional[int], lines: Optional[list] = None):
         self._ro_id = ro_id
-        self._load_first_line()
+        self._load_first_line(lines)
 
 
     def _switch_tab(self, idx: int):
@@ -56,12 +56,12 @@ class C3Controller(QtCore.QObject):
 
 
     # Load (or create on first save) the primary C3 line for this RO
-    def _load_first_line(self):
+    def _load_first_line(self, lines: Optional[list] = None):
         self._line_id = None
         if not self._ro_id:
             self._set_edits("", "", "")
             return
-        rows = ROC3Repository.list_for_ro(int(self._ro_id)) or []
+        rows = lines if lines is not None else (ROC3Repository.list_for_ro(int(self._ro_id)) or [])
         if rows:
             # Use the first line (lowest line_no) as the primary editor
             r = rows[0]
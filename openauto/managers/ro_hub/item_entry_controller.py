@@ -1,6 +1,6 @@
 from PyQt6 import QtWidgets, QtCore
 from openauto.subclassed_widgets.roles.tree_roles import COL_DESC
-from openauto.repositories.settings_repository import SettingsRepository
+from openauto.services.pricing_matrix import pricing_matrix
 
 def _skip_during_drop(table) -> bool:
     try:
@@ -12,36 +12,12 @@ class ItemEntryController:
     def __init__(self, ui):
         self.ui = ui
         self.ui.type_box.clear()
-        self._pricing_matrix = self._load_pricing_matrix()
-
-
-    def _load_pricing_matrix(self):
-        rows = SettingsRepository.load_matrix_table() or []
-        matrix = []
-        for min_cost, max_cost, multiplier, percent_return in rows:
-            try:
-                min_v = float(min_cost) if min_cost is not None else 0.0
-                max_v = float(max_cost) if max_cost is not None else float("inf")
-                mult  = float(multiplier) if multiplier is not None else 1.0
-            except Exception:
-                continue
-            matrix.append({
-                "min": min_v, "max": max_v, "mult": mult,
-                "percent_return": float(percent_return) if percent_return is not None else None
-            })
-        matrix.sort(key=lambda r: r["min"])
-        return matrix
-
+        # (kind, cost) the sell field was last filled for; repeated textChanged/editingFinished calls skip
+        self._last_matrix_input = None
 
 
     def _matrix_price_for_cost(self, cost: float) -> float | None:
-        if cost is None:
-            return None
-        for r in self._pricing_matrix:
-            if r["min"] <= cost <= r["max"]:
-                return round(cost * r["mult"], 2)
-        # If no bracket matched, option to choose last one.
-        return None
+        return pricing_matrix().price_for(cost)
 
 
 ### Auto-fill sell_edit based on Pricing Matrix for Part/Tire only ###
@@ -57,6 +33,9 @@ class ItemEntryController:
         except ValueError:
             cost_val = None
 
+        if (kind, cost_val) == self._last_matrix_input:
+            return
+        self._last_matrix_input = (kind, cost_val)
         price = self._matrix_price_for_cost(cost_val) if cost_val is not None else None
         if price is not None:
             # Don’t fight the user if they already typed a price—only set when blank or cost changed.
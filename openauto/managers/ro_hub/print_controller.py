@@ -9,7 +9,9 @@ from openauto.repositories.estimates_repository import EstimatesRepository
 from openauto.repositories.estimate_items_repository import EstimateItemsRepository
 from openauto.repositories.estimate_jobs_repository import EstimateJobsRepository
 from openauto.repositories.ro_c3_repository import ROC3Repository
+from openauto.services.ro_snapshot_cache import snapshot_cache
 from openauto.managers.ro_hub.save_estimate_service import SaveEstimateService
+from openauto.utils.money import Money, line_amounts
 
 _BASE = Path(__file__).resolve().parents[2]
 TEMPLATE_DIR = _BASE / "printing" / "templates"
@@ -17,11 +19,8 @@ ASSETS_DIR   = _BASE / "printing" / "assets"
 assets_url = QtCore.QUrl.fromLocalFile(str(ASSETS_DIR)).toString()
 
 
-def _money(x) -> float:
-    try: return float(x or 0)
-    except: return 0.0
-
-def _sum(rows, key): return sum(_money(r.get(key)) for r in rows)
+# totals are summed in cents; templates get floats, which "%.2f" prints exactly
+def _sum(rows, key) -> Money: return Money.sum(r.get(key) for r in rows)
 
 
 class PrintController(QtCore.QObject):
@@ -133,9 +132,10 @@ class PrintController(QtCore.QObject):
 
         subtotal = _sum(items_for_totals, "total")
         tax_rate = (getattr(self.settings_manager, "sales_tax_rate", 0.0) or 0.0)
-        tax = float(self.ui.tax_label.text())
-        fees = 0.0
-        grand = round(subtotal + tax + fees, 2)
+        # TotalsController fills tax_label from the same cents the hub shows
+        tax = Money.parse(self.ui.tax_label.text())
+        fees = Money()
+        grand = subtotal + tax + fees
 
         shop = {
             "name": self.ui.shop_name_line.text(),
@@ -167,7 +167,7 @@ class PrintController(QtCore.QObject):
             "items": items,
             "jobs": jobs,
             "ro_c3" : ro_c3,
-            "totals": {"subtotal": subtotal, "tax": tax, "fees": fees, "grand": grand},
+            "totals": {"subtotal": float(subtotal), "tax": float(tax), "fees": float(fees), "grand": float(grand)},
             "assets_path": assets_url,
         }
 
@@ -229,21 +229,22 @@ class PrintController(QtCore.QObject):
             "assets_path": ctx.get("assets_path"),
         }
 
-    #tailor info from repos
+    #tailor info from repos: one ROSnapshot instead of a query per section
     def _load_ro_with_items(self, ro_id: int):
-        ro = self.repair_orders_repo.get_repair_order_by_id(ro_id)
-        customer = self.customers_repo.get_customer_info_by_id(ro["customer_id"])
-        vehicle = (self.vehicles_repo.get_vehicle_by_id(ro.get("vehicle_id"))
-                   if ro.get("vehicle_id")
-                   else self.vehicles_repo.get_vehicle_info_for_new_ro(ro["customer_id"]))
+        snapshot = snapshot_cache().load(ro_id)
+        if snapshot is None:
+            return {}, {}, {}, [], [], {"concern": "", "cause": "", "correction": ""}
+        ro = snapshot.ro
+        customer = snapshot.customer
+        vehicle = snapshot.vehicle
 
-        lines = self.estimate_items_repo.list_for_ro(ro_id) or []
+        lines = snapshot.items
 
         items = []
         for ln in lines:
             qty = float(ln.get("qty") or 1)
             rate = float(ln.get("unit_price") or 0)
-            total = round(qty * rate, 2)
+            total = float(line_amounts(ln.get("qty") or 1, ln.get("unit_price"))[0])
             items.append({
                 "desc": ln.get("item_description") or "",
                 "qty": qty,
@@ -252,20 +253,8 @@ class PrintController(QtCore.QObject):
                 "kind": (ln.get("type") or "").lower(),
                 "job_id": ln.get("job_id") or 0,
             })
-        jobs_meta = []
-        try:
-            jobs_meta = self.estimate_jobs_repo.get_jobs_for_ro(ro_id) or []
-        except Exception:
-            jobs_meta = []
-        c3_rows = self.ro_c_three_repo.list_for_ro(ro_id) or []
-        ro_c3 = {"concern": "", "cause": "", "correction": ""}
-        for r in c3_rows:
-            if not ro_c3["concern"] and r.get("concern"):
-                ro_c3["concern"] = r.get("concern", "")
-            if not ro_c3["cause"] and r.get("cause"):
-                ro_c3["cause"] = r.get("cause", "")
-            if not ro_c3["correction"] and r.get("correction"):
-                ro_c3["correction"] = r.get("correction", "")
+        jobs_meta = snapshot.jobs
+        ro_c3 = snapshot.primary_c3()
 
         meta_by_id = {(j.get("id") or j.get("job_id")): j for j in jobs_meta if (j.get("id") or j.get("job_id")) is not None}
         grouped = {}
@@ -325,7 +314,7 @@ class PrintController(QtCore.QObject):
         for ln in lines:
             qty = float(ln.get("qty") or ln.get("hours") or 1)
             rate = float(ln.get("unit_price") or ln.get("rate") or ln.get("price") or 0)
-            total = float(ln.get("total") or ln.get("ext") or (qty * rate))
+            total = float(Money.parse(ln.get("total") or ln.get("ext")) or line_amounts(qty, rate)[0])
             items.append({
                 "desc": ln.get("item_description") or ln.get("description") or ln.get("desc") or "",
                 "qty": qty,
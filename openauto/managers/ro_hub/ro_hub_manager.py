@@ -1,11 +1,10 @@
-from PyQt6 import QtCore
+from PyQt6 import QtCore, QtWidgets
 from openauto.repositories.repair_orders_repository import RepairOrdersRepository
-from openauto.repositories.customer_repository import CustomerRepository
-from openauto.repositories.vehicle_repository import VehicleRepository
 from openauto.repositories.estimate_items_repository import EstimateItemsRepository
 from openauto.repositories.estimate_jobs_repository import EstimateJobsRepository
 from openauto.repositories.settings_repository import SettingsRepository
 from openauto.repositories.estimates_repository import EstimatesRepository
+from openauto.services.ro_snapshot_cache import snapshot_cache
 from openauto.services.ro_status_service import ROStatusService
 from openauto.managers.ro_hub.staff_controller import StaffAssignmentController
 from openauto.managers.ro_hub.item_entry_controller import ItemEntryController
@@ -18,10 +17,11 @@ from openauto.managers.repair_orders_manager import RepairOrdersManager
 from openauto.managers.ro_hub.autosave_controller import AutosaveController
 from openauto.managers.ro_hub.mpi_manager import MpiManager
 from openauto.managers.ro_hub.print_controller import PrintController
+from openauto.subclassed_widgets.views import ro_tiles
 import datetime
 from openauto.subclassed_widgets.roles.tree_roles import COL_DESC, COL_TYPE, JOB_ID_ROLE, APPROVED_ROLE, DECLINED_ROLE
 from openauto.subclassed_widgets.roles.tree_roles import (
-    JOB_ID_ROLE, JOB_NAME_ROLE, ITEM_ID_ROLE, LINE_ORDER_ROLE, ROW_KIND_ROLE
+    JOB_NAME_ROLE, ITEM_ID_ROLE, LINE_ORDER_ROLE, ROW_KIND_ROLE
 )
 
 def _skip_during_drop(table) -> bool:
@@ -80,6 +80,7 @@ class ROHubManager(QtCore.QObject):
         self.tax    = TaxConfigController(ui)
         self.saver  = SaveEstimateService(ui)
         self.autosaver = AutosaveController(ui)
+        self._add_autosave_indicator()
         self.totals = TotalsController(ui)
         self.print_controller = PrintController(ui)
         self.roContextReady.connect(self.print_controller.set_context)
@@ -233,24 +234,47 @@ class ROHubManager(QtCore.QObject):
 
     # span multiple controllers
     def load_ro_into_hub(self, ro_id: int):
+        # pending edits of the RO on screen go out first, and the read below must see them. While a save is on
+        # the worker the load waits for its _finished (its ids land in the model being replaced), then comes
+        # back here to flush whatever was edited meanwhile; the event loop keeps running in between.
+        try:
+            self.autosaver.flush_if_dirty()
+        except Exception as e:
+            print(f"[ROHubManager] Saving before loading RO {ro_id} failed: {e}")
+        if self.autosaver.is_busy():
+            self.autosaver.call_when_idle(lambda: self.load_ro_into_hub(ro_id))
+            return
         try: self.autosaver.pause()
         except Exception: pass
+        # a load that fails part way must not leave autosave paused for the rest of the session
+        try:
+            self._fill_hub(ro_id)
+        finally:
+            try: self.autosaver.resume()
+            except Exception: pass
+
+    def _fill_hub(self, ro_id: int):
         self.ui.current_ro_id = ro_id
-        ro_data = RepairOrdersRepository.get_repair_order_by_id(ro_id)
-        customer = CustomerRepository.get_customer_info_by_id(ro_data["customer_id"])
-        vehicle  = VehicleRepository.get_vehicle_info_for_new_ro(ro_data["vehicle_id"])
-        dates_miles = RepairOrdersRepository.get_create_altered_date(ro_id)
-        self.ui.name_edit.setText(f"{customer['first_name']} {customer['last_name']}")
+        # one round trip for everything below (none if it was recently opened or hovered on the board);
+        # sub-loaders take it instead of re-querying
+        snapshot = snapshot_cache().load(ro_id)
+        if snapshot is None:
+            print(f"[ROHubManager] RO {ro_id} not found")
+            return
+        ro_data = snapshot.ro
+        customer = snapshot.customer
+        vehicle = snapshot.vehicle
+        self.ui.name_edit.setText(f"{customer.get('first_name') or ''} {customer.get('last_name') or ''}".strip())
         self.ui.ro_number_label.setText(ro_data["ro_number"])
-        self.ui.number_edit.setText(customer["phone"])
-        self.ui.vehcle_line.setText(f"{vehicle['vin']}   {vehicle['year']}   {vehicle['make']}   {vehicle['model']}")
+        self.ui.number_edit.setText(customer.get("phone") or "")
+        self.ui.vehcle_line.setText(f"{vehicle.get('vin')}   {vehicle.get('year')}   {vehicle.get('make')}   {vehicle.get('model')}")
         self.ui.ro_hub_tabs.setCurrentIndex(0)
 
-        created_qdt = _to_qdatetime(dates_miles.get("created_at"))
-        updated_qtd = _to_qdatetime(dates_miles.get("updated_at"))
-        ro_status = dates_miles.get("status")
-        miles_in = str(dates_miles.get("miles_in"))
-        miles_out = str(dates_miles.get("miles_out"))
+        created_qdt = _to_qdatetime(ro_data.get("created_at"))
+        updated_qtd = _to_qdatetime(ro_data.get("updated_at"))
+        ro_status = snapshot.status
+        miles_in = str(ro_data.get("miles_in"))
+        miles_out = str(ro_data.get("miles_out"))
 
         self.ui.ro_status_label.setText(ro_status.upper())
         self.ui.miles_in_edit.setText(miles_in)
@@ -272,25 +296,34 @@ class ROHubManager(QtCore.QObject):
             self.ui.ro_approved_edit.clear()
 
         if hasattr(self, "c3"):
-            self.c3.set_ro_id(ro_id)
+            self.c3.set_ro_id(ro_id, lines=snapshot.c3)
 
         # delegate staff select resolution to the staff controller
         self.staff.sync_selects_from_ro(ro_data)
-        self._load_estimate_items(ro_id)
+        self._load_estimate_items(ro_id, snapshot)
         est_id = getattr(self.ui.ro_items_table, "current_estimate_id", None) or 0
         vin = (self.ui.vehcle_line.text() or "").split()[0] if self.ui.vehcle_line.text() else ""
         self.roContextReady.emit(ro_id, int(est_id), vin)
-        self._update_ro_status_label(ro_id)
+        self._update_ro_status_label(ro_id, snapshot)
         self.status.refresh_button()
-        try: self.autosaver.resume()
-        except Exception: pass
-
-    def _load_estimate_items(self, ro_id: int):
+        # miles, memo and C3 as loaded; a delta save only writes them once they differ from this
+        self.saver.remember_loaded_header(ro_id)
+        # the RO's board tile gets the same data for free
+        row = snapshot.board_row()
+        row.pop("ro_id", None)
+        ro_tiles.update_all_tiles(ro_id, **row)
+
+    # snapshot: the ROSnapshot load_ro_into_hub already read; without one the pieces are queried directly
+    def _load_estimate_items(self, ro_id: int, snapshot=None):
         tree  = self.ui.ro_items_table
         self.ui.ro_items_table.current_ro_id = ro_id
-        est_id = RepairOrdersRepository.estimate_id_for_ro(ro_id)
+        if snapshot is not None:
+            est_id = snapshot.estimate_id
+            memo = snapshot.internal_memo or ""
+        else:
+            est_id = RepairOrdersRepository.estimate_id_for_ro(ro_id)
+            memo = EstimatesRepository.get_internal_memo(est_id) or "" if est_id else ""
         self.ui.ro_items_table.current_estimate_id = est_id
-        memo = EstimatesRepository.get_internal_memo(est_id) or "" if est_id else ""
         self.ui.notes_text_edit.blockSignals(True)
         self.ui.notes_text_edit.setPlainText(memo)
         self.ui.notes_text_edit.blockSignals(False)
@@ -322,12 +355,14 @@ class ROHubManager(QtCore.QObject):
             tree.clear()
 
             # Pull items (joined to jobs) and jobs (to include empty jobs)
-            rows = EstimateItemsRepository.list_for_ro(ro_id) or []
-
-            try:
-                job_rows = EstimateJobsRepository.list_for_estimate(est_id) if est_id else []
-            except Exception:
-                job_rows = []
+            if snapshot is not None:
+                rows, job_rows = snapshot.items, snapshot.jobs
+            else:
+                rows = EstimateItemsRepository.list_for_ro(ro_id) or []
+                try:
+                    job_rows = EstimateJobsRepository.list_for_estimate(est_id) if est_id else []
+                except Exception:
+                    job_rows = []
 
             # Bucket items by canonical job name
             from collections import defaultdict
@@ -479,6 +514,10 @@ class ROHubManager(QtCore.QObject):
         finally:
             tree.blockSignals(prev_block)
             tree.setUpdatesEnabled(prev_updates)
+            # the tree now mirrors the DB; from here the model journals edits for delta saves
+            model = tree.model()
+            if hasattr(model, "mark_clean"):
+                model.mark_clean(est_id)
 
         # Fit “Type” column and repaint
         type_col = tree._col_index("Type")
@@ -513,6 +552,7 @@ class ROHubManager(QtCore.QObject):
         rows = m.rowCount(QtCore.QModelIndex())
         user_id = getattr(self.ui, "current_user_id", None)
 
+        statuses = {}
         for r in range(rows):
             job_idx = m.index(r, 0)
             job_id = job_idx.data(JOB_ID_ROLE)
@@ -520,15 +560,16 @@ class ROHubManager(QtCore.QObject):
                 continue
             approved = bool(job_idx.data(APPROVED_ROLE))
             declined = bool(job_idx.data(DECLINED_ROLE))
-            status = "approved" if approved else ("declined" if declined else "proposed")
-            EstimateJobsRepository.set_status(job_id, status, by_user_id=user_id)
+            statuses[job_id] = "approved" if approved else ("declined" if declined else "proposed")
 
-        RepairOrdersRepository.recompute_ro_approval(ro_id)
-        self._update_ro_status_label(ro_id)
-        self.status.refresh_button()
+        # every job's status, the items and the RO rollup in one transaction; the new state feeds the label
+        state = RepairOrdersRepository.set_job_statuses(ro_id, statuses, by_user_id=user_id)
+        self._update_ro_status_label(ro_id, state=state)
+        self.status.refresh_button(has_approved=bool(state["approved"]) if state is not None else None)
 
 
-    def _update_ro_status_label(self, ro_id: int):
+    # state: what RepairOrdersRepository.set_job_statuses returns, so an approval change needs no extra reads
+    def _update_ro_status_label(self, ro_id: int, snapshot=None, state=None):
         tree = self.ui.ro_items_table
         m = tree.model()
         root = QtCore.QModelIndex()
@@ -536,10 +577,19 @@ class ROHubManager(QtCore.QObject):
         label = self.ui.ro_status_label
         style = self.ui.style()
 
-        dates_miles = RepairOrdersRepository.get_create_altered_date(ro_id)
+        if snapshot is not None:
+            dates_miles = snapshot.ro
+            approved_at = snapshot.ro.get("approved_at")
+            total, approved, _declined = snapshot.approval_counts
+        elif state is not None:
+            dates_miles = state
+            approved_at = state.get("approved_at")
+            total, approved = state["jobs"], state["approved"]
+        else:
+            dates_miles = RepairOrdersRepository.get_create_altered_date(ro_id)
+            approved_at = RepairOrdersRepository.get_approved_at(ro_id)
+            total, approved, _declined = RepairOrdersRepository.jobs_counts_for_ro(ro_id)
         status = (dates_miles.get("status") or "open").strip().lower()
-        approved_at = RepairOrdersRepository.get_approved_at(ro_id)
-        total, approved, _declined = RepairOrdersRepository.jobs_counts_for_ro(ro_id)
 
         if approved_at:
             qdt = _to_qdatetime(approved_at)
@@ -580,6 +630,19 @@ class ROHubManager(QtCore.QObject):
         style.unpolish(label)
         style.polish(label)
 
+    # "Saving… / Saved" next to the created/updated stamps; the tooltip carries the save latency stats
+    def _add_autosave_indicator(self):
+        layout = getattr(self.ui, "horizontalLayout_30", None)
+        if layout is None:
+            return
+        label = QtWidgets.QLabel(parent=self.ui.ro_control_page)
+        label.setObjectName("autosave_label")
+        label.setAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+        label.setMinimumWidth(140)
+        layout.addWidget(label)
+        self.ui.autosave_label = label
+        self.autosaver.attach_indicator(label)
+
     def connect_ro_model_signals(self, model):
         if getattr(model, "_oa_mark_dirty_wired", False):
             return
@@ -598,6 +661,11 @@ class ROHubManager(QtCore.QObject):
                                       QtCore.Qt.ConnectionType.UniqueConnection)
         except TypeError:
             model.rowsRemoved.connect(lambda *_: self.autosaver.mark_dirty())
+        try:
+            model.rowsMoved.connect(lambda *_: self.autosaver.mark_dirty(),
+                                    QtCore.Qt.ConnectionType.UniqueConnection)
+        except TypeError:
+            model.rowsMoved.connect(lambda *_: self.autosaver.mark_dirty())
         try:
             model._oa_mark_dirty_wired = True
         except Exception:
@@ -1,3 +1,4 @@
+from __future__ import annotations
 from PyQt6 import QtCore
 from PyQt6.QtWidgets import QMessageBox
 from openauto.repositories.repair_orders_repository import RepairOrdersRepository
@@ -5,26 +6,60 @@ from openauto.repositories.estimates_repository import EstimatesRepository
 from openauto.repositories.estimate_items_repository import EstimateItemsRepository
 from openauto.repositories.estimate_jobs_repository import EstimateJobsRepository
 from openauto.repositories.ro_c3_repository import ROC3Repository
+from openauto.repositories.db_handlers import connect_db, unit_of_work
 import re
-from decimal import Decimal, ROUND_HALF_UP
+import time
+from dataclasses import dataclass, field
 from openauto.subclassed_widgets.roles.tree_roles import (
     JOB_ID_ROLE, JOB_NAME_ROLE, ITEM_ID_ROLE, LINE_ORDER_ROLE, ROW_KIND_ROLE
 )
 from openauto.subclassed_widgets.views.ro_tiles import update_all_tiles
+from openauto.services.ro_snapshot_cache import snapshot_cache
+from openauto.subclassed_widgets.models.ro_tree_model import ROChangeSet
+from openauto.utils.money import Money, CENTS, MILLS, PCT, fixed, line_amounts
+
+
+
+
+### ONE DELTA SAVE, TAKEN ON THE GUI THREAD SO WRITING IT NEVER TOUCHES A WIDGET ###
+    # header is _header_values() when it differs from what this process last saved, else None.
+    # model is only used back on the GUI thread, to hand ids over or restore the journal.
+@dataclass
+class SaveSnapshot:
+    ro_id: int
+    model: object
+    changes: ROChangeSet
+    header: tuple | None = None
+    created_by: int | None = None
+    taken_at: float = field(default_factory=time.perf_counter)
+
+    def is_empty(self) -> bool:
+        return self.header is None and self.changes.is_empty()
+
+    def can_merge(self, newer: SaveSnapshot) -> bool:
+        return (newer.model is self.model and newer.ro_id == self.ro_id
+                and newer.changes.estimate_id == self.changes.estimate_id)
+
+    # a queued snapshot absorbing a newer one: one write instead of two, timed from the older
+    def merged(self, newer: SaveSnapshot) -> SaveSnapshot:
+        return SaveSnapshot(
+            ro_id=self.ro_id,
+            model=self.model,
+            changes=self.changes.merged(newer.changes),
+            header=newer.header if newer.header is not None else self.header,
+            created_by=newer.created_by,
+            taken_at=self.taken_at,
+        )
 
 
-
-
-def _num(x, default="0"):
-    s = str(x or "").replace(",", "").replace("$", "").strip()
-    try:
-        return Decimal(s if s else default)
-    except Exception:
-        return Decimal(default)
-
 class SaveEstimateService:
+    # ro_id -> header values (_header_values) last loaded into the hub or written by this process, so delta
+    # saves can skip them; reset on every RO load so another workstation's edits are never shadowed
+    _saved_headers: dict = {}
+
     def __init__(self, ui):
         self.ui = ui
+        self._pending_header = None
 
     def _current_ro_id(self):
         return getattr(self.ui, "current_ro_id", None)
@@ -32,13 +67,6 @@ class SaveEstimateService:
     def _collect_ui_items_for_estimate(self, ro_id: int, estimate_id: int) -> list[dict]:
         out: list[dict] = []
 
-        def _num(x, fallback="0"):
-            from decimal import Decimal
-            try:
-                return Decimal(str(x)) if str(x).strip() != "" else Decimal(fallback)
-            except Exception:
-                return Decimal(fallback)
-
         tree = getattr(self.ui, "ro_items_table", None) or getattr(self.ui, "roTable", None)
         if not tree:
             return out
@@ -57,12 +85,12 @@ class SaveEstimateService:
         COL_PRICE = col_idx("price", 4)
         COL_TAX = col_idx("tax", 5)
 
-        # Helper to read a numeric cell, preferring EditRole
-        def D(item, col, fallback="0"):
+        # Helper to read a numeric cell, preferring EditRole, as the fixed-point value the column stores
+        def D(item, col, fallback="0", places=CENTS):
             val = item.data(col, QtCore.Qt.ItemDataRole.EditRole)
             if val is None or val == "":
                 val = item.text(col)
-            return _num(val, fallback)
+            return fixed(val if str(val or "").strip() else fallback, places)
 
         # Kind resolver (UserRole first, falls back to visible text)
         def _kind_of(row) -> str:
@@ -88,10 +116,10 @@ class SaveEstimateService:
 
                 kind = _kind_of(row)
                 desc = (row.text(COL_DESC) or "").strip()
-                qty = D(row, COL_QTY, "1")
-                rate = D(row, COL_RATE, "0") if COL_RATE >= 0 else _num("0")
+                qty = D(row, COL_QTY, "1", MILLS)
+                rate = D(row, COL_RATE, "0") if COL_RATE >= 0 else fixed(0, CENTS)
                 price = D(row, COL_PRICE, "0")
-                tax_pct = D(row, COL_TAX, "0")
+                tax_pct = D(row, COL_TAX, "0", PCT)
 
                 # skip truly empty lines
                 if not desc and qty == 0 and rate == 0 and price == 0:
@@ -114,10 +142,10 @@ class SaveEstimateService:
 
                 if kind == "labor":
                     unit_price = rate
-                    unit_cost = _num("0")
+                    unit_cost = fixed(0, CENTS)
                 else:
                     unit_price = price
-                    unit_cost = _num("0")
+                    unit_cost = fixed(0, CENTS)
 
                 out.append({
                     "id": item_id,
@@ -219,7 +247,8 @@ class SaveEstimateService:
                     lo = 0
                 line_counters[nm] = max(line_counters[nm], lo + 1)
 
-    def _strip_status_suffix(self, name: str | None) -> str:
+    @staticmethod
+    def _strip_status_suffix(name: str | None) -> str:
         if not name:
             return "General"
         s = str(name).strip()
@@ -240,66 +269,115 @@ class SaveEstimateService:
                 QMessageBox.warning(self.ui, "Save RO", "No Repair Order selected.")
             return
 
-        ro = RepairOrdersRepository.get_repair_order_by_id(ro_id)
-
-        def _miles(x):
-            s = str(x or "").strip()
-            # keep only digits (so "52,000" or "52 000 mi" becomes "52000")
-            s = re.sub(r"[^\d]", "", s)
-            if not s:
-                return None
+        snapshot = self.snapshot()
+        if snapshot is not None:
             try:
-                return int(s)
+                result = self.persist(snapshot)
             except Exception:
-                return None
-
+                snapshot.model.restore_changes(snapshot.changes)
+                raise
+            self.finish(snapshot, result)
+            estimate_id, items = result["estimate_id"], result["items"]
+        else:
+            tree = self._tree()
+            model = tree.model() if tree is not None and hasattr(tree, "model") else None
+            self._pending_header = None
+            # One connection, one transaction: a failed save leaves the RO exactly as it was
+            with unit_of_work():
+                estimate_id, items, total, tile_total = self._persist(ro_id)
+            if self._pending_header is not None:
+                SaveEstimateService._saved_headers[ro_id] = self._pending_header
+            if hasattr(model, "mark_clean") and hasattr(tree, "to_legacy_items"):
+                # items came from to_legacy_items, one per line in tree order
+                model.mark_clean(int(estimate_id), [(it.get("id"), it.get("line_order")) for it in items])
+            self._after_save(ro_id, tile_total)
 
-        writer_name = ro.get("writer_name") or (self.ui.writer_box.currentText() if hasattr(self.ui, "writer_box") else "")
-        tech_name   = ro.get("tech_name") or (self.ui.technician_box.currentText() if hasattr(self.ui, "technician_box") else "")
-        miles_in_text  = self.ui.miles_in_edit.text() if hasattr(self.ui, "miles_in_edit") else ""
-        miles_out_text = self.ui.miles_out_edit.text() if hasattr(self.ui, "miles_out_edit") else ""
-        miles_in = _miles(miles_in_text)
-        miles_out = _miles(miles_out_text)
-        est = EstimatesRepository.get_by_ro_id(ro_id)
-        estimate_id = est["id"] if est else EstimatesRepository.create_for_ro(ro, writer_name, tech_name)
-        memo = (self.ui.notes_text_edit.toPlainText() or "").strip()
-        tree = getattr(self.ui, "ro_items_table", None)
+        if not silent:
+            QMessageBox.information(self.ui, "Save RO", f"Estimate #{estimate_id} saved with {len(items)} items.")
+        return int(estimate_id)
 
-        est = EstimatesRepository.get_by_ro_id(ro_id)
-        estimate_id = est["id"] if est else EstimatesRepository.create_for_ro(ro, writer_name, tech_name)
+    ### GUI THREAD: WHAT A DELTA SAVE NEEDS, OR None WHEN THE TREE ISN'T JOURNALED (THE FULL SAVE RUNS THEN) ###
+    # The journal is taken (and emptied) here; persist() only ever sees this plain copy.
+    def snapshot(self) -> SaveSnapshot | None:
+        ro_id = self._current_ro_id()
+        tree = self._tree()
+        model = tree.model() if tree is not None and hasattr(tree, "model") else None
+        if not ro_id or not hasattr(model, "take_changes"):
+            return None
+        changes = model.take_changes()
+        if changes is None:
+            return None
+        header = self._header_values()
+        if SaveEstimateService._saved_headers.get(ro_id) == header:
+            header = None
+        return SaveSnapshot(ro_id=int(ro_id), model=model, changes=changes, header=header,
+                            created_by=getattr(self.ui, "current_user_id", None))
+
+    ### ANY THREAD: WRITES A SNAPSHOT IN ONE TRANSACTION; TOUCHES NO WIDGET OR MODEL ###
+    # known carries job/item ids from earlier saves whose results may not have reached the model yet
+    # (AutosaveController keeps one per worker), so a line inserted by the previous save isn't inserted again.
+    @staticmethod
+    def persist(snapshot: SaveSnapshot, known: dict | None = None) -> dict:
+        started = time.perf_counter()
+        if known is not None and known.get("estimate_id") != snapshot.changes.estimate_id:
+            known.clear()
+            known.update(estimate_id=snapshot.changes.estimate_id, jobs={}, items={})
+        with unit_of_work():
+            result = SaveEstimateService._persist_changes(snapshot, known)
+        if known is not None:
+            known["jobs"].update(result["job_ids"])
+            known["items"].update(result["item_ids"])
+        result["persist_ms"] = (time.perf_counter() - started) * 1000.0
+        return result
+
+    ### GUI THREAD: A PERSISTED SNAPSHOT's IDS GO BACK TO ITS MODEL, THEN THE CACHE AND THE RO's TILE ###
+    def finish(self, snapshot: SaveSnapshot, result: dict) -> None:
+        if snapshot.header is not None:
+            SaveEstimateService._saved_headers[snapshot.ro_id] = snapshot.header
+        snapshot.model.commit_changes(snapshot.changes, result["job_ids"], result["item_ids"])
+        self._after_save(snapshot.ro_id, result["tile_total"])
+
+    @staticmethod
+    def _after_save(ro_id: int, tile_total) -> None:
+        # C3 lines and the memo aren't in change_log, so the cached snapshot is dropped here
+        snapshot_cache().invalidate([ro_id])
+        try:
+            update_all_tiles(ro_id, total=float(tile_total))
+        except Exception:
+            pass
 
-        if tree and hasattr(tree, "to_legacy_items"):
-            items = tree.to_legacy_items()
-        else:
-            items = self._collect_ui_items_for_estimate(ro_id, estimate_id)
+    def _tree(self):
+        return getattr(self.ui, "ro_items_table", None) or getattr(self.ui, "roTable", None)
 
+    # estimate_id / ro_id on every item, plus the defaults estimate_items expects
+    @staticmethod
+    def _prepare_items(items: list[dict], ro_id: int, estimate_id: int) -> None:
         for it in items:
             it["estimate_id"] = estimate_id
             it["ro_id"] = ro_id
             if not it.get("sku_number") and it.get("sku"):
                 it["sku_number"] = it["sku"] or ""
             it["sku_number"] = it.get("sku_number") or ""
-
-    # Ensure tax_pct is numeric and not None
+            # amounts go out at the columns' own precision, so what the DB stores and rounds is exactly
+            # what utils.money computed the totals from
+            it["qty"] = fixed(it.get("qty"), MILLS) if it.get("qty") is not None else None
+            it["unit_price"] = fixed(it.get("unit_price"), CENTS)
+            it["unit_cost"] = fixed(it.get("unit_cost"), CENTS)
+            it["tax_pct"] = fixed(it.get("tax_pct"), PCT)
+
+    # (miles_in, miles_out, memo, concern, cause, correction) as the hub shows them
+    def _header_values(self) -> tuple:
+        def _miles(x):
+            s = str(x or "").strip()
+            # keep only digits (so "52,000" or "52 000 mi" becomes "52000")
+            s = re.sub(r"[^\d]", "", s)
+            if not s:
+                return None
             try:
-                it["tax_pct"] = float(it.get("tax_pct", 0.0) or 0.0)
-            except (TypeError, ValueError):
-                it["tax_pct"] = 0.0
-
-        self._attach_jobs_and_order(estimate_id, items, tree)
-
-        try:
-            from openauto.repositories.db_handlers import connect_db
-            _cn = connect_db()
-            with _cn, _cn.cursor() as _c:
-                _c.execute(
-                    "UPDATE repair_orders SET estimate_id=%s WHERE id=%s AND (estimate_id IS NULL OR estimate_id<>%s)",
-                    (estimate_id, ro_id, estimate_id))
-                _cn.commit()
-        except Exception:
-            pass
+                return int(s)
+            except Exception:
+                return None
 
-        # ---- Save Concern / Cause / Correction for this RO ----
         def _text(widget_name: str) -> str:
             w = getattr(self.ui, widget_name, None)
             try:
@@ -307,10 +385,29 @@ class SaveEstimateService:
             except Exception:
                 return ""
 
-        concern_txt    = _text("concern_edit")
-        cause_txt      = _text("cause_edit")
-        correction_txt = _text("correction_edit")
+        miles_in_text  = self.ui.miles_in_edit.text() if hasattr(self.ui, "miles_in_edit") else ""
+        miles_out_text = self.ui.miles_out_edit.text() if hasattr(self.ui, "miles_out_edit") else ""
+        memo = (self.ui.notes_text_edit.toPlainText() or "").strip()
+        return (_miles(miles_in_text), _miles(miles_out_text), memo,
+                _text("concern_edit"), _text("cause_edit"), _text("correction_edit"))
+
+    ### THE HUB WAS JUST FILLED FROM THE DB: ITS HEADER IS WHAT IS STORED, THE ONLY ONE WORTH REMEMBERING ###
+    def remember_loaded_header(self, ro_id: int) -> None:
+        SaveEstimateService._saved_headers.clear()
+        SaveEstimateService._saved_headers[int(ro_id)] = self._header_values()
+
+    ### MILES, INTERNAL MEMO AND THE FIRST C3 LINE AS THE HUB SHOWS THEM (FULL SAVE) ###
+    def _persist_header(self, ro_id: int, estimate_id: int) -> None:
+        values = self._header_values()
+        self._write_header(ro_id, estimate_id, values, getattr(self.ui, "current_user_id", None))
+        # recorded by save() once the transaction has committed
+        self._pending_header = values
 
+    @staticmethod
+    def _write_header(ro_id: int, estimate_id: int, values: tuple, created_by) -> None:
+        miles_in, miles_out, memo, concern_txt, cause_txt, correction_txt = values
+
+        # ---- Save Concern / Cause / Correction for this RO ----
         try:
             # Get existing C3 rows (if any) and update the first one; else create it.
             rows = ROC3Repository.list_for_ro(int(ro_id)) or []
@@ -328,44 +425,128 @@ class SaveEstimateService:
                     cause=cause_txt,
                     correction=correction_txt,
                     estimate_item_id=None,   # keep unattached; wire later if you add per-line C3
-                    created_by=getattr(self.ui, "current_user_id", None),
+                    created_by=created_by,
                 )
         except Exception:
             # Non-fatal; keep the Save flow alive even if C3 write hiccups.
+            # (a failed statement still dooms the unit of work: the save rolls back and raises)
             pass
 
-
-
         RepairOrdersRepository.update_miles(
             miles_in=miles_in or None,
             miles_out=miles_out or None,
             ro_id=ro_id
         )
+        EstimatesRepository.set_internal_memo(estimate_id, memo)
 
-        tree = getattr(self.ui, "ro_items_table", None) or getattr(self.ui, "roTable", None)
-        self._attach_jobs_and_order(estimate_id, items, tree)
+    ### DELTA SAVE FROM ROTreeModel.take_changes: ONE ROW WRITTEN PER EDITED LINE, NOTHING FOR THE REST ###
+    # Deleted rows go first, then new or renamed jobs (their ids are needed by the lines), the upsert of the
+    # journaled lines, and the set-based job/line renumbering. Totals are only rewritten when an amount changed.
+    @staticmethod
+    def _persist_changes(snapshot: SaveSnapshot, known: dict | None = None) -> dict:
+        ro_id, changes = snapshot.ro_id, snapshot.changes
+        estimate_id = changes.estimate_id
+        known_jobs = (known or {}).get("jobs", {})
+        known_items = (known or {}).get("items", {})
+        if snapshot.header is not None:
+            SaveEstimateService._write_header(ro_id, estimate_id, snapshot.header, snapshot.created_by)
+
+        if changes.deleted_item_ids:
+            EstimateItemsRepository.delete_many(changes.deleted_item_ids)
+        if changes.deleted_job_ids:
+            EstimateJobsRepository.delete_jobs(estimate_id, changes.deleted_job_ids)
+
+        job_ids: dict = {}
+        for job in changes.jobs:
+            name = SaveEstimateService._strip_status_suffix(job["name"])
+            job_id = job["job_id"] if job["job_id"] is not None else known_jobs.get(job["node"])
+            if job_id is None:
+                job_ids[job["node"]] = int(EstimateJobsRepository.get_or_create(estimate_id, name))
+            else:
+                # a rename onto an existing job name merges the two, keeping the other id
+                job_ids[job["node"]] = int(EstimateJobsRepository.rename_or_merge(int(job_id), name))
 
-        existing_ids = set(EstimateItemsRepository.get_ids_for_estimate(estimate_id))
+        def _job_id(node, job_id):
+            return job_ids.get(node, job_id if job_id is not None else known_jobs.get(node))
 
-        # Split incoming rows by presence of id
-        to_update = [it for it in items if it.get("id")]
-        to_insert = [it for it in items if not it.get("id")]
+        items = changes.items
+        for it in items:
+            it["job_id"] = _job_id(it["job_node"], it["job_id"])
+            it["job_name"] = SaveEstimateService._strip_status_suffix(it["job_name"])
+            if it.get("id") is None:
+                it["id"] = known_items.get(it["node"])
+        SaveEstimateService._prepare_items(items, ro_id, estimate_id)
+
+        item_ids: dict = {}
+        for it, iid in zip(items, EstimateItemsRepository.bulk_upsert_items(items)):
+            it["id"] = iid
+            # None: another workstation deleted the line since it was loaded; it isn't written back
+            if iid is not None:
+                item_ids[it["node"]] = iid
+
+        for job_node, job_id, lines in changes.reordered:
+            ids = [item_ids.get(node, item_id if item_id is not None else known_items.get(node)) for node, item_id in lines]
+            # unsaved (or vanished) lines stay as None so every id keeps the tree's 0..n-1 position
+            EstimateItemsRepository.reorder_job(_job_id(job_node, job_id), ids)
+
+        if changes.job_order is not None:
+            EstimateItemsRepository.renumber_jobs(
+                estimate_id, [_job_id(node, job_id) for node, job_id in changes.job_order])
+
+        total = changes.total
+        if changes.totals_changed:
+            EstimatesRepository.update_total(estimate_id, total.decimal())
+            EstimateJobsRepository.recompute_totals_for_estimate(estimate_id)
+        try:
+            tile_total = RepairOrdersRepository.estimate_total_for_ro(ro_id) or 0.0
+        except Exception:
+            tile_total = float(total or 0.0)
+        return {"estimate_id": estimate_id, "items": items, "total": total, "tile_total": tile_total,
+                "job_ids": job_ids, "item_ids": item_ids}
 
-        # Update existing rows (job_id, line_order, description, qty, unit_price, etc.)
-        for it in to_update:
-            EstimateItemsRepository.update_item(it)  # must use it["id"]
+    def _persist(self, ro_id: int):
+        ro = RepairOrdersRepository.get_repair_order_by_id(ro_id)
 
+        writer_name = ro.get("writer_name") or (self.ui.writer_box.currentText() if hasattr(self.ui, "writer_box") else "")
+        tech_name   = ro.get("tech_name") or (self.ui.technician_box.currentText() if hasattr(self.ui, "technician_box") else "")
+        tree = self._tree()
 
-        EstimatesRepository.set_internal_memo(estimate_id, memo)
+        est = EstimatesRepository.get_by_ro_id(ro_id)
+        estimate_id = est["id"] if est else EstimatesRepository.create_for_ro(ro, writer_name, tech_name)
 
-        # Insert new rows; capture new ids if you want to push back to the UI later
-        for it in to_insert:
-            if it["description"] == "" or None:
-                it["description"] = "EMPTY"
-            new_id = EstimateItemsRepository.insert_item(it)
-            it["id"] = new_id  
+        if tree and hasattr(tree, "to_legacy_items"):
+            items = tree.to_legacy_items()
+        else:
+            items = self._collect_ui_items_for_estimate(ro_id, estimate_id)
+
+        self._prepare_items(items, ro_id, estimate_id)
+
+        self._attach_jobs_and_order(estimate_id, items, tree)
+
+        if ro.get("estimate_id") != estimate_id:
+            try:
+                _cn = connect_db()
+                with _cn, _cn.cursor() as _c:
+                    _c.execute(
+                        "UPDATE repair_orders SET estimate_id=%s WHERE id=%s AND (estimate_id IS NULL OR estimate_id<>%s)",
+                        (estimate_id, ro_id, estimate_id))
+            except Exception:
+                pass
+
+        self._persist_header(ro_id, estimate_id)
 
         existing_item_ids = set(EstimateItemsRepository.get_ids_for_estimate(estimate_id))
+
+        # The tree reports saved rows as item_id; only ids that still belong to this estimate are updated in place
+        for it in items:
+            iid = it.get("id") or it.get("item_id")
+            it["id"] = int(iid) if iid and int(iid) in existing_item_ids else None
+
+        # Updates and inserts go out as multi-row statements
+        for it, iid in zip(items, EstimateItemsRepository.bulk_upsert_items(items)):
+            it["id"] = iid
+
+        # Rows inserted above are all present, so the pre-save id set is enough to find deletions
         present_item_ids = {it["id"] for it in items if it.get("id")}
 
         item_ids_to_delete = list(existing_item_ids - present_item_ids)
@@ -384,30 +565,14 @@ class SaveEstimateService:
             EstimateJobsRepository.delete_jobs(estimate_id, job_ids_to_delete)
 
 
-        def _D(x) -> Decimal:
-            # works for None/float/int/str
-            try:
-                return Decimal(str(x if x is not None else "0"))
-            except Exception:
-                return Decimal("0")
-
-        total = sum((_D(i.get("qty")) * _D(i.get("unit_price")) for i in items), Decimal("0"))
-        tax_total = sum((_D(i.get("line_total")) - (_D(i.get("qty")) * _D(i.get("unit_price"))) for i in items), Decimal("0"))
-        grand_total = sum((_D(i.get("line_total")) for i in items), Decimal("0"))
-        total = total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        # sum of the rounded line_total column, the same figure as the job totals and the model's subtotal
+        total = Money.sum(line_amounts(i.get("qty"), i.get("unit_price"))[0] for i in items)
 
-        EstimatesRepository.update_total(estimate_id, float(total))
+        EstimatesRepository.update_total(estimate_id, total.decimal())
         EstimateJobsRepository.recompute_totals_for_estimate(estimate_id)
         # Refresh tiles using the tax-inclusive, declined-aware RO total
         try:
             tile_total = RepairOrdersRepository.estimate_total_for_ro(ro_id) or 0.0
         except Exception:
             tile_total = float(total or 0.0)
-        QtCore.QTimer.singleShot(0, lambda: update_all_tiles(ro_id, total=float(tile_total)))
-        try:
-            update_all_tiles(ro_id, total=float(tile_total))
-        except Exception:
-            pass
-        if not silent:
-            QMessageBox.information(self.ui, "Save RO", f"Estimate #{estimate_id} saved with {len(items)} items.")
-        return int(estimate_id)
+        return estimate_id, items, total, tile_total
@@ -65,15 +65,17 @@ class StatusDialogController(QtCore.QObject):
         except Exception:
             return False
 
-    def refresh_button(self):
+    # has_approved: already known by the caller (an approval change returns the counts), skips the lookup
+    def refresh_button(self, has_approved: Optional[bool] = None):
         btn = getattr(self, "_button", None)
         if not btn:
             return
-        try:
-            ro_id = self._get_ro_id()
-        except Exception:
-            ro_id = getattr(self, "ro_id", None)
-        has_approved = self._any_jobs_approved(ro_id)
+        if has_approved is None:
+            try:
+                ro_id = self._get_ro_id()
+            except Exception:
+                ro_id = getattr(self, "ro_id", None)
+            has_approved = self._any_jobs_approved(ro_id)
         if not has_approved:
             btn.setProperty("inactive", True)
             btn.setAutoDefault(False)
@@ -3,6 +3,9 @@ from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import QBuffer, QIODeviceBase
 from PyQt6.QtWidgets import QTableWidgetItem
 from openauto.repositories import db_handlers
+from openauto.services.pricing_matrix import pricing_matrix
+from openauto.services.bulk_repricing import BulkRepricer
+from openauto.services.ro_snapshot_cache import snapshot_cache
 import decimal
 
 
@@ -98,7 +101,45 @@ class SettingsManager:
         db_conn.commit()
         cursor.close()
         db_conn.close()
+        # open models and the item entry pick up the new tiers on their next lookup
+        pricing_matrix().invalidate()
         self._show_message("Your Pricing Matrix Has Been Saved")
+        self.offer_repricing()
+
+### DRY RUN OF THE NEW MATRIX AGAINST OPEN ESTIMATES, APPLIED IF THE USER AGREES ###
+    # The RO open in the hub is skipped: its tree still holds the old sells and would save them back.
+    def offer_repricing(self):
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        try:
+            plan = BulkRepricer.plan(exclude_ro_ids=[getattr(self.ui, "current_ro_id", None)])
+        except Exception as e:
+            print(f"[SettingsManager] Re-pricing dry run failed: {e}")
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        if plan.is_empty():
+            return
+
+        box = QtWidgets.QMessageBox(self.ui)
+        box.setWindowTitle("Re-price Open Estimates")
+        box.setText(plan.summary() + ".\nUpdate their part prices to the new matrix?")
+        box.setDetailedText(plan.report(limit=500))
+        box.setStandardButtons(QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No)
+        box.setDefaultButton(QtWidgets.QMessageBox.StandardButton.No)
+        if box.exec() != QtWidgets.QMessageBox.StandardButton.Yes:
+            return
+
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        try:
+            result = BulkRepricer.apply(plan)
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        if result.ro_ids:
+            snapshot_cache().invalidate(result.ro_ids)
+        text = f"Re-priced {result.lines} Part Lines On {result.estimates} Estimates"
+        if result.failed:
+            text += f". {len(result.failed)} Estimates Could Not Be Updated"
+        self._show_message(text)
 
 
 ### LOADS ALL INFORMATION FROM shop_info TABLE ###
@@ -5,9 +5,11 @@ from pyvin import VIN
 from openauto.utils.validator import Validator
 from openauto.repositories.vehicle_repository import VehicleRepository
 from openauto.repositories.customer_repository import CustomerRepository
+from openauto.repositories.search_repository import SearchRepository
 from openauto.managers.belongs_to_manager import BelongsToManager
 from openauto.utils.fixed_popup_combo import FixedPopupCombo
 from openauto.managers.parts_tree.go_sidecar_manager import GoSidecarManager
+from openauto.managers.customer_manager import SEARCH_DEBOUNCE_MS, SEARCH_RESULT_LIMIT
 
 
 STATES = [
@@ -31,9 +33,14 @@ class VehicleManager:
         self.ui = main_window
         self.belongs_to_manager = BelongsToManager(main_window)
         self._plate_sidecar = None
+        self._search_text = ""
+        self._search_timer = QtCore.QTimer()
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._run_vehicle_search)
 
     def add_vehicle(self):
-        if not self.ui.customer_table.currentItem():
+        if not self.ui.customer_table.currentIndex().isValid():
             self._show_message("No Customer Selected, Please Highlight A Customer!")
             return
 
@@ -155,13 +162,9 @@ class VehicleManager:
         form.vin_line.clear()
 
     def load_customer_id(self):
-        row = self.ui.customer_table.currentRow()
-        customer_data = [
-            self.ui.customer_table.item(row, col).text() if self.ui.customer_table.item(row, col) else ""
-            for col in range(self.ui.customer_table.columnCount())
-        ]
+        customer_data = self.ui.customer_table.row_values(self.ui.customer_table.currentRow())
 
-        customer_id = customer_data[9]
+        customer_id = customer_data[9] if customer_data else ""
 
         if customer_id:
             self.save_vehicle(customer_id)
@@ -201,13 +204,29 @@ class VehicleManager:
         QtCore.QTimer.singleShot(0, lambda: QtWidgets.QMessageBox.information(self.ui, "Vehicle Added",
                         "Vehicle has been added."))
 
+### DEBOUNCED LIKE CustomerManager.customer_search_filter ###
     def vehicle_search_filter(self, text):
-        for row in range(self.ui.vehicle_table.rowCount()):
-            match = any(
-                text.lower() in (self.ui.vehicle_table.item(row, col).text().lower() if self.ui.vehicle_table.item(row, col) else "")
-                for col in range(self.ui.vehicle_table.columnCount())
-            )
-            self.ui.vehicle_table.setRowHidden(row, not match)
+        self._search_text = text
+        self._search_timer.start()
+
+    def _run_vehicle_search(self):
+        text = self._search_text.strip()
+        if not text:
+            self.ui.vehicle_table.set_search("")
+            return
+        if SearchRepository.enabled():
+            ids = SearchRepository.search_vehicles(text, limit=SEARCH_RESULT_LIMIT)
+            hits = {str(i) for i in ids}
+            self.ui.vehicle_table.show_matches(ids, lambda row: str(row[9]) in hits)
+            return
+        index = self.ui.vehicle_search_index
+        if not index.loaded:
+            # still building on its worker (started at startup); page through the table's LIKE search meanwhile
+            index.load_async()
+            self.ui.vehicle_table.set_search(text)
+            return
+        ids = index.search(text, limit=SEARCH_RESULT_LIMIT)
+        self.ui.vehicle_table.show_matches(ids, lambda row: index.matches(row[9], text))
 
     def add_new_vehicle(self):
         self._open_vehicle_form()
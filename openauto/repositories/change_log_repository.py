@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import mysql.connector
+from openauto.repositories import db_handlers
+
+
+### Change capture for SQLMonitor ###
+    # AFTER INSERT/UPDATE/DELETE triggers append (table, row id, op) to change_log with an AUTO_INCREMENT seq.
+    # Workstations remember the last seq they applied and only read what came after it. seq is handed out at
+    # INSERT, not at COMMIT, so a long transaction can commit a seq below one already read; readers keep the
+    # skipped seqs as gaps and look for them again (changes_in) until they turn up or age out.
+class ChangeLogRepository:
+    # table -> (primary key column, expression giving the owning RO id for NEW/OLD rows)
+    TRACKED: dict[str, tuple[str, str | None]] = {
+        "customers": ("customer_id", None),
+        "vehicles": ("id", None),
+        "appointments": ("id", None),
+        "repair_orders": ("id", "{row}.id"),
+        "estimate_jobs": ("id", "(SELECT e.ro_id FROM estimates e WHERE e.id = {row}.estimate_id)"),
+        "estimate_items": ("id", "{row}.ro_id"),
+    }
+
+    CREATE_TABLE = """
+        CREATE TABLE IF NOT EXISTS change_log (
+          seq        BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+          table_name VARCHAR(32) NOT NULL,
+          row_id     INT UNSIGNED NOT NULL,
+          ro_id      INT DEFAULT NULL,
+          op         ENUM('insert','update','delete') NOT NULL,
+          changed_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+          PRIMARY KEY (seq),
+          KEY ix_change_log_changed_at (changed_at)
+        ) ENGINE=InnoDB
+    """
+
+    @staticmethod
+    def trigger_name(table: str, op: str) -> str:
+        return f"trg_{table}_{op}_log"
+
+    @staticmethod
+    def trigger_sql(table: str, op: str) -> str:
+        pk, ro_expr = ChangeLogRepository.TRACKED[table]
+        row = "OLD" if op == "delete" else "NEW"
+        ro_value = ro_expr.format(row=row) if ro_expr else "NULL"
+        return (
+            f"CREATE TRIGGER IF NOT EXISTS {ChangeLogRepository.trigger_name(table, op)} "
+            f"AFTER {op.upper()} ON {table} FOR EACH ROW "
+            f"INSERT INTO change_log (table_name, row_id, ro_id, op) "
+            f"VALUES ('{table}', {row}.{pk}, {ro_value}, '{op}')"
+        )
+
+    ### CREATES change_log AND ITS TRIGGERS IF MISSING. RETURNS FALSE WHEN THE FEED CAN'T BE TRUSTED ###
+    # (no TRIGGER privilege, MySQL older than 8.0.29 without the triggers installed from openauto_schema.sql)
+    @staticmethod
+    def ensure_schema() -> bool:
+        expected = {ChangeLogRepository.trigger_name(t, op)
+                    for t in ChangeLogRepository.TRACKED for op in ("insert", "update", "delete")}
+        conn = db_handlers.connect_db()
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute(ChangeLogRepository.CREATE_TABLE)
+            except mysql.connector.Error:
+                pass
+            for table in ChangeLogRepository.TRACKED:
+                for op in ("insert", "update", "delete"):
+                    try:
+                        cur.execute(ChangeLogRepository.trigger_sql(table, op))
+                    except mysql.connector.Error:
+                        pass
+            try:
+                cur.execute("""
+                    SELECT TRIGGER_NAME FROM information_schema.TRIGGERS
+                    WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE IN (%s)
+                """ % ",".join(["%s"] * len(ChangeLogRepository.TRACKED)), tuple(ChangeLogRepository.TRACKED))
+                installed = {r[0] for r in cur.fetchall()}
+                cur.execute("SELECT 1 FROM change_log LIMIT 1")
+                cur.fetchall()
+            except mysql.connector.Error:
+                return False
+            cur.close()
+            return expected <= installed
+        finally:
+            conn.close()
+
+    @staticmethod
+    def latest_seq() -> int:
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log")
+                (seq,) = cur.fetchone()
+                return int(seq or 0)
+        finally:
+            conn.close()
+
+    ### ROWS AFTER after_seq AS (seq, table_name, row_id, ro_id, op), OLDEST FIRST ###
+    @staticmethod
+    def changes_since(after_seq: int, limit: int = 5000) -> list[tuple]:
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT seq, table_name, row_id, ro_id, op
+                    FROM change_log
+                    WHERE seq > %s
+                    ORDER BY seq
+                    LIMIT %s
+                """, (int(after_seq), int(limit)))
+                return cur.fetchall() or []
+        finally:
+            conn.close()
+
+    ### THE ROWS AMONG seqs THAT EXIST NOW (LATE COMMITS FILLING A GAP), SAME SHAPE AS changes_since ###
+    @staticmethod
+    def changes_in(seqs, chunk: int = 1000) -> list[tuple]:
+        seqs = sorted({int(s) for s in seqs or []})
+        if not seqs:
+            return []
+        out = []
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                for start in range(0, len(seqs), chunk):
+                    part = seqs[start:start + chunk]
+                    cur.execute(f"""
+                        SELECT seq, table_name, row_id, ro_id, op
+                        FROM change_log
+                        WHERE seq IN ({",".join(["%s"] * len(part))})
+                        ORDER BY seq
+                    """, tuple(part))
+                    out.extend(cur.fetchall() or [])
+            return out
+        finally:
+            conn.close()
+
+    @staticmethod
+    def purge_older_than(hours: int = 24) -> None:
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM change_log WHERE changed_at < NOW(3) - INTERVAL %s HOUR", (int(hours),))
+            conn.commit()
+        finally:
+            conn.close()
+
+    ### FOLDS A BATCH INTO ONE NET OP PER ROW: {table: {"insert": [...], "update": [...], "delete": [...]}} ###
+    @staticmethod
+    def coalesce(rows: list[tuple]) -> dict[str, dict[str, list[int]]]:
+        net: dict[str, dict[int, str]] = {}
+        for _seq, table, row_id, _ro_id, op in rows:
+            per_table = net.setdefault(table, {})
+            prev = per_table.get(row_id)
+            if prev == "insert" and op == "update":
+                continue
+            if prev == "delete" and op == "insert":
+                op = "update"
+            per_table[row_id] = op
+
+        out: dict[str, dict[str, list[int]]] = {}
+        for table, ops in net.items():
+            grouped = {"insert": [], "update": [], "delete": []}
+            for row_id, op in ops.items():
+                grouped[op].append(int(row_id))
+            out[table] = grouped
+        return out
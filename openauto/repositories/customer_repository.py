@@ -87,6 +87,92 @@ class CustomerRepository:
         return result if result else None
 
 
+### INDEX BEHIND get_customer_info_page ###
+    @staticmethod
+    def ensure_paging_index():
+        db_handlers.ensure_index("customers", "ix_customers_last_name", "last_name, customer_id")
+
+### ONE PAGE OF get_all_customer_info ROWS, KEYSET PAGED ON (last_name, customer_id) ###
+    # after is the (last_name, customer_id) of the last row already loaded; NULL last names sort first.
+    # search narrows to rows where any shown column contains the text.
+    @staticmethod
+    def get_customer_info_page(after=None, limit=200, search=""):
+        where, params = [], []
+        if after is not None:
+            last_name, customer_id = after
+            if last_name is None:
+                where.append("((last_name IS NULL AND customer_id > %s) OR last_name IS NOT NULL)")
+                params.append(customer_id)
+            else:
+                where.append("(last_name > %s OR (last_name = %s AND customer_id > %s))")
+                params += [last_name, last_name, customer_id]
+        if search:
+            where.append("CONCAT_WS(' ', last_name, first_name, address, city, state, zip, phone, alt_phone, "
+                         "email, customer_id) LIKE %s")
+            params.append(f"%{search}%")
+        query = "SELECT * FROM customers"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY last_name, customer_id LIMIT %s"
+        params.append(int(limit))
+
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor()
+        cursor.execute(query, tuple(params))
+        result = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return result or []
+
+
+### SAME ROWS AS get_all_customer_info / get_all_customer_names, LIMITED TO THE GIVEN customer_ids ###
+    @staticmethod
+    def get_customer_info_by_ids(customer_ids):
+        if not customer_ids:
+            return []
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor()
+        query = "SELECT * FROM customers WHERE customer_id IN (%s) ORDER BY last_name" % ",".join(["%s"] * len(customer_ids))
+        cursor.execute(query, tuple(customer_ids))
+        result = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return result or []
+
+    @staticmethod
+    def get_customer_names_by_ids(customer_ids):
+        if not customer_ids:
+            return []
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor()
+        query = ("SELECT last_name, first_name, phone, customer_id FROM customers WHERE customer_id IN (%s) "
+                 "ORDER BY last_name") % ",".join(["%s"] * len(customer_ids))
+        cursor.execute(query, tuple(customer_ids))
+        result = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return result or []
+
+
+### COMPACT ROWS FOR THE IN-MEMORY SEARCH INDEX: (customer_id, last_name, first_name, phone, alt_phone, email, address, city, state, zip) ###
+    @staticmethod
+    def get_search_fields(customer_ids=None):
+        query = "SELECT customer_id, last_name, first_name, phone, alt_phone, email, address, city, state, zip FROM customers"
+        params = ()
+        if customer_ids is not None:
+            if not customer_ids:
+                return []
+            query += " WHERE customer_id IN (%s)" % ",".join(["%s"] * len(customer_ids))
+            params = tuple(customer_ids)
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        result = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return result or []
+
+
 ### GETS customer_id ###
     @staticmethod
     def get_customer_info_by_id(customer_id):
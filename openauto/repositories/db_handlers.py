@@ -1,6 +1,10 @@
 import os
+import threading
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import mysql.connector
+from openauto.repositories.db_pool import ConnectionPool
+from openauto.repositories.unit_of_work import Session, RollbackOnlyError, active_session, _set_session
 
 
 
@@ -11,7 +15,18 @@ import mysql.connector
 env_path = os.path.join(os.path.dirname(__file__), ".env")
 load_dotenv()
 
-def connect_db():
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def _env_number(name, default, cast=int):
+    try:
+        return cast(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def open_raw_connection():
     return mysql.connector.connect(
         host=os.getenv("MYSQL_HOST"),
         user=os.getenv("MYSQL_USER"),
@@ -22,6 +37,116 @@ def connect_db():
         )
 
 
+### SHARED CONNECTION POOL. MYSQL_POOL_SIZE=0 FALLS BACK TO ONE NEW CONNECTION PER CALL ###
+def get_pool() -> ConnectionPool | None:
+    global _pool
+    if _pool is not None:
+        return _pool
+    size = _env_number("MYSQL_POOL_SIZE", 8)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                open_raw_connection,
+                max_size=size,
+                min_idle=_env_number("MYSQL_POOL_MIN_IDLE", 1),
+                checkout_timeout=_env_number("MYSQL_POOL_TIMEOUT", 30.0, float),
+                idle_timeout=_env_number("MYSQL_POOL_IDLE_SECONDS", 300.0, float),
+            )
+    return _pool
+
+
+def _checkout_connection():
+    pool = get_pool()
+    if pool is None:
+        return open_raw_connection()
+    return pool.connect()
+
+
+def connect_db():
+    session = active_session()
+    if session is not None:
+        return session.connection()
+    return _checkout_connection()
+
+
+### RUNS EVERY REPOSITORY CALL IN THE BLOCK ON ONE CONNECTION AND ONE TRANSACTION ###
+# commits when the block finishes, rolls back if it raises. Nested blocks join the outer one.
+# A statement that failed inside the block (even if the caller swallowed the error) or a rollback() call
+# makes it roll back and raise RollbackOnlyError instead of committing the rest.
+@contextmanager
+def unit_of_work():
+    session = active_session()
+    if session is None:
+        session = Session(_checkout_connection())
+        try:
+            session.begin()
+        except Exception:
+            session.close()
+            raise
+        _set_session(session)
+    session.depth += 1
+    try:
+        yield session.connection()
+        if session.depth == 1:
+            if session.rollback_only:
+                reason = session.error or "rollback() called inside it"
+                raise RollbackOnlyError(f"unit of work rolled back: {reason}") from session.error
+            session.commit()
+    except BaseException:
+        if session.depth == 1:
+            session.rollback()
+        raise
+    finally:
+        session.depth -= 1
+        if session.depth == 0:
+            _set_session(None)
+            session.close()
+
+
+### PINS ONE POOLED CONNECTION TO THE CALLING THREAD (SQLMonitor) SO POLLING NEVER WAITS ON A CHECKOUT ###
+def bind_thread_connection():
+    pool = get_pool()
+    if pool is not None:
+        pool.bind_current_thread()
+
+
+def release_thread_connection():
+    pool = get_pool()
+    if pool is not None:
+        pool.release_current_thread()
+
+
+def pool_stats() -> dict:
+    pool = get_pool()
+    return pool.stats() if pool is not None else {}
+
+
+_ensured_indexes: set[str] = set()
+
+
+### CREATES AN INDEX ONCE PER PROCESS IF THE SCHEMA DOESN'T HAVE IT (MySQL HAS NO CREATE INDEX IF NOT EXISTS) ###
+def ensure_index(table: str, name: str, columns: str) -> None:
+    if name in _ensured_indexes:
+        return
+    conn = connect_db()
+    try:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT 1 FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1
+        """, (table, name))
+        if not cur.fetchall():
+            cur.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+        cur.close()
+        _ensured_indexes.add(name)
+    except mysql.connector.Error as e:
+        print(f"[db_handlers] Could not ensure index {name}: {e}")
+    finally:
+        conn.close()
+
+
 def customer_rows():
     my_db = connect_db()
     conn = my_db.cursor()
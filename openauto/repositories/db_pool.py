@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+
+@dataclass
+class PoolStats:
+    size: int = 0               # live connections (idle + in use + thread bound)
+    idle: int = 0
+    in_use: int = 0
+    bound: int = 0              # connections pinned to a thread (SQLMonitor)
+    created: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    waits: int = 0              # checkouts that had to wait for a free slot
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    health_checks: int = 0
+    reconnects: int = 0
+    reaped: int = 0             # idle connections closed by the reaper
+    discarded: int = 0          # broken connections thrown away
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        d["avg_wait_ms"] = (self.total_wait_ms / self.waits) if self.waits else 0.0
+        return d
+
+
+class _Slot:
+    __slots__ = ("raw", "last_used", "holders")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.last_used = time.monotonic()
+        self.holders = 0            # open proxies on a thread bound slot
+
+
+### Proxy handed out by ConnectionPool.connect(). Behaves like a mysql.connector connection, but close()
+### (and leaving a `with conn:` block, or the proxy being garbage collected) returns it to the pool.
+class PooledConnection:
+    def __init__(self, pool: "ConnectionPool", slot: _Slot, pinned: bool = False):
+        self._pool = pool
+        self._slot = slot
+        self._pinned = pinned
+        self._cursors: list = []
+
+    def __getattr__(self, name):
+        slot = self.__dict__.get("_slot")
+        if slot is None:
+            raise mysql.connector.errors.OperationalError("Connection already returned to the pool")
+        return getattr(slot.raw, name)
+
+    @property
+    def raw(self):
+        return self._slot.raw if self._slot else None
+
+    def cursor(self, *args, **kwargs):
+        cur = self._slot.raw.cursor(*args, **kwargs)
+        self._cursors.append(cur)
+        return cur
+
+    def close(self) -> None:
+        slot, self._slot = self._slot, None
+        if slot is None:
+            return
+        for cur in self._cursors:
+            try:
+                cur.close()
+            except Exception:
+                pass
+        self._cursors.clear()
+        self._pool._checkin(slot, pinned=self._pinned)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # Repositories that forget conn.close() would otherwise leak a pool slot.
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+### Sized, thread safe pool of MySQL connections ###
+# checkout/return with a bounded wait, ping based health checks for connections that sat idle,
+# idle reaping down to min_idle, and per-thread affinity for long lived workers like SQLMonitor.
+class ConnectionPool:
+    def __init__(self, factory: Callable[[], object], *, max_size: int = 8, min_idle: int = 1,
+                 checkout_timeout: float = 30.0, idle_timeout: float = 300.0, health_check_after: float = 30.0):
+        self._factory = factory
+        self.max_size = max(1, int(max_size))
+        self.min_idle = max(0, int(min_idle))
+        self.checkout_timeout = float(checkout_timeout)
+        self.idle_timeout = float(idle_timeout)
+        self.health_check_after = float(health_check_after)
+
+        self._cond = threading.Condition(threading.RLock())
+        self._idle: list[_Slot] = []       # LIFO, most recently used at the end
+        self._in_use = 0
+        self._bound: dict[int, _Slot] = {}
+        self._stats = PoolStats()
+
+    # ---------- public API ----------
+    # A bound thread gets its pinned connection, health checked and reset, only while no other proxy holds it.
+    # A nested connect() on that thread (a repository called while the outer one still reads or holds a
+    # transaction) gets an ordinary pooled connection instead, so it can't consume the outer rows or roll
+    # back the outer transaction.
+    def connect(self) -> PooledConnection:
+        bound = self._bound.get(threading.get_ident())
+        if bound is not None and bound.holders == 0:
+            self._health_check(bound)
+            self._reset(bound.raw)
+            bound.holders += 1
+            return PooledConnection(self, bound, pinned=True)
+        return PooledConnection(self, self._checkout())
+
+    def bind_current_thread(self) -> None:
+        ident = threading.get_ident()
+        if ident in self._bound:
+            return
+        slot = self._checkout()
+        with self._cond:
+            self._in_use -= 1
+            self._bound[ident] = slot
+
+    def release_current_thread(self) -> None:
+        with self._cond:
+            slot = self._bound.pop(threading.get_ident(), None)
+            if slot is None:
+                return
+            self._in_use += 1
+        self._checkin(slot)
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._stats.idle = len(self._idle)
+            self._stats.in_use = self._in_use
+            self._stats.bound = len(self._bound)
+            self._stats.size = self._stats.idle + self._stats.in_use + self._stats.bound
+            return self._stats.as_dict()
+
+    def reap_idle(self) -> int:
+        now = time.monotonic()
+        doomed: list[_Slot] = []
+        with self._cond:
+            keep: list[_Slot] = []
+            # oldest first; keep the freshest min_idle connections around
+            for i, slot in enumerate(self._idle):
+                remaining = len(self._idle) - i
+                if remaining > self.min_idle and now - slot.last_used > self.idle_timeout:
+                    doomed.append(slot)
+                else:
+                    keep.append(slot)
+            self._idle = keep
+            self._stats.reaped += len(doomed)
+            if doomed:
+                self._cond.notify(len(doomed))
+        for slot in doomed:
+            self._close_raw(slot.raw)
+        return len(doomed)
+
+    def close_all(self) -> None:
+        with self._cond:
+            slots = self._idle + list(self._bound.values())
+            self._idle = []
+            self._bound.clear()
+        for slot in slots:
+            self._close_raw(slot.raw)
+
+    # ---------- internals ----------
+    def _live(self) -> int:
+        return len(self._idle) + self._in_use + len(self._bound)
+
+    def _checkout(self) -> _Slot:
+        self.reap_idle()
+        started = time.monotonic()
+        waited = False
+        create = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    slot = self._idle.pop()
+                    break
+                if self._live() < self.max_size:
+                    create = True
+                    slot = None
+                    break
+                waited = True
+                remaining = self.checkout_timeout - (time.monotonic() - started)
+                if remaining <= 0 or not self._cond.wait(remaining):
+                    if not self._idle and self._live() >= self.max_size:
+                        raise PoolError(f"No MySQL connection available after {self.checkout_timeout:.0f}s "
+                                        f"(pool size {self.max_size})")
+            self._in_use += 1
+            self._stats.checkouts += 1
+            if waited:
+                ms = (time.monotonic() - started) * 1000.0
+                self._stats.waits += 1
+                self._stats.total_wait_ms += ms
+                self._stats.max_wait_ms = max(self._stats.max_wait_ms, ms)
+
+        try:
+            if create:
+                slot = _Slot(self._factory())
+                with self._cond:
+                    self._stats.created += 1
+            else:
+                self._health_check(slot)
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return slot
+
+    def _health_check(self, slot: _Slot) -> None:
+        if time.monotonic() - slot.last_used < self.health_check_after:
+            return
+        with self._cond:
+            self._stats.health_checks += 1
+        raw = slot.raw
+        slot.last_used = time.monotonic()
+        try:
+            if raw.is_connected():
+                return
+        except Exception:
+            pass
+        try:
+            raw.reconnect(attempts=2, delay=0)
+            raw.autocommit = True
+        except Exception:
+            self._close_raw(raw)
+            slot.raw = self._factory()
+            with self._cond:
+                self._stats.discarded += 1
+                self._stats.created += 1
+        with self._cond:
+            self._stats.reconnects += 1
+
+    def _reset(self, raw) -> None:
+        # leave the connection the way connect_db() always handed it out: autocommit, no open tx, no pending rows
+        if getattr(raw, "unread_result", False):
+            raw.consume_results()
+        if raw.in_transaction:
+            raw.rollback()
+        if not raw.autocommit:
+            raw.autocommit = True
+
+    def _checkin(self, slot: _Slot, pinned: bool = False) -> None:
+        if pinned:
+            slot.holders = max(0, slot.holders - 1)
+            if slot.holders:
+                return
+        try:
+            self._reset(slot.raw)
+            healthy = True
+        except Exception:
+            healthy = False
+
+        if pinned:
+            if not healthy:
+                try:
+                    slot.raw.reconnect(attempts=2, delay=0)
+                    slot.raw.autocommit = True
+                    with self._cond:
+                        self._stats.reconnects += 1
+                except Exception:
+                    pass
+            return
+
+        slot.last_used = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            self._stats.checkins += 1
+            if healthy:
+                self._idle.append(slot)
+            else:
+                self._stats.discarded += 1
+            self._cond.notify()
+        if not healthy:
+            self._close_raw(slot.raw)
+
+    @staticmethod
+    def _close_raw(raw) -> None:
+        try:
+            raw.close()
+        except Exception:
+            pass
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from openauto.repositories.db_handlers import connect_db
+from openauto.repositories.db_handlers import connect_db, unit_of_work
 from typing import Any, Dict, List
 import json
 
@@ -100,51 +100,257 @@ class EstimateItemsRepository:
     def move_items(*, item_ids: list[int], target_job_id: int, insert_at: int):
         if not item_ids:
             return
+        moving = [int(i) for i in item_ids]
+        with unit_of_work() as conn:
+            with conn.cursor() as cur:
+                # Current locations of the moved rows plus everything already in the target job
+                q = ("SELECT id, job_id FROM estimate_items WHERE job_id = %s OR id IN (%s) "
+                     "ORDER BY line_order, id") % ("%s", ",".join(["%s"] * len(moving)))
+                cur.execute(q, [target_job_id, *moving])
+                rows = cur.fetchall()
+
+            moving_set = set(moving)
+            src_jobs = {job_id for iid, job_id in rows if iid in moving_set and job_id != target_job_id}
+            ordered = [iid for iid, job_id in rows if job_id == target_job_id and iid not in moving_set]
+            insert_at = max(0, min(int(insert_at), len(ordered)))
+            ordered[insert_at:insert_at] = moving
+
+            EstimateItemsRepository.reorder_job(target_job_id, ordered)
+            EstimateItemsRepository.compact_line_order([j for j in src_jobs if j is not None])
+
+    ### SET BASED REORDER: ONE STATEMENT REWRITES line_order FOR A WHOLE JOB ###
+    # Each id gets its position in ordered_ids as line_order. A None entry (a line not saved yet) keeps its
+    # slot, so the numbers match the tree's 0..n-1. Rows listed are also moved into the job if they lived elsewhere.
+    @staticmethod
+    def reorder_job(job_id: int, ordered_ids: list[int | None]) -> None:
+        pairs = [(int(i), order) for order, i in enumerate(ordered_ids or []) if i is not None]
+        if not pairs:
+            return
+        ids = [i for i, _order in pairs]
+        sql = f"""
+            UPDATE estimate_items i
+              JOIN estimate_jobs j ON j.id = %s
+               SET i.job_id     = j.id,
+                   i.job_name   = j.name,
+                   i.line_order = CASE i.id {' '.join(['WHEN %s THEN %s'] * len(pairs))} END
+             WHERE i.id IN ({",".join(["%s"] * len(ids))})
+        """
+        conn = connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql, [job_id, *(v for pair in pairs for v in pair), *ids])
+            conn.commit()
+        finally:
+            conn.close()
+
+    ### RENUMBERS line_order 0..n-1 INSIDE EACH GIVEN JOB, KEEPING THE CURRENT ORDER ###
+    @staticmethod
+    def compact_line_order(job_ids: list[int]) -> None:
+        if not job_ids:
+            return
+        marks = ",".join(["%s"] * len(job_ids))
+        sql = f"""
+            UPDATE estimate_items i
+              JOIN (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY job_id ORDER BY line_order, id) - 1 AS rn
+                  FROM estimate_items
+                 WHERE job_id IN ({marks})
+              ) x ON x.id = i.id
+               SET i.line_order = x.rn
+        """
+        conn = connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql, list(job_ids))
+            conn.commit()
+        finally:
+            conn.close()
+
+    ### SET BASED job_order: ONE STATEMENT NUMBERS EVERY LINE OF AN ESTIMATE BY ITS JOB'S POSITION (1..n) ###
+    @staticmethod
+    def renumber_jobs(estimate_id: int, ordered_job_ids: list[int]) -> None:
+        ids = [int(j) for j in ordered_job_ids if j is not None]
+        if not ids:
+            return
+        marks = ",".join(["%s"] * len(ids))
+        sql = f"UPDATE estimate_items SET job_order = FIELD(job_id, {marks}) WHERE estimate_id = %s AND job_id IN ({marks})"
+        conn = connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql, [*ids, estimate_id, *ids])
+            conn.commit()
+        finally:
+            conn.close()
+
+    ### UPSERT OF MANY LINES. RETURNS THE ROW IDS IN THE SAME ORDER AS items ###
+    # Rows carrying an id are rewritten with one UPDATE ... WHERE id IN (...) per UPSERT_CHUNK rows; a row
+    # deleted elsewhere since it was read is not brought back, its id comes back as None. New rows go out as
+    # one multi row INSERT per chunk and their ids are read back by READBACK_KEY: a statement's ids start at
+    # lastrowid but need not be consecutive (innodb_autoinc_lock_mode=2). Run it inside a unit of work, so a
+    # read back that can't be matched rolls the inserts back with everything else.
+    UPSERT_CHUNK = 500
+    READBACK_KEY = ("estimate_id", "job_id", "line_order", "type", "item_description", "sku_number")
+
+    @staticmethod
+    def bulk_upsert_items(items: list[dict]) -> list[int | None]:
+        if not items:
+            return []
+        cols = EstimateItemsRepository.COLS
+        chunk = EstimateItemsRepository.UPSERT_CHUNK
+        ids: list[int | None] = [None] * len(items)
+
+        existing = [(n, it) for n, it in enumerate(items) if it.get("id")]
+        fresh = [(n, it) for n, it in enumerate(items) if not it.get("id")]
+
         conn = connect_db()
-        cur = conn.cursor()
         try:
-            conn.start_transaction()
-
-            # Read current locations (id, job_id, line_order)
-            q = "SELECT id, job_id, line_order FROM estimate_items WHERE id IN (%s)" % \
-                ",".join(["%s"] * len(item_ids))
-            cur.execute(q, item_ids)
-            rows = cur.fetchall()  # [(id, job_id, line_order), ...]
-
-            # Compact each source job
-            by_src = {}
-            for row in rows:
-                by_src.setdefault(row[1], []).append(row[2])
-            for src_job_id, removed_orders in by_src.items():
-                for lo in sorted(removed_orders):
-                    cur.execute("""
-                        UPDATE estimate_items
-                           SET line_order = line_order - 1
-                         WHERE job_id = %s AND line_order > %s
-                    """, (src_job_id, lo))
-
-            # Make room in target
-            cur.execute("""
-                UPDATE estimate_items
-                   SET line_order = line_order + %s
-                 WHERE job_id = %s AND line_order >= %s
-            """, (len(item_ids), target_job_id, insert_at))
-
-            # Place moved items in order
-            for offset, iid in enumerate(item_ids):
-                cur.execute("""
-                    UPDATE estimate_items
-                       SET job_id = %s, line_order = %s
-                     WHERE id = %s
-                """, (target_job_id, insert_at + offset, iid))
+            with conn.cursor() as cur:
+                for start in range(0, len(existing), chunk):
+                    part = existing[start:start + chunk]
+                    wanted = [int(it["id"]) for _n, it in part]
+                    marks = ",".join(["%s"] * len(wanted))
+                    cur.execute(f"SELECT id FROM estimate_items WHERE id IN ({marks}) FOR UPDATE", wanted)
+                    present = {int(r[0]) for r in cur.fetchall()}
+                    part = [(n, it) for n, it in part if int(it["id"]) in present]
+                    if not part:
+                        continue
+                    rows = [(int(it["id"]), EstimateItemsRepository._coerce_for_db(it)) for _n, it in part]
+                    for _item_id, data in rows:
+                        # the column is NOT NULL; a line blanked in the tree stays blank
+                        data["item_description"] = data.get("item_description") or ""
+                    whens = " ".join(["WHEN %s THEN %s"] * len(rows))
+                    params: list = []
+                    for c in cols:
+                        for item_id, data in rows:
+                            params.extend((item_id, data.get(c)))
+                    row_ids = [item_id for item_id, _data in rows]
+                    cur.execute(
+                        f"UPDATE estimate_items SET {', '.join(f'{c} = CASE id {whens} END' for c in cols)} "
+                        f"WHERE id IN ({','.join(['%s'] * len(row_ids))})",
+                        [*params, *row_ids],
+                    )
+                    for n, it in part:
+                        ids[n] = int(it["id"])
+
+                row_marks = "(" + ", ".join(["%s"] * len(cols)) + ")"
+                for start in range(0, len(fresh), chunk):
+                    part = fresh[start:start + chunk]
+                    rows = []
+                    for n, it in part:
+                        data = EstimateItemsRepository._coerce_for_db(it)
+                        # new lines need a description; blank ones have always gone in as EMPTY
+                        data["item_description"] = data.get("item_description") or "EMPTY"
+                        rows.append((n, data))
+                    cur.execute(
+                        f"INSERT INTO estimate_items ({', '.join(cols)}) VALUES {', '.join([row_marks] * len(rows))}",
+                        [data.get(c) for _n, data in rows for c in cols],
+                    )
+                    for n, item_id in EstimateItemsRepository._read_back_ids(cur, int(cur.lastrowid), rows):
+                        ids[n] = item_id
+            conn.commit()
+        finally:
+            conn.close()
+        return ids
+
+    # [(n, id)] for the rows one multi row INSERT just wrote, matched on READBACK_KEY in id order among the
+    # rows at or past its first id. A key seen more often than this INSERT wrote it would be a guess: raise.
+    @staticmethod
+    def _read_back_ids(cur, first_id: int, rows: list[tuple[int, dict]]) -> list[tuple[int, int]]:
+        key_cols = EstimateItemsRepository.READBACK_KEY
+
+        def key(values) -> tuple:
+            return tuple(None if v is None else str(v) for v in values)
+
+        waiting: dict[tuple, list[int]] = {}
+        for n, data in rows:
+            waiting.setdefault(key(data.get(c) for c in key_cols), []).append(n)
+        estimate_ids = sorted({int(data["estimate_id"]) for _n, data in rows})
+        cur.execute(
+            f"SELECT id, {', '.join(key_cols)} FROM estimate_items "
+            f"WHERE id >= %s AND estimate_id IN ({','.join(['%s'] * len(estimate_ids))}) ORDER BY id",
+            [first_id, *estimate_ids],
+        )
+        found: dict[tuple, list[int]] = {}
+        for r in cur.fetchall():
+            if key(r[1:]) in waiting:
+                found.setdefault(key(r[1:]), []).append(int(r[0]))
+        out = []
+        for k, positions in waiting.items():
+            got = found.get(k, [])
+            if len(got) != len(positions):
+                raise RuntimeError(f"inserted {len(positions)} lines but read back "
+                                   f"{len(got)} for {k}")
+            out.extend(zip(positions, got))
+        return out
+
+    ### NON-APPROVED PART LINES WITH A COST ON OPEN ESTIMATES, ONE KEYSET PAGE (BY id) AT A TIME ###
+    # Rows are (id, estimate_id, ro_id, job_id, sku_number, item_description, qty, unit_cost, unit_price).
+    # Open means the estimate isn't archived and its RO isn't at checkout or archived; lines on approved
+    # jobs are left out with the approved lines themselves. Bulk re-pricing reads these.
+    @staticmethod
+    def iter_repriceable_parts(page_size: int = 5000):
+        sql = """
+            SELECT i.id, i.estimate_id, i.ro_id, i.job_id, i.sku_number, i.item_description,
+                   i.qty, i.unit_cost, i.unit_price
+              FROM estimate_items i
+              JOIN estimates e ON e.id = i.estimate_id
+              LEFT JOIN estimate_jobs j ON j.id = i.job_id
+              LEFT JOIN repair_orders r ON r.id = i.ro_id
+             WHERE i.id > %s
+               AND i.type = 'part'
+               AND i.status <> 'approved'
+               AND COALESCE(i.archived, 0) = 0
+               AND i.unit_cost > 0
+               AND (j.id IS NULL OR j.status <> 'approved')
+               AND COALESCE(e.archived, 0) = 0
+               AND (r.id IS NULL OR r.status NOT IN ('checkout', 'archived'))
+             ORDER BY i.id
+             LIMIT %s
+        """
+        last_id = 0
+        while True:
+            conn = connect_db()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(sql, (last_id, int(page_size)))
+                    rows = cur.fetchall()
+            finally:
+                conn.close()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1][0]
 
+    ### SETS unit_price ON MANY LINES OF ONE ESTIMATE, UPSERT_CHUNK LINES PER UPDATE. RETURNS ROWS CHANGED ###
+    # prices is [(item_id, unit_price)]. Lines approved since they were read are skipped.
+    @staticmethod
+    def set_unit_prices(estimate_id: int, prices: list[tuple[int, Any]]) -> int:
+        if not prices:
+            return 0
+        chunk = EstimateItemsRepository.UPSERT_CHUNK
+        changed = 0
+        conn = connect_db()
+        try:
+            with conn.cursor() as cur:
+                for start in range(0, len(prices), chunk):
+                    part = prices[start:start + chunk]
+                    ids = [int(item_id) for item_id, _price in part]
+                    params: list = []
+                    for item_id, price in part:
+                        params.extend((int(item_id), price))
+                    marks = ",".join(["%s"] * len(ids))
+                    cur.execute(
+                        f"UPDATE estimate_items SET unit_price = CASE id {' '.join(['WHEN %s THEN %s'] * len(part))} END "
+                        f"WHERE estimate_id = %s AND id IN ({marks}) AND status <> 'approved'",
+                        [*params, estimate_id, *ids],
+                    )
+                    changed += cur.rowcount
             conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
         finally:
-            cur.close()
             conn.close()
+        return changed
 
     @staticmethod
     def get_ids_for_estimate(estimate_id: int) -> list[int]:
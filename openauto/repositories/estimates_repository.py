@@ -61,6 +61,22 @@ class EstimatesRepository:
             cur.execute("UPDATE estimates SET total_amount=%s WHERE id=%s", (total, estimate_id))
             conn.commit()
 
+    ### total_amount FROM THE STORED line_total COLUMN, IN SQL (BULK RE-PRICING; THE HUB SAVES ITS OWN SUM) ###
+    @staticmethod
+    def recompute_total(estimate_id: int) -> None:
+        conn = connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE estimates e
+                       SET e.total_amount = (SELECT COALESCE(SUM(i.line_total), 0)
+                                               FROM estimate_items i WHERE i.estimate_id = e.id)
+                     WHERE e.id = %s
+                """, (estimate_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
     @staticmethod
     def get_internal_memo(estimate_id: int) -> str | None:
         conn = connect_db()
@@ -1,9 +1,11 @@
 from PyQt6.QtGui import QCursor
 
-from openauto.repositories.db_handlers import connect_db
-import datetime
+from openauto.repositories.db_handlers import connect_db, unit_of_work
 from openauto.repositories import db_handlers
 from openauto.repositories.estimate_jobs_repository import EstimateJobsRepository
+from openauto.repositories.ro_totals_repository import ROTotalsRepository
+from openauto.repositories.ro_number_repository import RONumberRepository
+import mysql.connector
 from typing import Optional
 
 
@@ -16,22 +18,31 @@ class RepairOrdersRepository:
 
     @staticmethod
     def create_repair_order(customer_id, vehicle_id, appointment_id=None, ro_number=None, created_by=None, assigned_writer_id=None):
-        if ro_number is None:
+        generated = ro_number is None
+        if generated:
             ro_number = RepairOrdersRepository.generate_next_ro_number()
 
-        conn = connect_db()
-        cursor = conn.cursor()
         query = """
             INSERT INTO repair_orders (customer_id, vehicle_id, appointment_id, ro_number, created_by, assigned_writer_id)
             VALUES (%s, %s, %s, %s, %s, %s)
         """
-        values = (customer_id, vehicle_id, appointment_id, ro_number, created_by, assigned_writer_id)
-        cursor.execute(query, values)
-        conn.commit()
-        ro_id = cursor.lastrowid
-        cursor.close()
-        conn.close()
-        return ro_id
+        for attempt in range(2):
+            conn = connect_db()
+            cursor = conn.cursor()
+            try:
+                values = (customer_id, vehicle_id, appointment_id, ro_number, created_by, assigned_writer_id)
+                cursor.execute(query, values)
+                conn.commit()
+                return cursor.lastrowid
+            except mysql.connector.IntegrityError as e:
+                # a number taken outside the sequence (older client, manual entry): move past it and try once more
+                if not generated or attempt or e.errno != 1062:
+                    raise
+                RONumberRepository.resync(int(ro_number.split("-")[0]))
+                ro_number = RepairOrdersRepository.generate_next_ro_number()
+            finally:
+                cursor.close()
+                conn.close()
 
 
     @staticmethod
@@ -86,35 +97,36 @@ class RepairOrdersRepository:
         conn.close()
 
 
+    ### NEXT "YYYY-NNNNN" FROM THE PER-YEAR SEQUENCE (RONumberRepository), NO SCAN OF repair_orders ###
     @staticmethod
     def generate_next_ro_number():
-        conn = connect_db()
-        cursor = conn.cursor()
-        year = datetime.datetime.now().year
-        prefix = f"{year}-%"
+        return RONumberRepository.next_number()
 
-        query = """
-            SELECT ro_number FROM repair_orders
-            WHERE ro_number LIKE %s
-            ORDER BY ro_number DESC LIMIT 1
-        """
-        cursor.execute(query, (prefix,))
-        last = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        if last and last[0]:
-            last_seq = int(last[0].split("-")[1])
-        else:
-            last_seq = 0
+    ### INDEX BEHIND THE BOARD LANES: ONE RANGE SCAN PER PAGE OF A STATUS ###
+    @staticmethod
+    def ensure_board_index():
+        db_handlers.ensure_index("repair_orders", "ix_ro_status_number", "status, ro_number, id")
 
-        return f"{year}-{last_seq + 1:05d}"
+    ### KEYSET CONDITION "AFTER (ro_number, id)" FOR THE BOARD ORDER; NULL ro_numbers SORT FIRST ###
+    @staticmethod
+    def _after_sql(alias: str, after) -> tuple[str, tuple]:
+        if after is None:
+            return "", ()
+        ro_number, ro_id = after
+        if ro_number is None:
+            return (f" AND (({alias}.ro_number IS NULL AND {alias}.id > %s) OR {alias}.ro_number IS NOT NULL)",
+                    (ro_id,))
+        return (f" AND ({alias}.ro_number > %s OR ({alias}.ro_number = %s AND {alias}.id > %s))",
+                (ro_number, ro_number, ro_id))
 
+    ### ONE PAGE OF A STATUS, KEYSET PAGED ON (status, ro_number, id) ###
+    # after is the (ro_number, id) of the last row already loaded, so deep pages cost the same as the first
     @staticmethod
-    def load_repair_orders(status="open", limit=200, offset=0):
+    def load_repair_orders(status="open", limit=200, after=None):
+        after_sql, after_params = RepairOrdersRepository._after_sql("ro", after)
         conn = db_handlers.connect_db()
         cursor = conn.cursor()
-        query = """
+        query = f"""
             SELECT
                 ro.id,
                 ro.ro_number,
@@ -132,16 +144,99 @@ class RepairOrdersRepository:
             LEFT JOIN vehicles  v ON v.id = ro.vehicle_id
             LEFT JOIN users     t ON t.id = ro.assigned_tech_id
             LEFT JOIN users     w ON w.id = COALESCE(ro.assigned_writer_id, ro.created_by)
-            WHERE ro.status = %s
-            ORDER BY ro.ro_number
-            LIMIT %s OFFSET %s
+            WHERE ro.status = %s{after_sql}
+            ORDER BY ro.ro_number, ro.id
+            LIMIT %s
         """
-        cursor.execute(query, (status, limit, offset))
+        cursor.execute(query, (status,) + after_params + (int(limit),))
         result = cursor.fetchall() or []
         cursor.close()
         conn.close()
         return result
 
+    ### EVERYTHING A BOARD TILE SHOWS, FOR ONE PAGE OF A STATUS LANE (OR SOME ro_ids) IN ONE QUERY ###
+    # Replaces the per-tile get_primary_concern / get_create_altered_date / estimate_total_for_ro round trips.
+    # The page CTE picks the ROs first (an ix_ro_status_number range scan), so totals are summed for that page only,
+    # or read from estimates.grand_total once ROTotalsRepository keeps it (BOARD_TOTAL_STORED).
+    # total is tax inclusive and skips declined jobs/items (same rule as estimate_total_for_ro);
+    # None when the RO has no estimate yet.
+    BOARD_SNAPSHOT_SQL = """
+        WITH page AS (
+            SELECT r.id, r.estimate_id
+              FROM repair_orders r
+             WHERE {scope}
+             ORDER BY r.ro_number, r.id
+             LIMIT %s
+        )
+        SELECT
+            ro.id AS ro_id,
+            ro.ro_number,
+            ro.status,
+            ro.created_at,
+            ro.updated_at,
+            ro.miles_in,
+            ro.miles_out,
+            CONCAT(c.first_name, ' ', c.last_name) AS customer,
+            v.year,
+            v.make,
+            v.model,
+            CONCAT(t.first_name,' ',t.last_name) AS tech,
+            CONCAT(w.first_name,' ',w.last_name) AS writer,
+            (SELECT l.concern FROM ro_c3_lines l
+              WHERE l.ro_id = ro.id
+              ORDER BY l.line_no ASC, l.id ASC
+              LIMIT 1) AS concern,
+            CASE WHEN ro.estimate_id IS NULL THEN NULL ELSE COALESCE(tot.total, 0) END AS total
+        FROM page
+        JOIN repair_orders ro ON ro.id = page.id
+        LEFT JOIN customers c ON c.customer_id = ro.customer_id
+        LEFT JOIN vehicles  v ON v.id = ro.vehicle_id
+        LEFT JOIN users     t ON t.id = ro.assigned_tech_id
+        LEFT JOIN users     w ON w.id = COALESCE(ro.assigned_writer_id, ro.created_by)
+        LEFT JOIN {totals} tot ON tot.estimate_id = ro.estimate_id
+        ORDER BY ro.ro_number, ro.id
+    """
+
+    BOARD_TOTAL_SUMMED = """(
+            SELECT i.estimate_id,
+                   SUM(CASE
+                           WHEN j.status = 'declined' OR i.status = 'declined' THEN 0
+                           ELSE ROUND(
+                               COALESCE(i.qty, 1) * COALESCE(i.unit_price, 0) *
+                               (1 + (CASE WHEN i.taxable = 1 THEN COALESCE(i.tax_pct, 0) / 100 ELSE 0 END)),
+                               2)
+                       END) AS total
+              FROM page p2
+              JOIN estimate_items i ON i.estimate_id = p2.estimate_id
+              LEFT JOIN estimate_jobs j ON j.id = i.job_id
+             GROUP BY i.estimate_id
+        )"""
+
+    BOARD_TOTAL_STORED = "(SELECT e.id AS estimate_id, e.grand_total AS total FROM page p2 JOIN estimates e ON e.id = p2.estimate_id)"
+
+    # after: (ro_number, ro_id) of the last row a lane already shows; the next page starts right behind it
+    @staticmethod
+    def board_snapshot(status: str | None = None, ro_ids=None, limit: int = 200, after=None) -> list[dict]:
+        if ro_ids is not None:
+            ro_ids = list(ro_ids)
+            if not ro_ids:
+                return []
+            scope, params = "r.id IN (" + ",".join(["%s"] * len(ro_ids)) + ")", tuple(ro_ids)
+        else:
+            after_sql, after_params = RepairOrdersRepository._after_sql("r", after)
+            scope, params = "r.status = %s" + after_sql, (status or "open",) + after_params
+        totals = (RepairOrdersRepository.BOARD_TOTAL_STORED if ROTotalsRepository.enabled()
+                  else RepairOrdersRepository.BOARD_TOTAL_SUMMED)
+        query = RepairOrdersRepository.BOARD_SNAPSHOT_SQL.format(scope=scope, totals=totals)
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(query, params + (int(limit),))
+            return cursor.fetchall() or []
+        finally:
+            cursor.close()
+            conn.close()
+
     @staticmethod
     def delete_repair_order(estimate_id: int):
         conn = db_handlers.connect_db()
@@ -227,176 +322,162 @@ class RepairOrdersRepository:
 
     @staticmethod
     def recompute_ro_approval(ro_id: int, approved_by_id: Optional[int] = None):
-        conn = db_handlers.connect_db()
-        with conn, conn.cursor(dictionary=True) as c:
-            c.execute("SELECT estimate_id FROM repair_orders WHERE id=%s", (ro_id,))
-            r = c.fetchone()
-            if not r or r["estimate_id"] is None:
-                return
-            est_id = r["estimate_id"]
+        with unit_of_work() as conn:
+            with conn.cursor() as c:
+                c.execute("SELECT estimate_id FROM repair_orders WHERE id=%s", (ro_id,))
+                r = c.fetchone()
+                if not r or r[0] is None:
+                    return
+                c.execute(RepairOrdersRepository.ROLLUP_SQL, (r[0], approved_by_id, ro_id))
 
-            # how many jobs total vs approved
-            c.execute("""
-              SELECT COUNT(*) AS total,
-                     SUM(status='approved') AS approved
-              FROM estimate_jobs
-              WHERE estimate_id=%s
-            """, (est_id,))
-            row = c.fetchone()
-            total = int(row["total"] or 0)
-            approved = int(row["approved"] or 0)
 
-            if total > 0 and approved == total:
-                # fully approved: set status=approved + approved_at/by + approved_total (all jobs)
-                c.execute("""
-                    SELECT COALESCE(SUM(total),0) AS t
-                      FROM estimate_jobs
-                     WHERE estimate_id=%s
-                """, (est_id,))
-                (approved_total,) = c.fetchone().values()
-                c.execute("""
-                  UPDATE repair_orders
-                     SET approved_at   = COALESCE(approved_at, NOW()),
-                         approved_by_id= COALESCE(approved_by_id, %s),
-                         approved_total= %s,
-                         status        = 'approved',
-                         updated_at    = NOW()
-                   WHERE id = %s
-                """, (approved_by_id, approved_total, ro_id))
-            elif total > 0 and approved > 0:
-                # partially approved: move tile bucket to 'approved' but DO NOT set approved_at/by
-                # compute total of only approved jobs (for your badge/summary)
-                c.execute("""
-                    SELECT COALESCE(SUM(j.total),0) AS t
-                      FROM estimate_jobs j
-                     WHERE j.estimate_id=%s AND j.status='approved'
-                """, (est_id,))
-                (approved_total,) = c.fetchone().values()
-                c.execute("""
-                  UPDATE repair_orders
-                     SET approved_total = %s,
-                         approved_at    = NULL,
-                         approved_by_id = NULL,
-                         status         = 'approved',  -- <— key change for tiles bucket
-                         updated_at     = NOW()
-                   WHERE id = %s
-                """, (approved_total, ro_id))
-            else:
-                # no approved jobs: tile goes back to Estimates
-                c.execute("""
-                  UPDATE repair_orders
-                     SET approved_at    = NULL,
-                         approved_by_id = NULL,
-                         approved_total = NULL,
-                         status         = 'open',
-                         updated_at     = NOW()
-                   WHERE id = %s
-                """, (ro_id,))
-            conn.commit()
-            conn.close()
 
+    # job / item columns per target status; same stamps as EstimateJobsRepository.set_status
+    _STATUS_SET = {
+        "approved": ("status='approved', approved_at=COALESCE(approved_at, NOW()), "
+                     "approved_by_id=COALESCE(approved_by_id, %s), declined_at=NULL"),
+        "declined": "status='declined', declined_at=COALESCE(declined_at, NOW()), approved_by_id=NULL, approved_at=NULL",
+        "proposed": "status='proposed', approved_at=NULL, approved_by_id=NULL, declined_at=NULL",
+    }
 
+    ### ONE STATUS FOR MANY JOBS OF AN ESTIMATE (job_ids None: ALL OF THEM) AND THEIR ITEMS, TWO STATEMENTS ###
+    # Rows already in that status are left alone, so their stamps, triggers and change_log stay quiet.
+    @staticmethod
+    def _set_jobs_status(cur, estimate_id: int, status: str, job_ids=None, by_user_id=None) -> None:
+        sets = RepairOrdersRepository._STATUS_SET[status]
+        by = (by_user_id,) if status == "approved" else ()
+        scope, ids = "", ()
+        if job_ids is not None:
+            ids = tuple(int(j) for j in job_ids)
+            scope = f" AND id IN ({','.join(['%s'] * len(ids))})"
+        cur.execute(f"UPDATE estimate_jobs SET {sets} WHERE estimate_id=%s{scope} AND status <> %s",
+                    by + (estimate_id,) + ids + (status,))
+        item_scope = f" AND job_id IN ({','.join(['%s'] * len(ids))})" if job_ids is not None else " AND job_id IS NOT NULL"
+        cur.execute(f"UPDATE estimate_items SET {sets} WHERE estimate_id=%s{item_scope} AND status <> %s",
+                    by + (estimate_id,) + ids + (status,))
+
+    ### RO ROLLUP IN ONE STATEMENT: THE SAME RULES AS recompute_ro_approval ###
+    # every job approved: status approved, approved_at/by stamped, approved_total = all jobs;
+    # some approved: status approved, stamps cleared, approved_total = approved jobs; none: back to open
+    ROLLUP_SQL = """
+        UPDATE repair_orders r
+          JOIN (SELECT COUNT(*) AS n,
+                       COALESCE(SUM(status = 'approved'), 0) AS a,
+                       SUM(CASE WHEN status = 'approved' THEN total ELSE 0 END) AS t
+                  FROM estimate_jobs
+                 WHERE estimate_id = %s) s
+           SET r.approved_at    = CASE WHEN s.n > 0 AND s.a = s.n THEN COALESCE(r.approved_at, NOW()) ELSE NULL END,
+               r.approved_by_id = CASE WHEN s.n > 0 AND s.a = s.n THEN COALESCE(r.approved_by_id, %s) ELSE NULL END,
+               r.approved_total = CASE WHEN s.a > 0 THEN COALESCE(s.t, 0) ELSE NULL END,
+               r.status         = CASE WHEN s.a > 0 THEN 'approved' ELSE 'open' END,
+               r.updated_at     = NOW()
+         WHERE r.id = %s
+    """
+
+    # what the hub's status label and approve button need after an approval change
+    STATE_SQL = """
+        SELECT r.id AS ro_id, r.status, r.approved_at, r.approved_by_id, r.approved_total,
+               r.created_at, r.updated_at, r.miles_in, r.miles_out,
+               COUNT(j.id) AS jobs,
+               COALESCE(SUM(j.status = 'approved'), 0) AS approved,
+               COALESCE(SUM(j.status = 'declined'), 0) AS declined
+          FROM repair_orders r
+          LEFT JOIN estimate_jobs j ON j.estimate_id = r.estimate_id
+         WHERE r.id = %s
+         GROUP BY r.id
+    """
 
     @staticmethod
-    def approve_all(ro_id: int, approved_by_id: Optional[int]):
-        conn = db_handlers.connect_db()
-        with conn, conn.cursor() as c:
-            c.execute("SELECT estimate_id FROM repair_orders WHERE id=%s", (ro_id,))
-            (est_id,) = c.fetchone()
+    def _ro_state(cur, ro_id: int) -> Optional[dict]:
+        cur.execute(RepairOrdersRepository.STATE_SQL, (ro_id,))
+        row = cur.fetchone()
+        if not row:
+            return None
+        state = dict(zip(cur.column_names, row))
+        for key in ("jobs", "approved", "declined"):
+            state[key] = int(state[key] or 0)
+        return state
+
+    ### BATCHED APPROVE / DECLINE / RESET: {job_id: "approved" | "declined" | "proposed"} FOR ONE RO ###
+    # One transaction: the RO's estimate, at most two set based UPDATEs per status, the rollup and the new state.
+    # Returns the RO's state (status, approved_at, approved_total, updated_at, job counts) for the UI, or None
+    # when the RO has no estimate. Job ids that aren't on the RO's estimate are ignored.
+    @staticmethod
+    def set_job_statuses(ro_id: int, statuses: dict, by_user_id: Optional[int] = None) -> Optional[dict]:
+        groups: dict[str, list[int]] = {}
+        for job_id, status in (statuses or {}).items():
+            if not job_id:
+                continue
+            status = status if status in ("approved", "declined") else "proposed"
+            groups.setdefault(status, []).append(int(job_id))
+        with unit_of_work() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT estimate_id FROM repair_orders WHERE id=%s", (ro_id,))
+                row = cur.fetchone()
+                if not row or row[0] is None:
+                    return None
+                est_id = row[0]
+                for status, job_ids in groups.items():
+                    RepairOrdersRepository._set_jobs_status(cur, est_id, status, job_ids, by_user_id)
+                cur.execute(RepairOrdersRepository.ROLLUP_SQL, (est_id, by_user_id, ro_id))
+                return RepairOrdersRepository._ro_state(cur, ro_id)
 
-            # Approve all jobs + items for this estimate
-            c.execute("""
-              UPDATE estimate_jobs
-                 SET status='approved', approved_at=NOW(), approved_by_id=%s
-               WHERE estimate_id=%s
-            """, (approved_by_id, est_id))
-            c.execute("""
-              UPDATE estimate_items i
-              JOIN estimate_jobs j ON i.job_id=j.id
-                 SET i.status='approved', i.approved_at=NOW(), i.approved_by_id=%s
-               WHERE j.estimate_id=%s
-            """, (approved_by_id, est_id))
-
-            # Stamp RO
-            c.execute("SELECT COALESCE(SUM(total),0) FROM estimate_jobs WHERE estimate_id=%s", (est_id,))
-            (approved_total,) = c.fetchone()
-            c.execute("""
-               UPDATE repair_orders
-                  SET approved_at=NOW(),
-                      approved_by_id=%s,
-                      approved_total=%s,
-                      status='approved',
-                      updated_at=NOW()
-                WHERE id=%s
-            """, (approved_by_id, approved_total, ro_id))
-            conn.commit()
-            conn.close()
+    @staticmethod
+    def approve_jobs(ro_id: int, job_ids, approved_by_id: Optional[int] = None) -> Optional[dict]:
+        return RepairOrdersRepository.set_job_statuses(ro_id, {j: "approved" for j in job_ids}, approved_by_id)
 
     @staticmethod
-    def _estimate_id_for_job(job_id: int) -> Optional[int]:
-        conn = db_handlers.connect_db()
-        with conn, conn.cursor() as c:
-            c.execute("SELECT estimate_id FROM estimate_jobs WHERE id=%s", (job_id,))
-            row = c.fetchone()
-            return row[0] if row else None
+    def decline_jobs(ro_id: int, job_ids, declined_by_id: Optional[int] = None) -> Optional[dict]:
+        return RepairOrdersRepository.set_job_statuses(ro_id, {j: "declined" for j in job_ids}, declined_by_id)
 
+    ### APPROVES EVERY JOB AND ITEM OF THE RO's ESTIMATE AND STAMPS THE RO, ONE TRANSACTION. RETURNS THE NEW STATE ###
     @staticmethod
-    def _ro_id_for_estimate(estimate_id: int) -> Optional[int]:
+    def approve_all(ro_id: int, approved_by_id: Optional[int]) -> Optional[dict]:
+        with unit_of_work() as conn:
+            with conn.cursor() as c:
+                c.execute("SELECT estimate_id FROM repair_orders WHERE id=%s", (ro_id,))
+                row = c.fetchone()
+                if not row or row[0] is None:
+                    return None
+                est_id = row[0]
+                RepairOrdersRepository._set_jobs_status(c, est_id, "approved", None, approved_by_id)
+                c.execute("""
+                   UPDATE repair_orders
+                      SET approved_at=NOW(),
+                          approved_by_id=%s,
+                          approved_total=(SELECT COALESCE(SUM(total),0) FROM estimate_jobs WHERE estimate_id=%s),
+                          status='approved',
+                          updated_at=NOW()
+                    WHERE id=%s
+                """, (approved_by_id, est_id, ro_id))
+                return RepairOrdersRepository._ro_state(c, ro_id)
+
+    ### SINGLE JOB SHORTHANDS FOR set_job_statuses (THE RO IS FOUND FROM THE JOB) ###
+    @staticmethod
+    def _ro_id_for_job(job_id: int) -> Optional[int]:
         conn = db_handlers.connect_db()
         with conn, conn.cursor() as c:
-            c.execute("SELECT id FROM repair_orders WHERE estimate_id=%s LIMIT 1", (estimate_id,))
+            c.execute("""
+                SELECT r.id FROM estimate_jobs j
+                  JOIN repair_orders r ON r.estimate_id = j.estimate_id
+                 WHERE j.id=%s LIMIT 1
+            """, (job_id,))
             row = c.fetchone()
             return row[0] if row else None
 
     @staticmethod
-    def approve_job(job_id: int, approved_by_id: Optional[int] = None):
-        conn = db_handlers.connect_db()
-        with conn, conn.cursor() as c:
-            # approve job
-            c.execute("""
-                 UPDATE estimate_jobs
-                    SET status='approved', approved_at=NOW(), approved_by_id=%s
-                  WHERE id=%s
-             """, (approved_by_id, job_id))
-            # approve all items in the job
-            c.execute("""
-                 UPDATE estimate_items
-                    SET status='approved', approved_at=NOW(), approved_by_id=%s
-                  WHERE job_id=%s
-             """, (approved_by_id, job_id))
-            conn.commit()
-
-        # recompute RO approval
-        est_id = RepairOrdersRepository._estimate_id_for_job(job_id)
-        if est_id is not None:
-            ro_id = RepairOrdersRepository._ro_id_for_estimate(est_id)
-            if ro_id is not None:
-                RepairOrdersRepository.recompute_ro_approval(ro_id, approved_by_id=approved_by_id)
+    def approve_job(job_id: int, approved_by_id: Optional[int] = None) -> Optional[dict]:
+        ro_id = RepairOrdersRepository._ro_id_for_job(job_id)
+        if ro_id is None:
+            return None
+        return RepairOrdersRepository.approve_jobs(ro_id, [job_id], approved_by_id)
 
     @staticmethod
-    def decline_job(job_id: int, declined_by_id: Optional[int] = None):
-        conn = db_handlers.connect_db()
-        with conn, conn.cursor() as c:
-            # decline job
-            c.execute("""
-                 UPDATE estimate_jobs
-                    SET status='declined', declined_at=NOW(), approved_by_id=%s
-                  WHERE id=%s
-             """, (declined_by_id, job_id))
-            # decline all items in the job
-            c.execute("""
-                 UPDATE estimate_items
-                    SET status='declined', declined_at=NOW(), approved_by_id=%s
-                  WHERE job_id=%s
-             """, (declined_by_id, job_id))
-            conn.commit()
-
-        # recompute RO approval (likely clears approved_at)
-        est_id = RepairOrdersRepository._estimate_id_for_job(job_id)
-        if est_id is not None:
-            ro_id = RepairOrdersRepository._ro_id_for_estimate(est_id)
-            if ro_id is not None:
-                RepairOrdersRepository.recompute_ro_approval(ro_id, approved_by_id=declined_by_id)
+    def decline_job(job_id: int, declined_by_id: Optional[int] = None) -> Optional[dict]:
+        ro_id = RepairOrdersRepository._ro_id_for_job(job_id)
+        if ro_id is None:
+            return None
+        return RepairOrdersRepository.decline_jobs(ro_id, [job_id], declined_by_id)
 
 
     @staticmethod
@@ -442,6 +523,9 @@ class RepairOrdersRepository:
 
     @staticmethod
     def estimate_total_for_ro(ro_id: int) -> Optional[float]:
+        if ROTotalsRepository.enabled():
+            row = ROTotalsRepository.totals_for_ro(ro_id)
+            return float(row[2]) if row else None
         est_id = RepairOrdersRepository.estimate_id_for_ro(ro_id)
         if not est_id:
             return None
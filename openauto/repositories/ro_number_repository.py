@@ -0,0 +1,136 @@
+from __future__ import annotations
+import datetime
+import os
+import threading
+
+import mysql.connector
+from openauto.repositories import db_handlers
+
+
+def _block_size() -> int:
+    try:
+        return max(1, int(os.getenv("OPENAUTO_RO_NUMBER_BLOCK", "1")))
+    except ValueError:
+        return 1
+
+
+### RO NUMBERS ("YYYY-00042") FROM A PER-YEAR SEQUENCE ROW, HANDED OUT IN BLOCKS PER WORKSTATION ###
+    # UPDATE ... SET n = LAST_INSERT_ID(n + size) reserves a block atomically under the row lock, and the
+    # block's last number comes back with the UPDATE itself, so two writers never get the same number and no
+    # scan of repair_orders is needed. OPENAUTO_RO_NUMBER_BLOCK (default 1) sets how many numbers a workstation
+    # reserves at once: bigger blocks make creating an RO a single INSERT, at the price of numbers that aren't in
+    # creation order across workstations and gaps for numbers unused when the app closes.
+    # A year's row is seeded from the highest ro_number already on file the first time that year is used.
+class RONumberRepository:
+    CREATE_TABLE = """
+        CREATE TABLE IF NOT EXISTS ro_number_sequence (
+          year SMALLINT UNSIGNED NOT NULL,
+          n    INT UNSIGNED NOT NULL,
+          PRIMARY KEY (year)
+        ) ENGINE=InnoDB
+    """
+
+    # highest sequence on file for a year; SUBSTRING_INDEX keeps numbers past 99999 sorting right, unlike the string
+    MAX_ON_FILE_SQL = """
+        SELECT COALESCE(MAX(CAST(SUBSTRING_INDEX(ro_number, '-', -1) AS UNSIGNED)), 0)
+          FROM repair_orders
+         WHERE ro_number LIKE %s
+    """
+
+    SEED_SQL = """
+        INSERT IGNORE INTO ro_number_sequence (year, n)
+        SELECT %s, COALESCE(MAX(CAST(SUBSTRING_INDEX(ro_number, '-', -1) AS UNSIGNED)), 0)
+          FROM repair_orders
+         WHERE ro_number LIKE %s
+    """
+
+    _lock = threading.Lock()
+    _block: tuple[int, int, int] | None = None     # (year, next, last) reserved by this process
+    _table: bool | None = None                     # None until ensure_table has run
+
+    @staticmethod
+    def format_number(year: int, seq: int) -> str:
+        return f"{year}-{seq:05d}"
+
+    @staticmethod
+    def ensure_table() -> bool:
+        if RONumberRepository._table is not None:
+            return RONumberRepository._table
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(RONumberRepository.CREATE_TABLE)
+            RONumberRepository._table = True
+        except mysql.connector.Error as e:
+            print(f"[RONumberRepository] Sequence table unavailable, scanning repair_orders instead: {e}")
+            RONumberRepository._table = False
+        finally:
+            conn.close()
+        return RONumberRepository._table
+
+    ### RESERVES count NUMBERS OF year; RETURNS THE LAST ONE (THE BLOCK IS last - count + 1 .. last) ###
+    @staticmethod
+    def reserve(year: int, count: int = 1) -> int:
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                for _attempt in range(2):
+                    cur.execute("UPDATE ro_number_sequence SET n = LAST_INSERT_ID(n + %s) WHERE year = %s",
+                                (int(count), int(year)))
+                    if cur.rowcount:
+                        last = cur.lastrowid
+                        if not last:
+                            cur.execute("SELECT LAST_INSERT_ID()")
+                            (last,) = cur.fetchone()
+                        conn.commit()
+                        return int(last)
+                    # first RO of the year on this database: seed the row, racing workstations agree via the PK
+                    cur.execute(RONumberRepository.SEED_SQL, (int(year), f"{int(year)}-%"))
+            raise RuntimeError(f"could not reserve an RO number for {year}")
+        finally:
+            conn.close()
+
+    ### MOVES A YEAR's SEQUENCE PAST ANY NUMBER ALREADY ON FILE (AFTER A DUPLICATE ro_number) ###
+    @staticmethod
+    def resync(year: int) -> None:
+        with RONumberRepository._lock:
+            RONumberRepository._block = None
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1 FROM ro_number_sequence WHERE year = %s", (int(year),))
+                if not cur.fetchall():
+                    return
+                cur.execute(RONumberRepository.MAX_ON_FILE_SQL, (f"{int(year)}-%",))
+                (on_file,) = cur.fetchone()
+                cur.execute("UPDATE ro_number_sequence SET n = GREATEST(n, %s) WHERE year = %s", (int(on_file), int(year)))
+            conn.commit()
+        finally:
+            conn.close()
+
+    # the old way, for databases where the sequence table can't be created
+    @staticmethod
+    def _scan_next(year: int) -> str:
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(RONumberRepository.MAX_ON_FILE_SQL, (f"{year}-%",))
+                (last_seq,) = cur.fetchone()
+        finally:
+            conn.close()
+        return RONumberRepository.format_number(year, int(last_seq or 0) + 1)
+
+    ### NEXT RO NUMBER FOR THIS WORKSTATION: FROM ITS BLOCK, RESERVING A NEW BLOCK WHEN IT RUNS OUT ###
+    @staticmethod
+    def next_number(year: int | None = None) -> str:
+        year = int(year or datetime.datetime.now().year)
+        if not RONumberRepository.ensure_table():
+            return RONumberRepository._scan_next(year)
+        with RONumberRepository._lock:
+            block = RONumberRepository._block
+            if block is None or block[0] != year or block[1] > block[2]:
+                size = _block_size()
+                last = RONumberRepository.reserve(year, size)
+                block = (year, last - size + 1, last)
+            RONumberRepository._block = (year, block[1] + 1, block[2])
+            return RONumberRepository.format_number(year, block[1])
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, List, Optional
+
+from openauto.repositories import db_handlers
+
+
+RO_COLUMNS = ("id", "ro_number", "status", "created_at", "updated_at", "approved_at", "miles_in", "miles_out",
+              "customer_id", "vehicle_id", "estimate_id", "appointment_id", "created_by",
+              "assigned_writer_id", "assigned_tech_id")
+CUSTOMER_COLUMNS = ("first_name", "last_name", "address", "city", "state", "zip", "phone", "alt_phone", "email")
+VEHICLE_COLUMNS = ("id", "vin", "plate", "year", "make", "model", "engine_size", "trim", "customer_id")
+JOB_COLUMNS = ("id", "name", "status", "total")
+ITEM_COLUMNS = ("id", "estimate_id", "ro_id", "item_description", "qty", "unit_price", "unit_cost", "type",
+                "sku_number", "taxable", "tax_pct", "vendor", "source", "job_order", "line_order", "job_id",
+                "status", "line_total")
+C3_COLUMNS = ("id", "ro_id", "line_no", "concern", "cause", "correction", "estimate_item_id", "created_by")
+
+
+def _json_object(alias: str, columns) -> str:
+    return "JSON_OBJECT(" + ", ".join(f"'{col}', {alias}.{col}" for col in columns) + ")"
+
+
+def _json_rows(value) -> list[dict]:
+    if value is None:
+        return []
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8")
+    # DECIMAL columns come back as Decimal, like the per-table list_* queries return them
+    return json.loads(value, parse_float=Decimal) or []
+
+
+def _concat(*parts) -> Optional[str]:
+    # MySQL CONCAT semantics (any NULL -> NULL), so board_row() matches board_snapshot() exactly
+    return None if any(p is None for p in parts) else " ".join(str(p) for p in parts)
+
+
+### EVERYTHING AN OPEN RO SHOWS: HEADER, CUSTOMER, VEHICLE, ESTIMATE MEMO, JOBS, ITEMS, C3 AND APPROVAL COUNTS ###
+    # items are shaped like EstimateItemsRepository.list_for_ro (plus job_name/job_status),
+    # jobs like EstimateJobsRepository.list_for_estimate and c3 like ROC3Repository.list_for_ro.
+@dataclass
+class ROSnapshot:
+    ro: Dict[str, Any]
+    customer: Dict[str, Any] = field(default_factory=dict)
+    vehicle: Dict[str, Any] = field(default_factory=dict)
+    internal_memo: Optional[str] = None
+    jobs: List[Dict[str, Any]] = field(default_factory=list)
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    c3: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ro_id(self) -> int:
+        return self.ro["id"]
+
+    @property
+    def estimate_id(self) -> Optional[int]:
+        return self.ro.get("estimate_id")
+
+    @property
+    def status(self) -> str:
+        return (self.ro.get("status") or "open").strip().lower()
+
+    ### SAME (total, approved, declined) AS RepairOrdersRepository.jobs_counts_for_ro ###
+    @property
+    def approval_counts(self) -> tuple[int, int, int]:
+        statuses = [(j.get("status") or "").lower() for j in self.jobs]
+        return len(statuses), statuses.count("approved"), statuses.count("declined")
+
+    # first non-empty concern / cause / correction across the C3 lines (what the printouts show)
+    def primary_c3(self) -> dict:
+        out = {"concern": "", "cause": "", "correction": ""}
+        for line in self.c3:
+            for key in out:
+                if not out[key] and line.get(key):
+                    out[key] = line[key]
+        return out
+
+    ### THE RepairOrdersRepository.board_snapshot ROW FOR THIS RO, SO TILES CAN BE UPDATED WITHOUT A QUERY ###
+    def board_row(self) -> dict:
+        ro, c, v = self.ro, self.customer, self.vehicle
+        declined_jobs = {j["id"] for j in self.jobs if (j.get("status") or "") == "declined"}
+        total = None
+        if self.estimate_id is not None:
+            total = Decimal("0")
+            for it in self.items:
+                if it.get("status") == "declined" or it.get("job_id") in declined_jobs:
+                    continue
+                qty = Decimal(str(it["qty"])) if it.get("qty") is not None else Decimal(1)
+                price = Decimal(str(it.get("unit_price") or 0))
+                tax = Decimal(str(it.get("tax_pct") or 0)) / 100 if it.get("taxable") == 1 else Decimal(0)
+                # MySQL ROUND() rounds half away from zero
+                total += (qty * price * (1 + tax)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        return {
+            "ro_id": ro["id"],
+            "ro_number": ro.get("ro_number"),
+            "status": ro.get("status"),
+            "created_at": ro.get("created_at"),
+            "updated_at": ro.get("updated_at"),
+            "miles_in": ro.get("miles_in"),
+            "miles_out": ro.get("miles_out"),
+            "customer": _concat(c.get("first_name"), c.get("last_name")),
+            "year": v.get("year"),
+            "make": v.get("make"),
+            "model": v.get("model"),
+            "tech": ro.get("tech_name"),
+            "writer": ro.get("writer_name"),
+            "concern": self.c3[0].get("concern") if self.c3 else None,
+            "total": total,
+        }
+
+
+### ONE ROUND TRIP FOR AN RO SNAPSHOT ###
+    # The header row joins customer, vehicle, staff names and estimate; jobs, items and C3 lines ride along as
+    # JSON_ARRAYAGG columns of the same row. Replaces the dozen separate reads ROHubManager.load_ro_into_hub
+    # and PrintController used to make, each on its own connection.
+class ROSnapshotRepository:
+    SNAPSHOT_SQL = f"""
+        SELECT
+            {", ".join(f"ro.{col} AS ro__{col}" for col in RO_COLUMNS)},
+            CONCAT(t.first_name,' ',t.last_name) AS ro__tech_name,
+            CONCAT(w.first_name,' ',w.last_name) AS ro__writer_name,
+            {", ".join(f"c.{col} AS customer__{col}" for col in CUSTOMER_COLUMNS)},
+            {", ".join(f"v.{col} AS vehicle__{col}" for col in VEHICLE_COLUMNS)},
+            e.internal_memo,
+            (SELECT JSON_ARRAYAGG({_json_object("j", JOB_COLUMNS)})
+               FROM estimate_jobs j
+              WHERE j.estimate_id = ro.estimate_id) AS jobs_json,
+            (SELECT JSON_ARRAYAGG(JSON_MERGE_PATCH({_json_object("i", ITEM_COLUMNS)},
+                                                   JSON_OBJECT('job_name', j.name, 'job_status', j.status)))
+               FROM estimate_items i
+               LEFT JOIN estimate_jobs j ON j.id = i.job_id
+              WHERE i.ro_id = ro.id) AS items_json,
+            (SELECT JSON_ARRAYAGG({_json_object("l", C3_COLUMNS)})
+               FROM ro_c3_lines l
+              WHERE l.ro_id = ro.id) AS c3_json
+        FROM repair_orders ro
+        LEFT JOIN customers c ON c.customer_id = ro.customer_id
+        LEFT JOIN vehicles  v ON v.id = ro.vehicle_id
+        LEFT JOIN estimates e ON e.id = ro.estimate_id
+        LEFT JOIN users     t ON t.id = ro.assigned_tech_id
+        -- writer fallback: assigned writer OR creator
+        LEFT JOIN users     w ON w.id = COALESCE(ro.assigned_writer_id, ro.created_by)
+        WHERE ro.id = %s
+    """
+
+    @staticmethod
+    def load(ro_id: int) -> Optional[ROSnapshot]:
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(ROSnapshotRepository.SNAPSHOT_SQL, (ro_id,))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+        if not row:
+            return None
+        return ROSnapshotRepository._from_row(row)
+
+    @staticmethod
+    def _from_row(row: dict) -> ROSnapshot:
+        def _section(prefix):
+            return {k[len(prefix):]: v for k, v in row.items() if k.startswith(prefix)}
+
+        customer = _section("customer__") if row.get("customer__first_name") is not None else {}
+        vehicle = _section("vehicle__") if row.get("vehicle__id") is not None else {}
+
+        jobs = sorted(_json_rows(row.get("jobs_json")), key=lambda j: j["id"])
+        items = _json_rows(row.get("items_json"))
+        # list_for_ro order
+        items.sort(key=lambda i: (i.get("job_name") is not None, i.get("job_name") or "",
+                                  i.get("job_order") is not None, i.get("job_order") or 0,
+                                  i.get("line_order") is not None, i.get("line_order") or 0, i["id"]))
+        c3 = sorted(_json_rows(row.get("c3_json")), key=lambda l: (l.get("line_no") or 0, l["id"]))
+        return ROSnapshot(
+            ro=_section("ro__"),
+            customer=customer,
+            vehicle=vehicle,
+            internal_memo=row.get("internal_memo"),
+            jobs=jobs,
+            items=items,
+            c3=c3,
+        )
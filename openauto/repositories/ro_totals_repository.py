@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import mysql.connector
+from openauto.repositories import db_handlers
+
+
+# one line's share of the totals, for NEW / OLD / i rows; the same per-line ROUNDs as estimate_total_for_ro
+def _sub(row: str) -> str:
+    return f"ROUND(COALESCE({row}.qty, 1) * COALESCE({row}.unit_price, 0), 2)"
+
+
+def _grand(row: str) -> str:
+    return (f"ROUND(COALESCE({row}.qty, 1) * COALESCE({row}.unit_price, 0) * "
+            f"(1 + (CASE WHEN {row}.taxable = 1 THEN COALESCE({row}.tax_pct, 0) / 100 ELSE 0 END)), 2)")
+
+
+# declined lines, and lines of a declined job, count for nothing
+def _counted(row: str) -> str:
+    return (f"({row}.status <> 'declined' AND NOT EXISTS "
+            f"(SELECT 1 FROM estimate_jobs jd WHERE jd.id = {row}.job_id AND jd.status = 'declined'))")
+
+
+def _add(row: str, sign: str) -> str:
+    return (f"UPDATE estimates SET subtotal = subtotal {sign} {_sub(row)}, grand_total = grand_total {sign} {_grand(row)} "
+            f"WHERE id = {row}.estimate_id AND {_counted(row)}")
+
+
+# a job's non-declined lines, summed (job decline / un-decline / delete)
+def _job_lines_sql(job: str, sign: str) -> str:
+    return (f"UPDATE estimates e JOIN ("
+            f"SELECT COALESCE(SUM({_sub('i')}), 0) AS s, COALESCE(SUM({_grand('i')}), 0) AS g "
+            f"FROM estimate_items i WHERE i.job_id = {job}.id AND i.status <> 'declined') x "
+            f"SET e.subtotal = e.subtotal {sign} x.s, e.grand_total = e.grand_total {sign} x.g "
+            f"WHERE e.id = {job}.estimate_id")
+
+
+### PERSISTED ESTIMATE TOTALS: subtotal, tax_total AND grand_total ON estimates, KEPT BY TRIGGERS ###
+    # Same figures as RepairOrdersRepository.estimate_total_for_ro (tax inclusive per line, declined jobs and lines
+    # left out), so boards and the hub read one column instead of summing estimate_items. The triggers move the
+    # totals by each line's old and new share. A line's share depends on its job's status, so declining a job (or
+    # deleting a declined one, whose lines the FK sets to no job without firing triggers) moves that job's lines
+    # in one step. repair_orders.approved_total stays with the approval rollup; check() / backfill() cover both.
+class ROTotalsRepository:
+    COLUMNS = {
+        "subtotal": "DECIMAL(12,2) NOT NULL DEFAULT 0.00",
+        "grand_total": "DECIMAL(12,2) NOT NULL DEFAULT 0.00",
+        "tax_total": "DECIMAL(12,2) GENERATED ALWAYS AS (grand_total - subtotal) STORED",
+    }
+
+    LINE_CHANGED = " OR ".join(f"NOT (OLD.{c} <=> NEW.{c})" for c in
+                               ("estimate_id", "job_id", "status", "qty", "unit_price", "taxable", "tax_pct"))
+
+    TRIGGERS = {
+        "trg_estimate_items_insert_totals":
+            f"AFTER INSERT ON estimate_items FOR EACH ROW {_add('NEW', '+')}",
+        "trg_estimate_items_update_totals":
+            f"AFTER UPDATE ON estimate_items FOR EACH ROW BEGIN "
+            f"IF {LINE_CHANGED} THEN {_add('OLD', '-')}; {_add('NEW', '+')}; END IF; END",
+        "trg_estimate_items_delete_totals":
+            f"AFTER DELETE ON estimate_items FOR EACH ROW {_add('OLD', '-')}",
+        "trg_estimate_jobs_update_totals":
+            f"AFTER UPDATE ON estimate_jobs FOR EACH ROW BEGIN "
+            f"IF (OLD.status = 'declined') <> (NEW.status = 'declined') THEN "
+            f"IF NEW.status = 'declined' THEN {_job_lines_sql('NEW', '-')}; ELSE {_job_lines_sql('NEW', '+')}; END IF; "
+            f"END IF; END",
+        "trg_estimate_jobs_delete_totals":
+            f"BEFORE DELETE ON estimate_jobs FOR EACH ROW BEGIN "
+            f"IF OLD.status = 'declined' THEN {_job_lines_sql('OLD', '+')}; END IF; END",
+    }
+
+    # what the columns should hold, for every estimate (or a few), in one pass over estimate_items
+    EXPECTED_SQL = f"""
+        SELECT i.estimate_id,
+               SUM(CASE WHEN i.status = 'declined' OR j.status = 'declined' THEN 0 ELSE {_sub('i')} END) AS s,
+               SUM(CASE WHEN i.status = 'declined' OR j.status = 'declined' THEN 0 ELSE {_grand('i')} END) AS g
+          FROM estimate_items i
+          LEFT JOIN estimate_jobs j ON j.id = i.job_id
+         {{where}}
+         GROUP BY i.estimate_id
+    """
+
+    APPROVED_SQL = """
+        SELECT estimate_id, SUM(total) AS t
+          FROM estimate_jobs
+         WHERE status = 'approved'{where}
+         GROUP BY estimate_id
+    """
+
+    _enabled = False
+
+    ### True ONCE ensure_schema() HAS SEEN THE COLUMNS AND TRIGGERS; READERS FALL BACK TO SUMMING UNTIL THEN ###
+    @staticmethod
+    def enabled() -> bool:
+        return ROTotalsRepository._enabled
+
+    ### ADDS THE COLUMNS AND TRIGGERS IF MISSING, BACKFILLING WHEN EITHER IS NEW ###
+    # Until every trigger exists some writes go uncounted (a run without the TRIGGER privilege, say), so the
+    # totals are rebuilt on the run that completes the set, not only on the one that adds the columns.
+    # (needs ALTER and TRIGGER privileges and MySQL 8.0.29+ for CREATE TRIGGER IF NOT EXISTS, like change_log)
+    @staticmethod
+    def ensure_schema() -> bool:
+        conn = db_handlers.connect_db()
+        added = False
+        trigger_sql = """
+            SELECT TRIGGER_NAME FROM information_schema.TRIGGERS
+            WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE IN ('estimate_items', 'estimate_jobs')
+        """
+        try:
+            cur = conn.cursor()
+            try:
+                cur.execute(trigger_sql)
+                before = {r[0] for r in cur.fetchall()}
+            except mysql.connector.Error:
+                before = set()
+            cur.execute("""
+                SELECT COLUMN_NAME FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'estimates'
+            """)
+            present = {r[0] for r in cur.fetchall()}
+            missing = [c for c in ROTotalsRepository.COLUMNS if c not in present]
+            if missing:
+                try:
+                    cur.execute("ALTER TABLE estimates " + ", ".join(
+                        f"ADD COLUMN {c} {ROTotalsRepository.COLUMNS[c]}" for c in missing))
+                    added = True
+                except mysql.connector.Error as e:
+                    print(f"[ROTotalsRepository] Could not add total columns: {e}")
+            for name, body in ROTotalsRepository.TRIGGERS.items():
+                if name in before:
+                    continue
+                try:
+                    cur.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+                except mysql.connector.Error as e:
+                    print(f"[ROTotalsRepository] Could not create {name}: {e}")
+            try:
+                cur.execute(trigger_sql)
+                installed = {r[0] for r in cur.fetchall()}
+                cur.execute("""
+                    SELECT COUNT(*) FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'estimates'
+                      AND COLUMN_NAME IN ('subtotal', 'grand_total', 'tax_total')
+                """)
+                (columns,) = cur.fetchone()
+            except mysql.connector.Error:
+                return False
+            cur.close()
+        finally:
+            conn.close()
+        ok = int(columns) == len(ROTotalsRepository.COLUMNS) and set(ROTotalsRepository.TRIGGERS) <= installed
+        # triggers first, then the backfill, so no write lands between the two unaccounted for
+        if ok and (added or not set(ROTotalsRepository.TRIGGERS) <= before):
+            ROTotalsRepository.backfill(approved=False)
+        ROTotalsRepository._enabled = ok
+        return ok
+
+    @staticmethod
+    def _scope(column: str, ids) -> tuple[str, tuple]:
+        if ids is None:
+            return "", ()
+        ids = tuple(int(i) for i in ids)
+        return f"{column} IN ({','.join(['%s'] * len(ids))})", ids
+
+    ### ESTIMATES WHOSE STORED TOTALS DIFFER FROM THEIR LINES, AND ROs WHOSE approved_total DIFFERS FROM THEIR JOBS ###
+    # Returns {"estimates": [{estimate_id, ro_id, subtotal, grand_total, expected_subtotal, expected_grand}],
+    #          "ros": [{ro_id, approved_total, expected_approved_total}]}
+    @staticmethod
+    def check() -> dict[str, list[dict]]:
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor(dictionary=True) as cur:
+                cur.execute(f"""
+                    SELECT e.id AS estimate_id, e.ro_id, e.subtotal, e.grand_total,
+                           COALESCE(x.s, 0) AS expected_subtotal, COALESCE(x.g, 0) AS expected_grand
+                      FROM estimates e
+                      LEFT JOIN ({ROTotalsRepository.EXPECTED_SQL.format(where="")}) x ON x.estimate_id = e.id
+                     WHERE e.subtotal <> COALESCE(x.s, 0) OR e.grand_total <> COALESCE(x.g, 0)
+                     ORDER BY e.id
+                """)
+                estimates = cur.fetchall() or []
+                cur.execute(f"""
+                    SELECT r.id AS ro_id, r.approved_total, a.t AS expected_approved_total
+                      FROM repair_orders r
+                      LEFT JOIN ({ROTotalsRepository.APPROVED_SQL.format(where="")}) a ON a.estimate_id = r.estimate_id
+                     WHERE NOT (r.approved_total <=> a.t)
+                     ORDER BY r.id
+                """)
+                ros = cur.fetchall() or []
+            return {"estimates": estimates, "ros": ros}
+        finally:
+            conn.close()
+
+    ### REWRITES THE STORED TOTALS FROM THE LINES (ALL ESTIMATES, OR estimate_ids). RETURNS (estimates, ros) FIXED ###
+    # approved=False leaves repair_orders.approved_total alone (first install only fills the new columns)
+    @staticmethod
+    def backfill(estimate_ids=None, approved: bool = True) -> tuple[int, int]:
+        if estimate_ids is not None:
+            estimate_ids = list(estimate_ids)
+            if not estimate_ids:
+                return 0, 0
+        items_where, params = ROTotalsRepository._scope("i.estimate_id", estimate_ids)
+        jobs_where, _ = ROTotalsRepository._scope("estimate_id", estimate_ids)
+        est_where, _ = ROTotalsRepository._scope("e.id", estimate_ids)
+        ro_where, _ = ROTotalsRepository._scope("r.estimate_id", estimate_ids)
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                expected = ROTotalsRepository.EXPECTED_SQL.format(where=f"WHERE {items_where}" if items_where else "")
+                cur.execute(f"""
+                    UPDATE estimates e
+                      LEFT JOIN ({expected}) x ON x.estimate_id = e.id
+                       SET e.subtotal = COALESCE(x.s, 0), e.grand_total = COALESCE(x.g, 0)
+                     WHERE (e.subtotal <> COALESCE(x.s, 0) OR e.grand_total <> COALESCE(x.g, 0))
+                           {f"AND {est_where}" if est_where else ""}
+                """, params + params)
+                estimates = cur.rowcount
+                if not approved:
+                    conn.commit()
+                    return estimates, 0
+                approved_jobs = ROTotalsRepository.APPROVED_SQL.format(where=f" AND {jobs_where}" if jobs_where else "")
+                cur.execute(f"""
+                    UPDATE repair_orders r
+                      LEFT JOIN ({approved_jobs}) a ON a.estimate_id = r.estimate_id
+                       SET r.approved_total = a.t
+                     WHERE NOT (r.approved_total <=> a.t)
+                           {f"AND {ro_where}" if ro_where else ""}
+                """, params + params)
+                ros = cur.rowcount
+            conn.commit()
+            return estimates, ros
+        finally:
+            conn.close()
+
+    ### (subtotal, tax_total, grand_total) OF AN RO's ESTIMATE FROM THE STORED COLUMNS; None WITHOUT AN ESTIMATE ###
+    @staticmethod
+    def totals_for_ro(ro_id: int):
+        conn = db_handlers.connect_db()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT e.subtotal, e.tax_total, e.grand_total
+                      FROM repair_orders r
+                      JOIN estimates e ON e.id = r.estimate_id
+                     WHERE r.id = %s
+                """, (ro_id,))
+                return cur.fetchone()
+        finally:
+            conn.close()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+import os
+import re
+
+import mysql.connector
+from openauto.repositories import db_handlers
+
+
+### SERVER-SIDE SEARCH BACKED BY FULLTEXT (ngram) INDEXES ###
+    # For shops too big to index client side. Every method returns primary keys, best match first, LIMITed,
+    # so the caller loads just those rows. The ngram parser matches any 2+ character piece of a word,
+    # which is what lets "mith" find "Smith" and "4352" find the end of a VIN.
+    # Switched on with OPENAUTO_SEARCH=server (default "local" uses services/search_index.py). The indexes ship
+    # in openauto_schema.sql; ensure_indexes() (run at startup off the GUI thread) adds them to older databases,
+    # and until it has seen them enabled() stays False so searches use the local index.
+class SearchRepository:
+    FULLTEXT_INDEXES = {
+        "ft_customers_search": ("customers", "last_name, first_name, phone, alt_phone, email"),
+        "ft_vehicles_search": ("vehicles", "vin, plate, make, model"),
+        "ft_repair_orders_search": ("repair_orders", "ro_number"),
+    }
+
+    CUSTOMER_MATCH = "MATCH(c.last_name, c.first_name, c.phone, c.alt_phone, c.email) AGAINST (%s IN BOOLEAN MODE)"
+    VEHICLE_MATCH = "MATCH(v.vin, v.plate, v.make, v.model) AGAINST (%s IN BOOLEAN MODE)"
+    RO_MATCH = "MATCH(ro.ro_number) AGAINST (%s IN BOOLEAN MODE)"
+
+    _indexes_ready = False
+
+    @staticmethod
+    def configured() -> bool:
+        return os.getenv("OPENAUTO_SEARCH", "local").strip().lower() == "server"
+
+    @staticmethod
+    def enabled() -> bool:
+        return SearchRepository._indexes_ready and SearchRepository.configured()
+
+    ### CREATES THE FULLTEXT INDEXES IF MISSING (A TABLE REBUILD EACH: CALL IT OFF THE GUI THREAD) ###
+    @staticmethod
+    def ensure_indexes() -> bool:
+        if SearchRepository._indexes_ready:
+            return True
+        ready = True
+        conn = db_handlers.connect_db()
+        try:
+            cur = conn.cursor()
+            for name, (table, columns) in SearchRepository.FULLTEXT_INDEXES.items():
+                cur.execute("""
+                    SELECT 1 FROM information_schema.STATISTICS
+                    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s LIMIT 1
+                """, (table, name))
+                if cur.fetchall():
+                    continue
+                try:
+                    cur.execute(f"CREATE FULLTEXT INDEX {name} ON {table} ({columns}) WITH PARSER ngram")
+                except mysql.connector.Error as e:
+                    print(f"[SearchRepository] Could not create {name}: {e}")
+                    ready = False
+            cur.close()
+        finally:
+            conn.close()
+        SearchRepository._indexes_ready = ready
+        return ready
+
+    # below ngram_token_size a term never matches
+    @staticmethod
+    def terms(text: str) -> list[str]:
+        return list(dict.fromkeys(t for t in re.findall(r"\w+", text or "") if len(t) >= 2))
+
+    ### "smith 555" -> '+"smith" +"555"': EVERY TERM REQUIRED, OPERATORS IN USER TEXT NEUTRALISED ###
+    @staticmethod
+    def boolean_query(text: str) -> str:
+        return " ".join(f'+"{t}"' for t in SearchRepository.terms(text))
+
+    @staticmethod
+    def _ranked_ids(query: str, params: tuple) -> list[int]:
+        conn = db_handlers.connect_db()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+            cursor.close()
+            return [row[0] for row in rows]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def search_customers(text: str, limit: int = 50) -> list[int]:
+        q = SearchRepository.boolean_query(text)
+        if not q:
+            return []
+        return SearchRepository._ranked_ids(f"""
+            SELECT c.customer_id, {SearchRepository.CUSTOMER_MATCH} AS score
+            FROM customers c
+            WHERE {SearchRepository.CUSTOMER_MATCH}
+            ORDER BY score DESC, c.last_name, c.customer_id
+            LIMIT %s
+        """, (q, q, int(limit)))
+
+    @staticmethod
+    def search_vehicles(text: str, limit: int = 50) -> list[int]:
+        q = SearchRepository.boolean_query(text)
+        if not q:
+            return []
+        return SearchRepository._ranked_ids(f"""
+            SELECT v.id, {SearchRepository.VEHICLE_MATCH} AS score
+            FROM vehicles v
+            WHERE {SearchRepository.VEHICLE_MATCH}
+            ORDER BY score DESC, v.make, v.id
+            LIMIT %s
+        """, (q, q, int(limit)))
+
+    ### RO ids WHERE EVERY TERM MATCHES THE RO NUMBER, THE CUSTOMER OR THE VEHICLE; statuses NARROWS TO BOARD LANES ###
+    # Terms may land on different tables ("smith camry"), so each term is looked up in each FULLTEXT index on
+    # its own (one MATCH per SELECT, so each uses its index), the hits are UNIONed per term and an RO is kept
+    # when all its terms hit. Best summed relevance first.
+    @staticmethod
+    def search_repair_orders(text: str, limit: int = 200, statuses=None) -> list[int]:
+        terms = SearchRepository.terms(text)
+        if not terms:
+            return []
+        status_sql, status_params = "", ()
+        if statuses:
+            status_sql = " AND ro.status IN (%s)" % ",".join(["%s"] * len(statuses))
+            status_params = tuple(statuses)
+        per_index = (
+            f"SELECT ro.id, %s AS term, {SearchRepository.RO_MATCH} AS score "
+            f"FROM repair_orders ro WHERE {SearchRepository.RO_MATCH}{status_sql}",
+            f"SELECT ro.id, %s AS term, {SearchRepository.CUSTOMER_MATCH} AS score "
+            f"FROM customers c JOIN repair_orders ro ON ro.customer_id = c.customer_id "
+            f"WHERE {SearchRepository.CUSTOMER_MATCH}{status_sql}",
+            f"SELECT ro.id, %s AS term, {SearchRepository.VEHICLE_MATCH} AS score "
+            f"FROM vehicles v JOIN repair_orders ro ON ro.vehicle_id = v.id "
+            f"WHERE {SearchRepository.VEHICLE_MATCH}{status_sql}",
+        )
+        selects, params = [], []
+        for n, term in enumerate(terms):
+            q = f'+"{term}"'
+            for sql in per_index:
+                selects.append(sql)
+                params.extend((n, q, q, *status_params))
+        return SearchRepository._ranked_ids(f"""
+            SELECT hits.id, SUM(hits.score) AS score
+            FROM ({" UNION ALL ".join(selects)}) hits
+            GROUP BY hits.id
+            HAVING COUNT(DISTINCT hits.term) = %s
+            ORDER BY score DESC, hits.id DESC
+            LIMIT %s
+        """, tuple(params) + (len(terms), int(limit)))
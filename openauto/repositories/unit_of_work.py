@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+
+import mysql.connector
+
+
+_local = threading.local()
+
+
+### RAISED WHEN A UNIT OF WORK ENDS AFTER AN ERROR SOMETHING INSIDE IT CAUGHT AND IGNORED ###
+    # InnoDB may already have rolled the transaction back (deadlock), so committing the rest would store half
+    # a save; the block is rolled back instead and this is raised from the error that poisoned it.
+class RollbackOnlyError(RuntimeError):
+    pass
+
+
+### Cursor handed out inside a unit of work: a failing statement marks the session rollback-only ###
+    # even when the repository code around it catches the error and carries on
+class SessionCursor:
+    def __init__(self, session: "Session", cursor):
+        self._session = session
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, *args, **kwargs):
+        try:
+            return self._cursor.execute(*args, **kwargs)
+        except mysql.connector.Error as e:
+            self._session.mark_rollback_only(e)
+            raise
+
+    def executemany(self, *args, **kwargs):
+        try:
+            return self._cursor.executemany(*args, **kwargs)
+        except mysql.connector.Error as e:
+            self._session.mark_rollback_only(e)
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+
+### Connection handed to repositories while a unit of work is open on this thread.
+### commit()/close() and `with conn:` are left to the unit of work, so every repository call
+### made inside the block shares one connection and one transaction. rollback() can't undo
+### only part of it, so it dooms the whole unit of work instead.
+class SessionConnection:
+    def __init__(self, session: "Session"):
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._session.conn, name)
+
+    def cursor(self, *args, **kwargs):
+        # buffered so a half-read SELECT can't block the next statement on the shared connection
+        if not kwargs.get("raw") and not kwargs.get("prepared"):
+            kwargs.setdefault("buffered", True)
+        return SessionCursor(self._session, self._session.conn.cursor(*args, **kwargs))
+
+    def start_transaction(self, *args, **kwargs):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self._session.mark_rollback_only(None)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+class Session:
+    def __init__(self, conn):
+        self.conn = conn
+        self.depth = 0
+        self.rollback_only = False
+        self.error: Exception | None = None    # first statement error seen inside the block
+
+    def connection(self) -> SessionConnection:
+        return SessionConnection(self)
+
+    def mark_rollback_only(self, error: Exception | None) -> None:
+        self.rollback_only = True
+        if self.error is None and error is not None:
+            self.error = error
+
+    def begin(self) -> None:
+        self.conn.start_transaction()
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def rollback(self) -> None:
+        try:
+            self.conn.rollback()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+def active_session() -> Session | None:
+    return getattr(_local, "session", None)
+
+
+def _set_session(session: Session | None) -> None:
+    _local.session = session
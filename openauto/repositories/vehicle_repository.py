@@ -86,7 +86,8 @@ class VehicleRepository:
         conn = db_handlers.connect_db()
         cursor = conn.cursor()
         query = """select vehicles.vin, vehicles.year, vehicles.make, vehicles.model, vehicles.engine_size,
-                               vehicles.trim, customers.last_name, customers.first_name , vehicles.customer_id from vehicles inner join
+                               vehicles.trim, customers.last_name, customers.first_name , vehicles.customer_id, vehicles.id
+                                from vehicles inner join
                                 customers on customers.customer_id = vehicles.customer_id order by make"""
         cursor.execute(query)
         result = cursor.fetchall()
@@ -96,6 +97,102 @@ class VehicleRepository:
 
         return result if result else None
 
+### INDEX BEHIND get_vehicle_info_page ###
+    @staticmethod
+    def ensure_paging_index():
+        db_handlers.ensure_index("vehicles", "ix_vehicles_make", "make, id")
+
+### ONE PAGE OF get_all_vehicle_info ROWS, KEYSET PAGED ON (make, id) ###
+    # after is the (make, id) of the last row already loaded; NULL makes sort first.
+    @staticmethod
+    def get_vehicle_info_page(after=None, limit=200, search=""):
+        where, params = [], []
+        if after is not None:
+            make, vehicle_id = after
+            if make is None:
+                where.append("((vehicles.make IS NULL AND vehicles.id > %s) OR vehicles.make IS NOT NULL)")
+                params.append(vehicle_id)
+            else:
+                where.append("(vehicles.make > %s OR (vehicles.make = %s AND vehicles.id > %s))")
+                params += [make, make, vehicle_id]
+        if search:
+            where.append("CONCAT_WS(' ', vehicles.vin, vehicles.year, vehicles.make, vehicles.model, vehicles.engine_size, "
+                         "vehicles.trim, customers.last_name, customers.first_name, vehicles.customer_id, vehicles.id) LIKE %s")
+            params.append(f"%{search}%")
+        query = """select vehicles.vin, vehicles.year, vehicles.make, vehicles.model, vehicles.engine_size,
+                               vehicles.trim, customers.last_name, customers.first_name , vehicles.customer_id, vehicles.id
+                                from vehicles inner join
+                                customers on customers.customer_id = vehicles.customer_id"""
+        if where:
+            query += " where " + " and ".join(where)
+        query += " order by vehicles.make, vehicles.id limit %s"
+        params.append(int(limit))
+
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor()
+        cursor.execute(query, tuple(params))
+        result = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return result or []
+
+### SAME ROWS AS get_all_vehicle_info / get_all_vehicles, LIMITED TO SOME VEHICLES OR OWNERS ###
+    @staticmethod
+    def get_vehicle_info_by_ids(vehicle_ids=None, customer_ids=None):
+        column = "vehicles.id" if vehicle_ids else "vehicles.customer_id"
+        ids = vehicle_ids or customer_ids
+        if not ids:
+            return []
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor()
+        query = f"""select vehicles.vin, vehicles.year, vehicles.make, vehicles.model, vehicles.engine_size,
+                               vehicles.trim, customers.last_name, customers.first_name , vehicles.customer_id, vehicles.id
+                                from vehicles inner join
+                                customers on customers.customer_id = vehicles.customer_id
+                                where {column} in ({",".join(["%s"] * len(ids))}) order by make"""
+        cursor.execute(query, tuple(ids))
+        result = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return result or []
+
+    @staticmethod
+    def get_vehicles_by_ids(vehicle_ids):
+        if not vehicle_ids:
+            return []
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor()
+        query = "Select year, make, model, customer_id, vin, id FROM vehicles WHERE id IN (%s)" % ",".join(["%s"] * len(vehicle_ids))
+        cursor.execute(query, tuple(vehicle_ids))
+        result = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return result or []
+
+### COMPACT ROWS FOR THE IN-MEMORY SEARCH INDEX ###
+    # (id, vin, plate, year, make, model, owner last_name, owner first_name, customer_id, engine_size, trim)
+    @staticmethod
+    def get_search_fields(vehicle_ids=None, customer_ids=None):
+        query = """select vehicles.id, vehicles.vin, vehicles.plate, vehicles.year, vehicles.make, vehicles.model,
+                          customers.last_name, customers.first_name, vehicles.customer_id,
+                          vehicles.engine_size, vehicles.trim
+                   from vehicles inner join customers on customers.customer_id = vehicles.customer_id"""
+        params = ()
+        if vehicle_ids is not None or customer_ids is not None:
+            column = "vehicles.id" if vehicle_ids is not None else "vehicles.customer_id"
+            ids = vehicle_ids if vehicle_ids is not None else customer_ids
+            if not ids:
+                return []
+            query += f" where {column} in ({','.join(['%s'] * len(ids))})"
+            params = tuple(ids)
+        conn = db_handlers.connect_db()
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        result = cursor.fetchall()
+        cursor.close()
+        conn.close()
+        return result or []
+
 ### CHANGES customer_id NUMBER TO CHANGE WHO VEHICLE BELONGS TO ###
     @staticmethod
     def change_vehicle_owner(vin, vehicle_id, customer_id):
@@ -0,0 +1,176 @@
+from __future__ import annotations
+import argparse
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from openauto.repositories.db_handlers import unit_of_work
+from openauto.repositories.estimate_items_repository import EstimateItemsRepository
+from openauto.repositories.estimate_jobs_repository import EstimateJobsRepository
+from openauto.repositories.estimates_repository import EstimatesRepository
+from openauto.services.pricing_matrix import pricing_matrix
+from openauto.utils.money import Money, MILLS
+
+
+@dataclass
+class RepricedLine:
+    item_id: int
+    estimate_id: int
+    ro_id: int | None
+    job_id: int | None
+    sku: str
+    description: str
+    unit_cost: float
+    old_price: Money
+    new_price: Money
+    line_delta: Money       # change in line_total (qty x price)
+
+
+### WHAT A RE-PRICING RUN WOULD CHANGE, GROUPED BY ESTIMATE. THE DRY RUN STOPS HERE ###
+@dataclass
+class RepricePlan:
+    lines_scanned: int = 0
+    unpriced: int = 0       # lines whose cost no tier covers; left as they are
+    by_estimate: dict[int, list[RepricedLine]] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def lines(self):
+        for lines in self.by_estimate.values():
+            yield from lines
+
+    def line_count(self) -> int:
+        return sum(len(lines) for lines in self.by_estimate.values())
+
+    def ro_ids(self) -> list[int]:
+        return sorted({line.ro_id for line in self.lines() if line.ro_id})
+
+    def total_delta(self) -> Money:
+        return Money.sum(line.line_delta for line in self.lines())
+
+    def is_empty(self) -> bool:
+        return not self.by_estimate
+
+    def summary(self) -> str:
+        return (f"{self.line_count()} of {self.lines_scanned} part lines on {len(self.by_estimate)} open estimates "
+                f"would change ({self.total_delta():+,.2f} before tax)")
+
+    ### THE DIFF AS TEXT: ONE LINE PER CHANGED PART, OLD -> NEW SELL, UNDER ITS ESTIMATE ###
+    def report(self, limit: int | None = None) -> str:
+        out = [self.summary()]
+        if self.unpriced:
+            out.append(f"{self.unpriced} lines have a cost outside every matrix tier and were left alone")
+        shown = 0
+        for estimate_id, lines in self.by_estimate.items():
+            ro = f" (RO id {lines[0].ro_id})" if lines[0].ro_id else ""
+            out.append(f"Estimate {estimate_id}{ro}: {Money.sum(l.line_delta for l in lines):+,.2f}")
+            for line in lines:
+                if limit is not None and shown >= limit:
+                    out.append(f"... {self.line_count() - shown} more lines")
+                    return "\n".join(out)
+                out.append(f"    #{line.item_id} {line.sku or '-'} {line.description[:40]}  cost {line.unit_cost:.2f}  "
+                           f"{line.old_price} -> {line.new_price}  ({line.line_delta:+,.2f})")
+                shown += 1
+        return "\n".join(out)
+
+
+@dataclass
+class RepriceResult:
+    estimates: int = 0
+    lines: int = 0
+    failed: dict[int, str] = field(default_factory=dict)
+    ro_ids: list[int] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+# ROUND(qty * price, 2) in cents, for arrays of qty in thousandths and price in cents (half away from zero)
+def _line_cents(qty_mills, price_cents):
+    product = qty_mills * price_cents
+    return np.sign(product) * ((np.abs(product) + 10 ** MILLS // 2) // 10 ** MILLS)
+
+
+### RE-PRICES OPEN ESTIMATES' PART LINES AFTER THE PRICING MATRIX CHANGES ###
+    # plan() streams every non-approved part line with a cost (EstimateItemsRepository.iter_repriceable_parts),
+    # prices each page at once with PricingMatrix.price_many and keeps only lines whose sell would change.
+    # apply() writes a plan one estimate per transaction: batched unit_price updates, then the job totals and
+    # estimates.total_amount. An estimate that fails is rolled back and reported; the rest still go through.
+    # Manually set sells on part lines are replaced as well; there is no per-line override flag to honour.
+class BulkRepricer:
+    PAGE_SIZE = 5000
+
+    @staticmethod
+    def plan(exclude_ro_ids=(), page_size: int | None = None) -> RepricePlan:
+        started = time.perf_counter()
+        matrix = pricing_matrix()
+        plan = RepricePlan()
+        exclude = np.array(sorted({int(r) for r in exclude_ro_ids or () if r}), dtype=np.int64)
+        for rows in EstimateItemsRepository.iter_repriceable_parts(page_size or BulkRepricer.PAGE_SIZE):
+            plan.lines_scanned += len(rows)
+            ids, estimate_ids, ro_ids, job_ids, skus, descs, qtys, costs, prices = zip(*rows)
+            cost = np.array(costs, dtype=np.float64)
+            old_cents = np.rint(np.array(prices, dtype=np.float64) * 100).astype(np.int64)
+            qty_mills = np.rint(np.array([1 if q is None else q for q in qtys], dtype=np.float64) * 10 ** MILLS).astype(np.int64)
+            new = matrix.price_many(cost)
+            priced = ~np.isnan(new)
+            plan.unpriced += int((~priced).sum())
+            new_cents = np.where(priced, np.rint(np.nan_to_num(new) * 100), 0).astype(np.int64)
+            changed = priced & (new_cents != old_cents)
+            if exclude.size:
+                ro = np.array([r or 0 for r in ro_ids], dtype=np.int64)
+                changed &= ~np.isin(ro, exclude)
+            delta = _line_cents(qty_mills, new_cents) - _line_cents(qty_mills, old_cents)
+            for n in np.flatnonzero(changed).tolist():
+                plan.by_estimate.setdefault(estimate_ids[n], []).append(RepricedLine(
+                    item_id=ids[n], estimate_id=estimate_ids[n], ro_id=ro_ids[n], job_id=job_ids[n],
+                    sku=skus[n] or "", description=descs[n] or "", unit_cost=float(cost[n]),
+                    old_price=Money(int(old_cents[n])), new_price=Money(int(new_cents[n])),
+                    line_delta=Money(int(delta[n])),
+                ))
+        plan.seconds = time.perf_counter() - started
+        return plan
+
+    @staticmethod
+    def apply(plan: RepricePlan) -> RepriceResult:
+        started = time.perf_counter()
+        result = RepriceResult()
+        ro_ids = set()
+        for estimate_id, lines in plan.by_estimate.items():
+            try:
+                with unit_of_work():
+                    changed = EstimateItemsRepository.set_unit_prices(
+                        estimate_id, [(line.item_id, line.new_price.decimal()) for line in lines])
+                    EstimateJobsRepository.recompute_totals_for_estimate(estimate_id)
+                    EstimatesRepository.recompute_total(estimate_id)
+            except Exception as e:
+                print(f"[BulkRepricer] Re-pricing estimate {estimate_id} failed: {e}")
+                result.failed[estimate_id] = str(e)
+                continue
+            result.estimates += 1
+            result.lines += changed
+            ro_ids.update(line.ro_id for line in lines if line.ro_id)
+        result.ro_ids = sorted(ro_ids)
+        result.seconds = time.perf_counter() - started
+        return result
+
+
+### python -m openauto.services.bulk_repricing [--apply]: PRINTS THE DIFF, WRITES IT ONLY WITH --apply ###
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Re-price part lines on open estimates from the pricing matrix.")
+    parser.add_argument("--apply", action="store_true", help="write the new prices (default is a dry run)")
+    parser.add_argument("--limit", type=int, default=200, help="changed lines to list in the report (0 for all)")
+    args = parser.parse_args(argv)
+
+    plan = BulkRepricer.plan()
+    print(plan.report(limit=args.limit or None))
+    print(f"Planned in {plan.seconds:.2f}s")
+    if not args.apply or plan.is_empty():
+        return 0
+    result = BulkRepricer.apply(plan)
+    print(f"Re-priced {result.lines} lines on {result.estimates} estimates in {result.seconds:.2f}s")
+    for estimate_id, error in result.failed.items():
+        print(f"Estimate {estimate_id} failed: {error}")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+from __future__ import annotations
+import math
+import threading
+from bisect import bisect_left, bisect_right
+
+from openauto.repositories.settings_repository import SettingsRepository
+
+
+# sell = cost x multiplier, rounded half up to cents (the same float steps in price_for and price_many)
+def _to_cents(x: float) -> float:
+    return math.floor(x * 100.0 + 0.5) / 100.0
+
+
+### THE SHOP's PRICING MATRIX, LOADED ONCE PER PROCESS AND LOOKED UP BY BISECTION ###
+    # Tiers are sorted by min_cost; a cost gets the first tier (in that order) with min <= cost <= max, as the
+    # old linear scans did. reach[i] is the largest max_cost among tiers 0..i, so that first tier is
+    # bisect_left(reach, cost), provided its min is <= cost. SettingsManager.save_pricing_matrix invalidates it;
+    # the next lookup reloads. Safe to use from worker threads (bulk re-pricing).
+class PricingMatrix:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (tiers, mins, reach, mults), swapped in whole so a reader on another thread never mixes two loads
+        self._index: tuple | None = None
+        self.loads = 0
+
+    def _ensure_loaded(self) -> tuple:
+        index = self._index
+        if index is not None:
+            return index
+        with self._lock:
+            if self._index is not None:
+                return self._index
+            try:
+                rows = SettingsRepository.load_matrix_table() or []
+            except Exception as e:
+                print(f"[PricingMatrix] Failed to load pricing matrix: {e}")
+                rows = []
+            tiers = []
+            for min_cost, max_cost, multiplier, percent_return in rows:
+                try:
+                    tiers.append({
+                        "min": float(min_cost) if min_cost is not None else 0.0,
+                        "max": float(max_cost) if max_cost is not None else float("inf"),
+                        "mult": float(multiplier) if multiplier is not None else 1.0,
+                        "percent_return": float(percent_return) if percent_return is not None else None,
+                    })
+                except (TypeError, ValueError):
+                    continue
+            tiers.sort(key=lambda r: r["min"])
+            reach, top = [], float("-inf")
+            for t in tiers:
+                top = max(top, t["max"])
+                reach.append(top)
+            self._index = (tiers, [t["min"] for t in tiers], reach, [t["mult"] for t in tiers])
+            self.loads += 1
+            return self._index
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._index = None
+
+    def tiers(self) -> list[dict]:
+        return [dict(t) for t in self._ensure_loaded()[0]]
+
+    def is_empty(self) -> bool:
+        return not self._ensure_loaded()[0]
+
+    ### SELL PRICE FOR ONE COST, None WHEN NO TIER COVERS IT ###
+    def price_for(self, cost: float | None) -> float | None:
+        if cost is None:
+            return None
+        try:
+            cost = float(cost)
+        except (TypeError, ValueError):
+            return None
+        if math.isnan(cost):
+            return None
+        _tiers, mins, reach, mults = self._ensure_loaded()
+        i = bisect_left(reach, cost)
+        if i < bisect_right(mins, cost):
+            return _to_cents(cost * mults[i])
+        return None
+
+    ### SELL PRICES FOR AN ARRAY OF COSTS (numpy float64), NaN WHERE NO TIER COVERS THE COST ###
+    def price_many(self, costs):
+        import numpy as np
+
+        tiers, mins, reach, mults = self._ensure_loaded()
+        costs = np.asarray(costs, dtype=np.float64)
+        out = np.full(costs.shape, np.nan)
+        if not tiers or costs.size == 0:
+            return out
+        idx = np.searchsorted(np.asarray(reach), costs, side="left")
+        ok = (idx < np.searchsorted(np.asarray(mins), costs, side="right")) & ~np.isnan(costs)
+        out[ok] = np.floor(costs[ok] * np.asarray(mults)[idx[ok]] * 100.0 + 0.5) / 100.0
+        return out
+
+
+_matrix: PricingMatrix | None = None
+
+
+### THE PROCESS-WIDE MATRIX ROTreeModel, ItemEntryController AND BULK RE-PRICING SHARE ###
+def pricing_matrix() -> PricingMatrix:
+    global _matrix
+    if _matrix is None:
+        _matrix = PricingMatrix()
+    return _matrix
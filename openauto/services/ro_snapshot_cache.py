@@ -0,0 +1,124 @@
+from __future__ import annotations
+from collections import OrderedDict
+
+from PyQt6 import QtCore
+from openauto.repositories.ro_snapshot_repository import ROSnapshot, ROSnapshotRepository
+
+
+HOVER_PREFETCH_MS = 150
+
+
+### IN-PROCESS LRU OF ROSnapshot BY ro_id, CHECKED AGAINST THE RO's updated_at WHEN THE CALLER KNOWS IT ###
+    # Dropped by change events: SQLMonitor.ro_changes (repair_orders / estimate_jobs / estimate_items rows),
+    # customer and vehicle row changes, and local saves (C3 lines and the memo aren't in change_log).
+    # prefetch() reads on a worker thread; every invalidation bumps a per-RO generation so a read that
+    # started before it is thrown away instead of caching stale data.
+class ROSnapshotCache(QtCore.QObject):
+    _loaded = QtCore.pyqtSignal(int, int, object)  # ro_id, generation, ROSnapshot | None (worker -> GUI thread)
+
+    def __init__(self, capacity: int = 32, parent=None):
+        super().__init__(parent)
+        self.capacity = max(1, int(capacity))
+        self._entries: OrderedDict[int, ROSnapshot] = OrderedDict()
+        self._generation: dict[int, int] = {}
+        self._in_flight: set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._loaded.connect(self._on_loaded)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ro_id) -> bool:
+        return ro_id in self._entries
+
+    ### CACHED SNAPSHOT OR None; version (updated_at) THAT DOESN'T MATCH COUNTS AS A MISS ###
+    def get(self, ro_id: int, version=None) -> ROSnapshot | None:
+        snapshot = self._entries.get(ro_id)
+        if snapshot is None:
+            return None
+        if version is not None and snapshot.ro.get("updated_at") != version:
+            self.invalidate([ro_id])
+            return None
+        self._entries.move_to_end(ro_id)
+        return snapshot
+
+    ### CACHED SNAPSHOT, ELSE ONE ROSnapshotRepository.load ON THIS THREAD ###
+    def load(self, ro_id: int, version=None) -> ROSnapshot | None:
+        snapshot = self.get(ro_id, version)
+        if snapshot is not None:
+            self.hits += 1
+            return snapshot
+        self.misses += 1
+        snapshot = ROSnapshotRepository.load(ro_id)
+        if snapshot is not None:
+            self._put(ro_id, snapshot)
+        return snapshot
+
+    ### WARMS THE CACHE ON A WORKER THREAD (ROTile / ROBoardView HOVER) ###
+    def prefetch(self, ro_id: int, version=None) -> None:
+        if not ro_id or ro_id in self._in_flight or self.get(ro_id, version) is not None:
+            return
+        self._in_flight.add(ro_id)
+        generation = self._generation.get(ro_id, 0)
+        cache = self
+
+        class Task(QtCore.QRunnable):
+            def run(self_nonlocal):
+                try:
+                    snapshot = ROSnapshotRepository.load(ro_id)
+                except Exception as e:
+                    print(f"[ROSnapshotCache] Prefetch of RO {ro_id} failed: {e}")
+                    snapshot = None
+                cache._loaded.emit(ro_id, generation, snapshot)
+
+        self._pool.start(Task())
+
+    def _on_loaded(self, ro_id: int, generation: int, snapshot) -> None:
+        self._in_flight.discard(ro_id)
+        if snapshot is not None and generation == self._generation.get(ro_id, 0):
+            self._put(ro_id, snapshot)
+
+    def _put(self, ro_id: int, snapshot: ROSnapshot) -> None:
+        self._entries[ro_id] = snapshot
+        self._entries.move_to_end(ro_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    ### CONNECTED TO SQLMonitor.ro_changes; AN EMPTY LIST MEANS "SOMETHING CHANGED" (POLLING FALLBACK) ###
+    def invalidate(self, ro_ids) -> None:
+        ro_ids = list(ro_ids or [])
+        if not ro_ids:
+            self.clear()
+            return
+        for ro_id in ro_ids:
+            self._entries.pop(ro_id, None)
+            self._generation[ro_id] = self._generation.get(ro_id, 0) + 1
+
+    def clear(self) -> None:
+        for ro_id in set(self._entries) | self._in_flight:
+            self._generation[ro_id] = self._generation.get(ro_id, 0) + 1
+        self._entries.clear()
+
+    ### CONNECTED TO SQLMonitor rows_updated / rows_deleted: CUSTOMER AND VEHICLE DATA IS PART OF EVERY SNAPSHOT ###
+    def apply_row_changes(self, table, ids) -> None:
+        key = {"customers": "customer_id", "vehicles": "vehicle_id"}.get(table)
+        if key is None or not self._entries:
+            return
+        ids = set(ids)
+        stale = [ro_id for ro_id, snap in self._entries.items() if snap.ro.get(key) in ids]
+        if stale:
+            self.invalidate(stale)
+
+
+_cache: ROSnapshotCache | None = None
+
+
+### THE PROCESS-WIDE CACHE THE HUB, PRINTING AND THE BOARDS SHARE ###
+def snapshot_cache() -> ROSnapshotCache:
+    global _cache
+    if _cache is None:
+        _cache = ROSnapshotCache()
+    return _cache
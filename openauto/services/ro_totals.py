@@ -0,0 +1,34 @@
+from __future__ import annotations
+import argparse
+
+from openauto.repositories.ro_totals_repository import ROTotalsRepository
+
+
+### python -m openauto.services.ro_totals [--fix]: LISTS ESTIMATES / ROs WHOSE STORED TOTALS DRIFTED, FIXES WITH --fix ###
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the stored estimate totals and RO approved totals against their lines.")
+    parser.add_argument("--fix", action="store_true", help="rewrite drifted totals from the lines (backfill)")
+    parser.add_argument("--limit", type=int, default=50, help="drifted rows to list per table (0 for all)")
+    args = parser.parse_args(argv)
+
+    if not ROTotalsRepository.ensure_schema():
+        print("Stored totals are not installed (columns or triggers missing); see openauto_schema.sql")
+        return 2
+    drift = ROTotalsRepository.check()
+    limit = args.limit or None
+    estimates, ros = drift["estimates"], drift["ros"]
+    print(f"{len(estimates)} estimates and {len(ros)} ROs out of step")
+    for row in estimates[:limit]:
+        print(f"    estimate {row['estimate_id']} (RO id {row['ro_id']}): subtotal {row['subtotal']} -> "
+              f"{row['expected_subtotal']}, grand {row['grand_total']} -> {row['expected_grand']}")
+    for row in ros[:limit]:
+        print(f"    RO id {row['ro_id']}: approved_total {row['approved_total']} -> {row['expected_approved_total']}")
+    if not args.fix or not (estimates or ros):
+        return 1 if (estimates or ros) else 0
+    fixed_estimates, fixed_ros = ROTotalsRepository.backfill()
+    print(f"Backfilled {fixed_estimates} estimates and {fixed_ros} ROs")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
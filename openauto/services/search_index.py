@@ -0,0 +1,305 @@
+from __future__ import annotations
+import re
+import unicodedata
+import heapq
+from bisect import bisect_left, insort
+
+from PyQt6 import QtCore
+
+from openauto.repositories.customer_repository import CustomerRepository
+from openauto.repositories.vehicle_repository import VehicleRepository
+
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+_NON_DIGIT = re.compile(r"\D")
+
+
+def normalize(text) -> str:
+    # accent and case folded, like the utf8mb4_0900_ai_ci collation the tables sort with
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text) -> list[str]:
+    return _TOKEN.findall(normalize(text))
+
+
+def phone_tokens(phone) -> list[str]:
+    # the full number, the number without area code and the last four, so any of them can be typed
+    digits = _NON_DIGIT.sub("", str(phone or ""))
+    if not digits:
+        return []
+    return [digits, digits[-7:], digits[-4:]]
+
+
+### IN-MEMORY PREFIX INDEX: EVERY QUERY TOKEN MUST BE THE START OF SOME TOKEN OF THE RECORD ###
+    # postings map each distinct token to the record ids that contain it; a sorted list of the distinct tokens
+    # turns a prefix into one bisect plus a short forward scan, so a keystroke never touches every record.
+    # load_async() reads and indexes every record on a worker and swaps the result in on the GUI thread; row
+    # changes that arrive meanwhile are replayed after the swap, and a load outdated by invalidate() is dropped.
+class SearchIndex(QtCore.QObject):
+    _built = QtCore.pyqtSignal(int, object)  # generation, snapshot dict (worker -> GUI thread)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tokens_by_id: dict[int, tuple[str, ...]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._sorted_tokens: list[str] = []
+        self._order: dict[int, tuple] = {}
+        self.loaded = False
+        self._generation = 0
+        self._loading = False
+        self._replay: list[tuple] = []
+        self._pool = QtCore.QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._built.connect(self._install)
+
+    ### SUBCLASS HOOKS: THE MySQL READ (SAFE ON A WORKER) AND (record_id, tokens, order_key) FOR ONE ROW ###
+    @staticmethod
+    def read_rows(ids=None) -> list:
+        return []
+
+    @staticmethod
+    def record(row) -> tuple:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return len(self._tokens_by_id)
+
+    def clear(self) -> None:
+        self._tokens_by_id, self._postings, self._sorted_tokens, self._order = {}, {}, [], {}
+        self.loaded = False
+
+    ### SYNCHRONOUS LOAD, FOR CALLERS THAT CAN'T WAIT FOR load_async ###
+    def ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.__dict__.update(self._snapshot(self.read_rows() or []))
+            self.loaded = True
+
+    ### READ AND INDEX ON THE WORKER; THE CURRENT DATA KEEPS ANSWERING UNTIL THE SWAP ###
+    def load_async(self) -> None:
+        if self._loading:
+            return
+        self._loading = True
+        generation = self._generation
+        index = self
+
+        class Task(QtCore.QRunnable):
+            def run(self_nonlocal):
+                try:
+                    snapshot = index._snapshot(index.read_rows() or [])
+                except Exception as e:
+                    print(f"[{type(index).__name__}] Loading the search index failed: {e}")
+                    snapshot = None
+                index._built.emit(generation, snapshot)
+
+        self._pool.start(Task())
+
+    def _install(self, generation: int, snapshot) -> None:
+        self._loading = False
+        if generation != self._generation:
+            # invalidated while the worker was reading: that read may predate the change
+            self.load_async()
+            return
+        replay, self._replay = self._replay, []
+        if snapshot is None:
+            return
+        self.__dict__.update(snapshot)
+        self.loaded = True
+        for method, table, ids in replay:
+            method(table, ids)
+
+    ### BULK LOAD: POSTINGS FIRST, ONE SORT AT THE END (RUNS ON THE WORKER, TOUCHES NO STATE) ###
+    def _snapshot(self, rows) -> dict:
+        tokens_by_id, postings, order = {}, {}, {}
+        for row in rows:
+            record_id, tokens, order_key = self.record(row)
+            tokens = tuple(dict.fromkeys(tokens))
+            tokens_by_id[record_id] = tokens
+            order[record_id] = order_key
+            for t in tokens:
+                postings.setdefault(t, set()).add(record_id)
+        return {"_tokens_by_id": tokens_by_id, "_postings": postings,
+                "_sorted_tokens": sorted(postings), "_order": order}
+
+    def build(self, records) -> None:
+        self.clear()
+        self.__dict__.update(self._snapshot(records))
+        self.loaded = True
+
+    def add(self, record_id: int, tokens, order_key: tuple = ()) -> None:
+        self.remove(record_id)
+        tokens = tuple(dict.fromkeys(tokens))
+        self._tokens_by_id[record_id] = tokens
+        self._order[record_id] = order_key
+        for t in tokens:
+            ids = self._postings.get(t)
+            if ids is None:
+                self._postings[t] = ids = set()
+                insort(self._sorted_tokens, t)
+            ids.add(record_id)
+
+    def remove(self, record_id: int) -> None:
+        self._order.pop(record_id, None)
+        for t in self._tokens_by_id.pop(record_id, ()):
+            ids = self._postings.get(t)
+            if ids is None:
+                continue
+            ids.discard(record_id)
+            if not ids:
+                del self._postings[t]
+                pos = bisect_left(self._sorted_tokens, t)
+                if pos < len(self._sorted_tokens) and self._sorted_tokens[pos] == t:
+                    self._sorted_tokens.pop(pos)
+
+    ### ROW CHANGES WHILE A LOAD IS RUNNING ARE RE-APPLIED ON TOP OF IT ###
+    def _deferred(self, method, table, ids) -> bool:
+        if self._loading:
+            self._replay.append((method, table, list(ids)))
+        return self._loading or not self.loaded
+
+    def _prefix_ids(self, prefix: str) -> set[int]:
+        out: set[int] = set()
+        tokens = self._sorted_tokens
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            out |= self._postings[tokens[i]]
+            i += 1
+        return out
+
+    ### IDS OF RECORDS MATCHING EVERY TOKEN OF query, AT MOST limit OF THEM ###
+    # records where more terms are whole tokens come first ("ann" puts Ann before Annette), then the
+    # table's own display order, so a cut at limit keeps the best hits rather than the oldest ids.
+    def search(self, query: str, limit: int | None = None) -> list[int]:
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)  # longest prefix is the most selective
+        if not terms:
+            return []
+        hits = self._prefix_ids(terms[0])
+        for term in terms[1:]:
+            if not hits:
+                break
+            hits &= self._prefix_ids(term)
+        exact = [self._postings.get(term, ()) for term in terms]
+        order = self._order
+
+        def rank(record_id):
+            return -sum(record_id in ids for ids in exact), order.get(record_id, ()), record_id
+
+        if limit is None:
+            return sorted(hits, key=rank)
+        return heapq.nsmallest(limit, hits, key=rank)
+
+    ### SAME TEST AS search FOR ONE RECORD (USED WHEN A CHANGED ROW ARRIVES WHILE RESULTS ARE SHOWN) ###
+    def matches(self, record_id, query: str) -> bool:
+        tokens = self._tokens_by_id.get(record_id)
+        if tokens is None:
+            try:
+                tokens = self._tokens_by_id.get(int(record_id))
+            except (TypeError, ValueError):
+                tokens = None
+        if tokens is None:
+            return False
+        return all(any(t.startswith(term) for t in tokens) for term in tokenize(query))
+
+    # full snapshot from the polling fallback: reload on the worker, the old data answers until then
+    def invalidate(self, *_args):
+        self._generation += 1
+        self._replay = []
+        self.load_async()
+
+
+### CUSTOMERS BY NAME, PHONE DIGITS, EMAIL AND ADDRESS ###
+    # shown sorted by last name (CustomerTable cursor_columns), so hits are ranked the same way
+class CustomerSearchIndex(SearchIndex):
+    @staticmethod
+    def read_rows(ids=None) -> list:
+        return CustomerRepository.get_search_fields(ids)
+
+    @staticmethod
+    def record(row) -> tuple:
+        customer_id, last_name, first_name, phone, alt_phone, email, address, city, state, zip_code = row
+        tokens = tokenize(f"{last_name or ''} {first_name or ''} {email or ''} "
+                          f"{address or ''} {city or ''} {state or ''} {zip_code or ''}")
+        if email:
+            tokens.append(normalize(email))
+        tokens += phone_tokens(phone) + phone_tokens(alt_phone)
+        return customer_id, tokens, (normalize(last_name), normalize(first_name))
+
+    ### CONNECTED TO SQLMonitor rows_inserted / rows_updated / rows_deleted ###
+    def apply_row_changes(self, table, ids):
+        if table != "customers" or self._deferred(self.apply_row_changes, table, ids):
+            return
+        for row in self.read_rows(ids) or []:
+            self.add(*self.record(row))
+
+    def apply_row_deletes(self, table, ids):
+        if table != "customers" or self._deferred(self.apply_row_deletes, table, ids):
+            return
+        for customer_id in ids:
+            self.remove(customer_id)
+
+
+### VEHICLES BY VIN (ALSO ITS LAST 6/8), PLATE, YEAR/MAKE/MODEL/TRIM/ENGINE AND OWNER NAME ###
+    # shown sorted by make (VehicleTable cursor_columns), so hits are ranked the same way
+class VehicleSearchIndex(SearchIndex):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._owner: dict[int, int] = {}
+
+    def clear(self) -> None:
+        super().clear()
+        self._owner = {}
+
+    @staticmethod
+    def read_rows(ids=None, customer_ids=None) -> list:
+        return VehicleRepository.get_search_fields(vehicle_ids=ids, customer_ids=customer_ids)
+
+    @staticmethod
+    def record(row) -> tuple:
+        vehicle_id, vin, plate, year, make, model, last_name, first_name, _customer_id, engine_size, trim = row
+        tokens = tokenize(f"{plate or ''} {year or ''} {make or ''} {model or ''} {trim or ''} "
+                          f"{engine_size or ''} {last_name or ''} {first_name or ''}")
+        vin = normalize(vin).replace(" ", "")
+        if vin:
+            tokens += [vin, vin[-8:], vin[-6:]]
+        return vehicle_id, tokens, (normalize(make), normalize(model))
+
+    def _snapshot(self, rows) -> dict:
+        snapshot = super()._snapshot(rows)
+        snapshot["_owner"] = {row[0]: row[8] for row in rows}
+        return snapshot
+
+    def _add_rows(self, rows) -> None:
+        for row in rows:
+            self.add(*self.record(row))
+            self._owner[row[0]] = row[8]
+
+    def apply_row_changes(self, table, ids):
+        if table not in ("vehicles", "customers") or self._deferred(self.apply_row_changes, table, ids):
+            return
+        if table == "vehicles":
+            rows = self.read_rows(ids) or []
+            found = {row[0] for row in rows}
+            for vehicle_id in ids:
+                if vehicle_id not in found:
+                    self._drop(vehicle_id)
+            self._add_rows(rows)
+        else:
+            # owner names are part of every vehicle record
+            self._add_rows(self.read_rows(customer_ids=ids) or [])
+
+    def apply_row_deletes(self, table, ids):
+        if table not in ("vehicles", "customers") or self._deferred(self.apply_row_deletes, table, ids):
+            return
+        if table == "vehicles":
+            for vehicle_id in ids:
+                self._drop(vehicle_id)
+        else:
+            # ON DELETE CASCADE doesn't fire the vehicles trigger
+            owners = set(ids)
+            for vehicle_id in [v for v, c in self._owner.items() if c in owners]:
+                self._drop(vehicle_id)
+
+    def _drop(self, vehicle_id) -> None:
+        self.remove(vehicle_id)
+        self._owner.pop(vehicle_id, None)
@@ -2,13 +2,14 @@ from __future__ import annotations
 from PyQt6 import QtCore, QtGui
 from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer
 
-from openauto.repositories import (customer_repository, vehicle_repository,
+from openauto.repositories import (customer_repository, vehicle_repository, db_handlers, change_log_repository,
                                    appointment_repository, repair_orders_repository)
 
 from PyQt6.QtCore import QPoint, QRect, QEasingCurve, QPropertyAnimation, QSequentialAnimationGroup, QParallelAnimationGroup, QPauseAnimation, QEvent
 from PyQt6 import QtWidgets
 from PyQt6.QtWidgets import QGraphicsOpacityEffect
 from queue import Queue, Empty
+import time
 
 
 ### EVENT FILTER TO ANIMATE MENU COLLAPSE WHEN MOUSE ISIN'T HOVERED OVER IT AND EXPAND ON MOUSE HOVER  ###
@@ -303,17 +304,32 @@ class CMenuHandler(QObject):
 
     
 ### QTHREAD TO MONITOR CHANGES IN DATABASE. USING ONE QTHREAD FOR ALL TABLES AS IT SHOULD BE MORE EFFICIENT###
-### MAY CHANGE TO QEVENT LATER ###
+### READS ONLY NEW change_log ROWS EACH TICK; FALLS BACK TO FULL TABLE POLLING IF THE TRIGGERS AREN'T INSTALLED ###
 class SQLMonitor(QThread):
+    # how long a skipped change_log seq is looked for again: a transaction open longer than this (or rolled
+    # back) is given up on. MAX_SEQ_GAPS bounds the list after a large rollback.
+    SEQ_GAP_GRACE_SECONDS = 120
+    MAX_SEQ_GAPS = 10000
+    # change_log rows older than PURGE_HOURS are deleted at startup and again every PURGE_EVERY_POLLS polls
+    # (about hourly), so a client left running for weeks doesn't let the table grow without bound
+    PURGE_HOURS = 24
+    PURGE_EVERY_POLLS = 3600
+
     customer_updates = pyqtSignal(list)
     ro_updates = pyqtSignal(list)
     estimate_item_updates = pyqtSignal(list)
+    # ro_ids touched by repair_orders / estimate_jobs / estimate_items rows; [] = unknown (full polling)
+    ro_changes = pyqtSignal(list)
     vehicle_update = pyqtSignal(list)
     belongs_to_update = pyqtSignal(list)
     small_customers_update = pyqtSignal(list)
     small_vehicles_update = pyqtSignal(list)
     appointment_data = pyqtSignal(list)
     hourly_schedule_update = pyqtSignal()
+    # row level change feed: (table name, primary keys)
+    rows_inserted = pyqtSignal(str, list)
+    rows_updated = pyqtSignal(str, list)
+    rows_deleted = pyqtSignal(str, list)
 
 
     def __init__(self):
@@ -328,51 +344,160 @@ class SQLMonitor(QThread):
         self.last_vehicle_small_data = None
         self.last_appointment_data = None
         self.last_hourly_data = None
+        self.last_seq = 0
+        self.seq_gaps: dict[int, float] = {}    # seq skipped over -> when first noticed (time.monotonic)
+        self.change_feed = False
+        self.polls_since_purge = 0
 
 
     def run(self):
+            # keep one pooled connection for this thread; polling never queues behind the GUI's checkouts
+            db_handlers.bind_thread_connection()
+            self._start_change_feed()
             while True:
                 try:
-                    ro_data = repair_orders_repository.RepairOrdersRepository.heartbeat() or []
-                    customer_data = customer_repository.CustomerRepository.get_all_customer_info() or []
-                    vehicle_data = vehicle_repository.VehicleRepository.get_all_vehicle_info() or []
-                    customer_small_data = customer_repository.CustomerRepository.get_all_customer_names() or []
-                    vehicle_small_data = vehicle_repository.VehicleRepository.get_all_vehicles() or []
-                    appointment_data = appointment_repository.AppointmentRepository.get_appointment_ids_and_timestamps() or []
-
-
-                    if ro_data != self.last_ro_data:
-                        self.last_ro_data = ro_data
-                        self.ro_updates.emit(list(ro_data))
-
-                    if customer_data != self.last_customer_data:
-                        self.last_customer_data = customer_data
-                        self.customer_updates.emit(customer_data)
-
-                    if vehicle_data != self.last_vehicle_data:
-                        self.last_vehicle_data = vehicle_data
-                        self.vehicle_update.emit(vehicle_data)
-
-                    if customer_small_data != self.last_customer_small_data:
-                        self.last_customer_small_data = customer_small_data
-                        self.small_customers_update.emit(customer_small_data)
-
-                    if vehicle_small_data != self.last_vehicle_small_data:
-                        self.last_vehicle_small_data = vehicle_small_data
-                        self.small_vehicles_update.emit(vehicle_small_data)
-
-                    if appointment_data != self.last_appointment_data:
-                        self.last_appointment_data = appointment_data
-                        self.appointment_data.emit(appointment_data)
-
-
-
-
+                    if self.change_feed:
+                        self._poll_changes()
+                        self._purge_if_due()
+                    else:
+                        self._poll_full()
                 except Exception as e:
                     print(f"[SQLMonitor] Error during polling: {e}")
 
                 QThread.msleep(1000)
 
+    def _start_change_feed(self):
+        try:
+            self.change_feed = change_log_repository.ChangeLogRepository.ensure_schema()
+            if self.change_feed:
+                # take the high-water mark before the initial load so nothing slips between the two
+                self.last_seq = change_log_repository.ChangeLogRepository.latest_seq()
+                self._seed_seq_gaps()
+                change_log_repository.ChangeLogRepository.purge_older_than(self.PURGE_HOURS)
+        except Exception as e:
+            self.change_feed = False
+            print(f"[SQLMonitor] change_log unavailable, polling full tables: {e}")
+        try:
+            self._poll_full()
+        except Exception as e:
+            print(f"[SQLMonitor] Error during polling: {e}")
+
+    def _purge_if_due(self):
+        self.polls_since_purge += 1
+        if self.polls_since_purge < self.PURGE_EVERY_POLLS:
+            return
+        self.polls_since_purge = 0
+        try:
+            change_log_repository.ChangeLogRepository.purge_older_than(self.PURGE_HOURS)
+        except Exception as e:
+            print(f"[SQLMonitor] Purging change_log failed: {e}")
+
+    # transactions still open at startup hold seqs below the high-water mark; watch the recent holes for them
+    def _seed_seq_gaps(self, window: int = 1000):
+        low = max(0, self.last_seq - window)
+        recent = change_log_repository.ChangeLogRepository.changes_since(low, limit=window)
+        present = {int(r[0]) for r in recent}
+        now = time.monotonic()
+        self.seq_gaps = {seq: now for seq in range(low + 1, self.last_seq + 1) if seq not in present}
+
+    ### NEW ROWS PAST last_seq, PLUS ANY SKIPPED seq WHOSE TRANSACTION HAS COMMITTED SINCE ###
+    def _read_changes(self) -> list[tuple]:
+        repo = change_log_repository.ChangeLogRepository
+        late = repo.changes_in(list(self.seq_gaps)) if self.seq_gaps else []
+        for r in late:
+            self.seq_gaps.pop(int(r[0]), None)
+        rows = repo.changes_since(self.last_seq)
+        now = time.monotonic()
+        expected = self.last_seq + 1
+        for r in rows:
+            seq = int(r[0])
+            for missing in range(expected, seq):
+                self.seq_gaps[missing] = now
+            expected = seq + 1
+        if rows:
+            self.last_seq = int(rows[-1][0])
+        cutoff = now - self.SEQ_GAP_GRACE_SECONDS
+        for seq in [s for s, seen in self.seq_gaps.items() if seen < cutoff]:
+            del self.seq_gaps[seq]
+        if len(self.seq_gaps) > self.MAX_SEQ_GAPS:
+            for seq in sorted(self.seq_gaps)[:len(self.seq_gaps) - self.MAX_SEQ_GAPS]:
+                del self.seq_gaps[seq]
+        return sorted(late + list(rows), key=lambda r: int(r[0])) if late else rows
+
+    def _poll_changes(self):
+        rows = self._read_changes()
+        if not rows:
+            return
+        changes = change_log_repository.ChangeLogRepository.coalesce(rows)
+
+        for table, ops in changes.items():
+            if ops["insert"]:
+                self.rows_inserted.emit(table, ops["insert"])
+            if ops["update"]:
+                self.rows_updated.emit(table, ops["update"])
+            if ops["delete"]:
+                self.rows_deleted.emit(table, ops["delete"])
+
+        # customer/vehicle tables apply the row level signals themselves; no full re-read here
+        if "appointments" in changes:
+            self._refresh_appointments()
+
+        if "repair_orders" in changes or "estimate_jobs" in changes:
+            self._refresh_ro()
+
+        if "estimate_items" in changes:
+            ro_ids = sorted({int(r[3]) for r in rows if r[1] == "estimate_items" and r[3] is not None})
+            if ro_ids:
+                self.estimate_item_updates.emit(ro_ids)
+
+        touched = sorted({int(r[3]) for r in rows if r[3] is not None})
+        if touched:
+            self.ro_changes.emit(touched)
+
+    def _poll_full(self):
+        self._refresh_ro()
+        self._refresh_customers()
+        self._refresh_vehicles()
+        self._refresh_appointments()
+
+    def _refresh_ro(self):
+        ro_data = repair_orders_repository.RepairOrdersRepository.heartbeat() or []
+        if ro_data != self.last_ro_data:
+            self.last_ro_data = ro_data
+            self.ro_updates.emit(list(ro_data))
+            if not self.change_feed:
+                self.ro_changes.emit([])
+
+    def _refresh_customers(self):
+        customer_data = customer_repository.CustomerRepository.get_all_customer_info() or []
+        customer_small_data = customer_repository.CustomerRepository.get_all_customer_names() or []
+
+        if customer_data != self.last_customer_data:
+            self.last_customer_data = customer_data
+            self.customer_updates.emit(customer_data)
+
+        if customer_small_data != self.last_customer_small_data:
+            self.last_customer_small_data = customer_small_data
+            self.small_customers_update.emit(customer_small_data)
+
+    def _refresh_vehicles(self):
+        vehicle_data = vehicle_repository.VehicleRepository.get_all_vehicle_info() or []
+        vehicle_small_data = vehicle_repository.VehicleRepository.get_all_vehicles() or []
+
+        if vehicle_data != self.last_vehicle_data:
+            self.last_vehicle_data = vehicle_data
+            self.vehicle_update.emit(vehicle_data)
+
+        if vehicle_small_data != self.last_vehicle_small_data:
+            self.last_vehicle_small_data = vehicle_small_data
+            self.small_vehicles_update.emit(vehicle_small_data)
+
+    def _refresh_appointments(self):
+        appointment_data = appointment_repository.AppointmentRepository.get_appointment_ids_and_timestamps() or []
+        if appointment_data != self.last_appointment_data:
+            self.last_appointment_data = appointment_data
+            self.appointment_data.emit(appointment_data)
+
 
 
 
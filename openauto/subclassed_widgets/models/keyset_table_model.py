@@ -0,0 +1,216 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from typing import Callable
+from PyQt6 import QtCore
+
+from openauto.services.search_index import normalize
+
+
+def _collate(value):
+    # Python stand-in for the MySQL ORDER BY: NULLs first, strings case and accent folded (utf8mb4_0900_ai_ci)
+    if value is None:
+        return (0, "")
+    if isinstance(value, str):
+        return (1, normalize(value))
+    return (1, value)
+
+
+### Read-only table model over a large MySQL table, paged in with keyset pagination ###
+    # Rows live in one sorted list of the tuples the repository returned (no per-cell objects), with a parallel
+    # list of sort keys for bisect. canFetchMore/fetchMore pull the next page after the last loaded cursor,
+    # so startup cost and memory depend on what has been scrolled into view, not on the size of the table.
+    # fetch_page(after, limit, search) must return rows ordered by cursor_columns, strictly after `after`.
+    # fetch_keys(keys) returns the rows for the given keys; it backs show_keys (search index results).
+class KeysetTableModel(QtCore.QAbstractTableModel):
+    def __init__(self, headers, fetch_page: Callable, *, key_column: int, cursor_columns: tuple[int, ...],
+                 fetch_keys: Callable | None = None, page_size: int = 200, parent=None):
+        super().__init__(parent)
+        self._headers = tuple(headers)
+        self._fetch_page = fetch_page
+        self._fetch_keys = fetch_keys
+        self._key_column = key_column
+        self._cursor_columns = cursor_columns
+        self.page_size = page_size
+
+        self._rows: list[tuple] = []
+        self._sort_keys: list[tuple] = []
+        self._by_key: dict = {}
+        self._exhausted = False
+        self._search = ""
+        self._matcher: Callable | None = None
+
+    # ---------- paging ----------
+    def _cursor(self, row) -> tuple:
+        return tuple(row[c] for c in self._cursor_columns)
+
+    def _sort_key(self, row) -> tuple:
+        return tuple(_collate(v) for v in self._cursor(row))
+
+    def _load_page(self, after):
+        rows = list(self._fetch_page(after, self.page_size, self._search) or [])
+        if len(rows) < self.page_size:
+            self._exhausted = True
+        return rows
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QtCore.QModelIndex()) -> None:
+        if parent.isValid() or self._exhausted:
+            return
+        after = self._cursor(self._rows[-1]) if self._rows else None
+        rows = [r for r in self._load_page(after) if r[self._key_column] not in self._by_key]
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+        for r in rows:
+            sk = self._sort_key(r)
+            self._rows.append(tuple(r))
+            self._sort_keys.append(sk)
+            self._by_key[r[self._key_column]] = sk
+        self.endInsertRows()
+
+    ### DROP EVERYTHING AND LOAD THE FIRST PAGE (OPTIONALLY FOR A NEW SEARCH) ###
+    def reload(self, search: str | None = None) -> None:
+        if search is not None:
+            self._search = search.strip()
+        self.beginResetModel()
+        self._rows, self._sort_keys, self._by_key = [], [], {}
+        self._exhausted = False
+        self._matcher = None
+        self.endResetModel()
+        self.fetchMore()
+
+    def set_search(self, text: str) -> None:
+        if (text or "").strip() != self._search or self._matcher is not None:
+            self.reload(text or "")
+
+    ### SHOW EXACTLY THE ROWS FOR keys (ALREADY MATCHED ELSEWHERE); matcher(row) VETS ROWS THAT CHANGE LATER ###
+    def show_keys(self, keys, matcher: Callable) -> None:
+        rows = list(self._fetch_keys(list(keys)) or []) if keys else []
+        rows.sort(key=self._sort_key)
+        self.beginResetModel()
+        self._rows = [tuple(r) for r in rows]
+        self._sort_keys = [self._sort_key(r) for r in self._rows]
+        self._by_key = {r[self._key_column]: sk for r, sk in zip(self._rows, self._sort_keys)}
+        self._exhausted = True
+        self._search = ""
+        self._matcher = matcher
+        self.endResetModel()
+
+    ### RE-READ THE LOADED WINDOW IN ONE QUERY AND APPLY IT AS A DIFF (FULL POLLING FALLBACK) ###
+    def refresh(self) -> None:
+        if self._matcher is not None:
+            keys = list(self._by_key)
+            fresh = list(self._fetch_keys(keys) or []) if keys else []
+            found = {r[self._key_column] for r in fresh}
+            self.remove_keys([k for k in keys if k not in found])
+            self.upsert_rows(fresh)
+            return
+        loaded = max(len(self._rows), self.page_size)
+        fresh = list(self._fetch_page(None, loaded, self._search) or [])
+        keep = {r[self._key_column] for r in fresh}
+        self.remove_keys([k for k in self._by_key if k not in keep])
+        if len(fresh) < loaded:
+            self._exhausted = True
+        self.upsert_rows(fresh)
+
+    # ---------- row level changes ----------
+    def _position(self, sk) -> int:
+        return bisect_left(self._sort_keys, sk)
+
+    ### WHERE THE ROW FOR key SITS NOW, -1 IF NOT LOADED ###
+        # Bisect on its sort key, then confirm by key: rows with equal keys sit side by side, and the collation
+        # stand-in can still disagree with MySQL's order (punctuation weights), so fall back to a scan.
+    def _locate(self, key) -> int:
+        sk = self._by_key.get(key)
+        if sk is None:
+            return -1
+        lo, hi = self._position(sk), bisect_right(self._sort_keys, sk)
+        for pos in range(lo, hi):
+            if self._rows[pos][self._key_column] == key:
+                return pos
+        return next((pos for pos, r in enumerate(self._rows) if r[self._key_column] == key), -1)
+
+    def _in_window(self, sk) -> bool:
+        # rows past the last loaded cursor arrive through fetchMore instead
+        return self._exhausted or (bool(self._sort_keys) and sk <= self._sort_keys[-1])
+
+    def _matches(self, row) -> bool:
+        if self._matcher is not None:
+            return self._matcher(row)
+        if not self._search:
+            return True
+        needle = self._search.lower()
+        return any(needle in str(v).lower() for v in row[:len(self._headers)])
+
+    def upsert_rows(self, rows) -> None:
+        for row in rows or []:
+            row = tuple(row)
+            key = row[self._key_column]
+            sk = self._sort_key(row)
+            old = self._by_key.get(key)
+            pos = self._locate(key)
+            if pos >= 0:
+                if old == sk and self._matches(row):
+                    self._rows[pos] = row
+                    self.dataChanged.emit(self.index(pos, 0), self.index(pos, self.columnCount() - 1))
+                    continue
+                self._remove_at(pos)
+            if not self._matches(row) or not self._in_window(sk):
+                continue
+            pos = self._position(sk)
+            self.beginInsertRows(QtCore.QModelIndex(), pos, pos)
+            self._rows.insert(pos, row)
+            self._sort_keys.insert(pos, sk)
+            self._by_key[key] = sk
+            self.endInsertRows()
+
+    def remove_keys(self, keys) -> None:
+        for key in keys or []:
+            if key not in self._by_key:
+                # SQLMonitor ids arrive as ints, the key column may hold them as something else
+                key = next((k for k in self._by_key if str(k) == str(key)), None)
+            pos = self._locate(key) if key is not None else -1
+            if pos >= 0:
+                self._remove_at(pos)
+
+    def remove_where(self, column: int, values) -> None:
+        wanted = {str(v) for v in values or []}
+        doomed = [r[self._key_column] for r in self._rows if str(r[column]) in wanted]
+        self.remove_keys(doomed)
+
+    def _remove_at(self, pos: int) -> None:
+        self.beginRemoveRows(QtCore.QModelIndex(), pos, pos)
+        row = self._rows.pop(pos)
+        self._sort_keys.pop(pos)
+        self._by_key.pop(row[self._key_column], None)
+        self.endRemoveRows()
+
+    # ---------- accessors ----------
+    def row_values(self, row: int) -> list[str]:
+        if not (0 <= row < len(self._rows)):
+            return []
+        return [str(v) for v in self._rows[row][:len(self._headers)]]
+
+    # ---------- QAbstractTableModel ----------
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return str(self._rows[index.row()][index.column()])
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            return int(QtCore.Qt.AlignmentFlag.AlignCenter)
+        return None
+
+    def headerData(self, section: int, orientation, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if role == QtCore.Qt.ItemDataRole.DisplayRole and orientation == QtCore.Qt.Orientation.Horizontal:
+            return self._headers[section] if 0 <= section < len(self._headers) else None
+        return None
@@ -11,25 +11,87 @@ from openauto.subclassed_widgets.roles.tree_roles import (
 
 
 
+# local to the parts tree, after every shared column it shows
+PT_COL_ASSIGNED = max(COL_SELL, COL_SUPPLIER, COL_ORDER_PLATFORM, COL_STATUS) + 1
+PT_NUM_COLUMNS = PT_COL_ASSIGNED + 1
+
+# PTNode field behind each column; qty is int | None, unit_cost / sell float | None
+_COLUMN_FIELDS = {
+    COL_TYPE: "type_text", COL_SUPPLIER: "supplier", COL_SKU: "sku", COL_DESC: "desc", COL_QTY: "qty",
+    COL_UNIT_COST: "unit_cost", COL_SELL: "sell", COL_ORDER_PLATFORM: "platform", COL_STATUS: "status",
+}
+# item rows only hold parts; they share one empty tuple instead of a list each
+_NO_CHILDREN = ()
+
+# display bucket (meta "__norm_kind__") → TYPE_COLOR key
+_COLOR_KEYS = {
+    "part": "part",
+    "tire": "tire",
+    "oils & chemicals": "part",
+    "core": "core",
+    "fee": "fee",
+    "status": "part"
+}
+
+
+def _typed(col: int, value: Any):
+    if value is None or value == "":
+        return None
+    try:
+        if col == COL_QTY:
+            return int(value)
+        if col in (COL_UNIT_COST, COL_SELL):
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
 # Data Node
+    # One slot per shown column instead of a mostly empty column list; display texts are built once per
+    # change and dropped by set / invalidate (assigned job names live in meta).
 class PTNode:
-    __slots__ = ("parent", "children", "kind", "columns", "meta")
+    __slots__ = ("parent", "children", "kind", "type_text", "supplier", "sku", "desc", "qty", "unit_cost", "sell",
+                 "platform", "status", "meta", "_display")
 
     def __init__(self, kind: str, columns: list[Any], parent: 'PTNode | None' = None, meta: dict | None = None):
         self.parent: PTNode | None = parent
-        self.children: list[PTNode] = []
+        self.children = [] if kind in ("category", "root") else _NO_CHILDREN
         self.kind: str = kind  # 'category' | 'item'
-        self.columns: list[Any] = columns  # fixed length = NUM_COLUMNS
+        for col, name in _COLUMN_FIELDS.items():
+            setattr(self, name, _typed(col, columns[col] if col < len(columns) else None))
         self.meta: dict[str, Any] = (meta or {})
+        self._display: list[str] | None = None
 
     def row_in_parent(self) -> int:
         return self.parent.children.index(self) if self.parent else 0
 
     def get(self, col: int):
-        return self.columns[col]
+        name = _COLUMN_FIELDS.get(col)
+        return getattr(self, name) if name else None
 
     def set(self, col: int, value: Any):
-        self.columns[col] = value
+        name = _COLUMN_FIELDS.get(col)
+        if name:
+            setattr(self, name, _typed(col, value))
+            self._display = None
+
+    def invalidate(self):
+        self._display = None
+
+    def display(self, col: int) -> str:
+        texts = self._display
+        if texts is None:
+            texts = self._display = [self._format(c) for c in range(PT_NUM_COLUMNS)]
+        return texts[col] if 0 <= col < len(texts) else ""
+
+    def _format(self, col: int) -> str:
+        if col == PT_COL_ASSIGNED:
+            return (self.meta or {}).get("assignedJobName") or "" if self.is_item() else ""
+        value = self.get(col)
+        if col in (COL_UNIT_COST, COL_SELL):
+            return f"{value:.2f}" if value is not None else ""
+        return "" if value is None else str(value)
 
     def is_category(self) -> bool: return self.kind == "category"
     def is_item(self) -> bool: return self.kind == "item"
@@ -42,8 +104,8 @@ class PartsTreeModel(QtCore.QAbstractItemModel):
 
     def __init__(self, parent: QtCore.QObject | None = None):
         super().__init__(parent)
-        self.COL_ASSIGNED = max(COL_SELL, COL_SUPPLIER, COL_ORDER_PLATFORM, COL_STATUS) + 1
-        self._pt_num_columns = self.COL_ASSIGNED + 1
+        self.COL_ASSIGNED = PT_COL_ASSIGNED
+        self._pt_num_columns = PT_NUM_COLUMNS
         self._root = PTNode("root", [None] * self._pt_num_columns, None)
         self.group_per_item = True
         # local headers, keeps global HEADER_TITLES intact for RO
@@ -325,13 +387,12 @@ class PartsTreeModel(QtCore.QAbstractItemModel):
             return node.kind
 
 
-        if role in (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole):
-            val = node.get(index.column())
-            if role == QtCore.Qt.ItemDataRole.DisplayRole and index.column() in (COL_UNIT_COST, COL_SELL):
-                return f"{(val or 0.0):.2f}" if val is not None else ""
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return node.display(index.column())
+        if role == QtCore.Qt.ItemDataRole.EditRole:
             if index.column() == self.COL_ASSIGNED and node.is_item():
                 return (node.meta or {}).get("assignedJobName") or ""
-            return val
+            return node.get(index.column())
 
         if role == QtCore.Qt.ItemDataRole.ForegroundRole and index.column() in (COL_TYPE, COL_DESC):
             if node.is_category():
@@ -339,16 +400,7 @@ class PartsTreeModel(QtCore.QAbstractItemModel):
                 return _qcolor("#555555")
             # child item rows
             norm = (node.meta.get("__norm_kind__") or "").strip().lower()
-            # map display bucket → TYPE_COLOR key
-            key_map = {
-                "part": "part",
-                "tire": "tire",
-                "oils & chemicals": "part",
-                "core": "core",
-                "fee": "fee",
-                "status": "part"
-            }
-            color_key = key_map.get(norm, "part")
+            color_key = _COLOR_KEYS.get(norm, "part")
             return _qcolor(TYPE_COLOR.get(color_key))
 
         if role == QtCore.Qt.ItemDataRole.ForegroundRole and index.column() == COL_STATUS:
@@ -482,6 +534,7 @@ class PartsTreeModel(QtCore.QAbstractItemModel):
                 meta = child.meta or {}
                 if str(meta.get("orderItemId") or meta.get("id") or "") == str(order_item_id):
                     meta["assignedJobName"] = job_name or ""
+                    child.invalidate()
                     left = self.index(row, self.COL_ASSIGNED, parent_idx)
                     self.dataChanged.emit(left, left, [QtCore.Qt.ItemDataRole.DisplayRole])
                     updated = True
@@ -0,0 +1,136 @@
+from __future__ import annotations
+from PyQt6 import QtCore
+
+
+RO_ROW_ROLE = QtCore.Qt.ItemDataRole.UserRole + 1
+RO_ID_ROLE = QtCore.Qt.ItemDataRole.UserRole + 2
+
+
+def _sort_key(row: dict) -> str:
+    return str(row.get("ro_number") or "")
+
+
+### ONE RO BOARD LANE AS A LIST MODEL OF RepairOrdersRepository.board_snapshot ROWS, KEYED BY ro_id ###
+    # Rows stay in ro_number order. apply_rows reconciles a fresh lane snapshot with insert/move/remove/dataChanged,
+    # so the view keeps its scroll position and only repaints what changed.
+class ROBoardModel(QtCore.QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list[dict] = []
+
+    def _position(self, ro_id) -> int:
+        for i, row in enumerate(self._rows):
+            if row["ro_id"] == ro_id:
+                return i
+        return -1
+
+    def ro_ids(self) -> list[int]:
+        return [row["ro_id"] for row in self._rows]
+
+    def row_for(self, ro_id) -> dict | None:
+        pos = self._position(ro_id)
+        return self._rows[pos] if pos >= 0 else None
+
+    # (ro_number, ro_id) of the last row: the keyset cursor for the lane's next page
+    def last_key(self):
+        if not self._rows:
+            return None
+        return self._rows[-1].get("ro_number"), self._rows[-1]["ro_id"]
+
+    ### NEXT PAGE OF THE LANE: ROWS GO ON THE END, ANY ALREADY SHOWN ARE SKIPPED ###
+    def append_rows(self, rows) -> None:
+        present = set(self.ro_ids())
+        rows = [dict(r) for r in rows or [] if r["ro_id"] not in present]
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    ### RECONCILE WITH A FULL LANE SNAPSHOT (ALREADY IN ro_number ORDER) ###
+    def apply_rows(self, rows) -> None:
+        rows = [dict(r) for r in rows or []]
+        wanted = {r["ro_id"] for r in rows}
+        for i in range(len(self._rows) - 1, -1, -1):
+            if self._rows[i]["ro_id"] not in wanted:
+                self.beginRemoveRows(QtCore.QModelIndex(), i, i)
+                self._rows.pop(i)
+                self.endRemoveRows()
+
+        present = {r["ro_id"] for r in self._rows}
+        for i, row in enumerate(rows):
+            if i < len(self._rows) and self._rows[i]["ro_id"] == row["ro_id"]:
+                self._replace(i, row)
+                continue
+            # only a moved RO needs a scan; new ones are inserted straight away
+            j = next(k for k in range(i, len(self._rows)) if self._rows[k]["ro_id"] == row["ro_id"]) \
+                if row["ro_id"] in present else -1
+            if j > i:
+                self.beginMoveRows(QtCore.QModelIndex(), j, j, QtCore.QModelIndex(), i)
+                self._rows.insert(i, self._rows.pop(j))
+                self.endMoveRows()
+                self._replace(i, row)
+            else:
+                self.beginInsertRows(QtCore.QModelIndex(), i, i)
+                self._rows.insert(i, row)
+                self.endInsertRows()
+
+    ### ONE RO CHANGED: UPDATE IN PLACE, OR PUT IT AT ITS SORTED POSITION ###
+    def upsert_row(self, row: dict) -> None:
+        row = dict(row)
+        pos = self._position(row["ro_id"])
+        if pos >= 0 and _sort_key(self._rows[pos]) == _sort_key(row):
+            self._replace(pos, row)
+            return
+        if pos >= 0:
+            self.remove_ro(row["ro_id"])
+        key = _sort_key(row)
+        at = next((i for i, r in enumerate(self._rows) if _sort_key(r) > key), len(self._rows))
+        self.beginInsertRows(QtCore.QModelIndex(), at, at)
+        self._rows.insert(at, row)
+        self.endInsertRows()
+
+    def remove_ro(self, ro_id) -> None:
+        pos = self._position(ro_id)
+        if pos >= 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), pos, pos)
+            self._rows.pop(pos)
+            self.endRemoveRows()
+
+    ### QUICK FIELD UPDATE (ro_tiles.update_all_tiles), e.g. total AFTER A SAVE ###
+    def update_fields(self, ro_id, **fields) -> None:
+        pos = self._position(ro_id)
+        if pos >= 0 and fields:
+            merged = dict(self._rows[pos])
+            merged.update(fields)
+            self._replace(pos, merged)
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._rows = []
+        self.endResetModel()
+
+    def _replace(self, pos: int, row: dict) -> None:
+        if self._rows[pos] != row:
+            self._rows[pos] = row
+            idx = self.index(pos, 0)
+            self.dataChanged.emit(idx, idx)
+
+    # ---------- QAbstractListModel ----------
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not (0 <= index.row() < len(self._rows)):
+            return None
+        row = self._rows[index.row()]
+        if role == RO_ROW_ROLE:
+            return row
+        if role == RO_ID_ROLE:
+            return row["ro_id"]
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return f"RO #{row.get('ro_number')}"
+        if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            return row.get("concern") or None
+        return None
@@ -1,7 +1,8 @@
 from __future__ import annotations
-from decimal import Decimal, ROUND_HALF_UP
+from dataclasses import dataclass, field
 from PyQt6 import QtCore
-from openauto.repositories.settings_repository import SettingsRepository
+from openauto.services.pricing_matrix import pricing_matrix
+from openauto.utils.money import Money, line_amounts
 
 from openauto.subclassed_widgets.roles.tree_roles import (
     COL_TYPE, COL_SKU, COL_DESC, COL_QTY, COL_UNIT_COST, COL_SELL, COL_HOURS, COL_RATE, COL_TAX, COL_TOTAL,
@@ -17,8 +18,8 @@ _STRIP_STATUS_RE = re.compile(r"\s*[–—-]\s*(Approved|Declined)\s*$", re.IGNO
 
 NONE = QtCore.Qt.ItemFlag(0)
 
-def _q2(x: Decimal) -> Decimal:
-    return x.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+# edits to these change line totals, so the estimate and job totals are rewritten on the next save
+_AMOUNT_COLUMNS = frozenset((COL_QTY, COL_UNIT_COST, COL_SELL, COL_HOURS, COL_RATE, COL_TAX))
 
 def _strip_status_suffix(text: str | None) -> str:
     if not text:
@@ -27,30 +28,109 @@ def _strip_status_suffix(text: str | None) -> str:
 
 
 
+# ItemNode field behind each column; the numeric ones hold float | None
+_COLUMN_FIELDS = {
+    COL_TYPE: "type_text", COL_SKU: "sku", COL_DESC: "desc", COL_QTY: "qty", COL_UNIT_COST: "unit_cost",
+    COL_SELL: "sell", COL_HOURS: "hours", COL_RATE: "rate", COL_TAX: "tax", COL_TOTAL: "total",
+}
+_NUMERIC_COLUMNS = frozenset((COL_QTY, COL_UNIT_COST, COL_SELL, COL_HOURS, COL_RATE, COL_TAX, COL_TOTAL))
+_MONEY_COLUMNS = frozenset((COL_UNIT_COST, COL_SELL, COL_RATE, COL_TOTAL))
+# ItemNode field behind each per-row role
+_ROLE_FIELDS = {
+    JOB_ID_ROLE: "job_id", JOB_NAME_ROLE: "job_name", ITEM_ID_ROLE: "item_id",
+    LINE_ORDER_ROLE: "line_order", APPROVED_ROLE: "approved", DECLINED_ROLE: "declined",
+}
+# lines never have children; they share one empty tuple instead of a list each
+_NO_CHILDREN = ()
+
+
+def _to_float(v):
+    if v is None or v == "":
+        return None
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+# qty / hours / tax without trailing zeros ("2", "1.5", "7.25")
+def _trim(v: float, places: int) -> str:
+    return f"{v:.{places}f}".rstrip("0").rstrip(".")
+
+
 ### Generic tree node for jobs and line items.
 ### For jobs: kind='job' carries job_id/name, Children are line items + one SUBTOTAL row.
 ### For lines: kind in {'part', 'labor', 'tire', 'fee', 'sublet', 'subtotal'}
+    # One slot per column and per role instead of a column list and a role dict, so a line is a single
+    # object. get/set/role/set_role keep the column and role numbers the model works in; display texts are
+    # built once per change (display) and dropped by set / set_role.
 class ItemNode:
-    __slots__ = ("parent", "children", "kind", "columns", "data_roles")
+    __slots__ = ("parent", "children", "kind", "type_text", "sku", "desc", "qty", "unit_cost", "sell", "hours",
+                 "rate", "tax", "total", "job_id", "job_name", "item_id", "line_order", "approved", "declined",
+                 "amounts", "_display")
 
     def __init__(self, kind: str, columns: list, parent: ItemNode | None = None):
         self.parent: ItemNode | None = parent
-        self.children: list[ItemNode] = []
+        self.children = [] if kind in ("job", "root") else _NO_CHILDREN
         self.kind: str = kind
-        # columns is a fixed-length list of length NUM_COLUMNS
-        self.columns: list = columns
-        # extra per-row metadata for roles like ids and booleans
-        self.data_roles: dict[int, object] = {}
+        for col, name in _COLUMN_FIELDS.items():
+            value = columns[col] if col < len(columns) else None
+            setattr(self, name, _to_float(value) if col in _NUMERIC_COLUMNS else value)
+        self.job_id = self.job_name = self.item_id = self.line_order = None
+        self.approved = self.declined = None
+        # lines: (kind, base, tax, total) in cents as last computed; jobs: Totals over their lines
+        self.amounts = None
+        self._display: list | None = None
 
     def row_in_parent(self) -> int:
         return self.parent.children.index(self) if self.parent else 0
 
     # convenience getters/setters
     def get(self, col: int):
-        return self.columns[col]
+        name = _COLUMN_FIELDS.get(col)
+        return getattr(self, name) if name else None
 
     def set(self, col: int, value):
-        self.columns[col] = value
+        name = _COLUMN_FIELDS.get(col)
+        if name:
+            setattr(self, name, _to_float(value) if col in _NUMERIC_COLUMNS else value)
+            self._display = None
+
+    def role(self, role: int, default=None):
+        name = _ROLE_FIELDS.get(role)
+        value = getattr(self, name) if name else None
+        return default if value is None else value
+
+    def set_role(self, role: int, value):
+        name = _ROLE_FIELDS.get(role)
+        if name:
+            setattr(self, name, value)
+            self._display = None
+
+    ### DisplayRole TEXT OF col, FORMATTED ON THE FIRST PAINT AFTER A CHANGE ###
+    def display(self, col: int) -> str:
+        texts = self._display
+        if texts is None:
+            texts = self._display = [self._format(c) for c in range(RO_NUM_COLUMNS)]
+        return texts[col] if 0 <= col < len(texts) else ""
+
+    def _format(self, col: int) -> str:
+        if self.kind == "job" and col == COL_TYPE:
+            base = self.job_name or _strip_status_suffix(self.type_text or "New Job")
+            if self.approved:
+                return f"{base} - Approved"
+            if self.declined:
+                return f"{base} - Declined"
+            return base
+        value = self.get(col)
+        if value is None:
+            return ""
+        if col in _MONEY_COLUMNS:
+            return f"{value:.2f}"
+        if col in (COL_QTY, COL_HOURS):
+            return _trim(value, 3)
+        if col == COL_TAX:
+            return _trim(value, 2)
+        return str(value)
 
     def is_job(self):
         return self.kind == 'job'
@@ -58,6 +138,87 @@ class ItemNode:
     def is_subtotal(self):
         return self.kind == 'subtotal'
 
+
+# line kinds with a total of their own in the RO hub (TotalsController)
+TOTAL_KINDS = ("part", "labor", "tire", "fee", "sublet")
+
+
+### RUNNING SUMS FOR ONE JOB OR THE WHOLE ESTIMATE, KEPT BY ROTreeModel AS LINES CHANGE ###
+    # All in integer cents (utils.money.line_amounts). base is the pre-tax amount (qty x sell, hours x rate),
+    # total the sum of the tax-inclusive line totals and tax the difference. Adding or taking away one line is
+    # a handful of int additions; money() wraps a field for display.
+class Totals:
+    __slots__ = ("by_kind", "base", "tax", "total")
+
+    def __init__(self):
+        self.by_kind = dict.fromkeys(TOTAL_KINDS, 0)
+        self.base = 0
+        self.tax = 0
+        self.total = 0
+
+    def money(self, name: str) -> Money:
+        return Money(self.by_kind[name] if name in self.by_kind else getattr(self, name))
+
+    def add_line(self, amounts: tuple, sign: int = 1):
+        kind, base, tax, total = amounts
+        if sign < 0:
+            base, tax, total = -base, -tax, -total
+        if kind in self.by_kind:
+            self.by_kind[kind] += base
+        self.base += base
+        self.tax += tax
+        self.total += total
+
+    def add(self, other: Totals, sign: int = 1):
+        for kind, base in other.by_kind.items():
+            self.by_kind[kind] += base if sign > 0 else -base
+        self.base += other.base if sign > 0 else -other.base
+        self.tax += other.tax if sign > 0 else -other.tax
+        self.total += other.total if sign > 0 else -other.total
+
+
+### WHAT CHANGED IN AN ROTreeModel SINCE ITS LAST SAVE (ROTreeModel.take_changes) ###
+    # items are shaped like ROTreeView.to_legacy_items plus "node", "job_node", "job_id", "job_order" and
+    # "line_order"; jobs are the new or renamed headers. Nodes only serve as keys to hand new ids back through
+    # ROTreeModel.commit_changes, so the rest is plain data.
+@dataclass
+class ROChangeSet:
+    estimate_id: int
+    items: list[dict] = field(default_factory=list)
+    jobs: list[dict] = field(default_factory=list)
+    reordered: list[tuple] = field(default_factory=list)    # (job_node, job_id, [(line_node, item_id), ...])
+    job_order: list[tuple] | None = None                    # [(job_node, job_id), ...] when jobs came or went
+    deleted_item_ids: list[int] = field(default_factory=list)
+    deleted_job_ids: list[int] = field(default_factory=list)
+    totals_changed: bool = False
+    total: Money = field(default_factory=Money)
+
+    def is_empty(self) -> bool:
+        return not (self.items or self.jobs or self.reordered or self.job_order is not None
+                    or self.deleted_item_ids or self.deleted_job_ids or self.totals_changed)
+
+    ### THIS SET FOLLOWED BY newer, AS ONE: newer's RECORD OF A NODE WINS, DELETIONS DROP EARLIER WRITES ###
+    def merged(self, newer: ROChangeSet) -> ROChangeSet:
+        deleted_items = set(self.deleted_item_ids) | set(newer.deleted_item_ids)
+        deleted_jobs = set(self.deleted_job_ids) | set(newer.deleted_job_ids)
+        items = {it["node"]: it for it in self.items}
+        items.update((it["node"], it) for it in newer.items)
+        jobs = {j["node"]: j for j in self.jobs}
+        jobs.update((j["node"], j) for j in newer.jobs)
+        reordered = {r[0]: r for r in self.reordered}
+        reordered.update((r[0], r) for r in newer.reordered)
+        return ROChangeSet(
+            estimate_id=newer.estimate_id,
+            items=[it for it in items.values() if it.get("id") is None or it["id"] not in deleted_items],
+            jobs=[j for j in jobs.values() if j.get("job_id") is None or j["job_id"] not in deleted_jobs],
+            reordered=[r for r in reordered.values() if r[1] is None or r[1] not in deleted_jobs],
+            job_order=newer.job_order if newer.job_order is not None else self.job_order,
+            deleted_item_ids=sorted(deleted_items),
+            deleted_job_ids=sorted(deleted_jobs),
+            totals_changed=self.totals_changed or newer.totals_changed,
+            total=newer.total,
+        )
+
 ### Model for Repair Order Tree
 ### Responsibilities:
     # Holds jobs "top-level" and their line items as children
@@ -72,35 +233,20 @@ class ROTreeModel(QtCore.QAbstractItemModel):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._root = ItemNode('root', [None] * RO_NUM_COLUMNS, None)
-        self._pricing_matrix = self._load_pricing_matrix()
-
-
-    def _load_pricing_matrix(self):
-        rows = SettingsRepository.load_matrix_table() or []
-        matrix = []
-        for min_cost, max_cost, multiplier, percent_return in rows:
-            try:
-                min_v = float(min_cost) if min_cost is not None else 0.0
-                max_v = float(max_cost) if max_cost is not None else float("inf")
-                mult  = float(multiplier) if multiplier is not None else 1.0
-            except Exception:
-                continue
-            matrix.append({"min": min_v, "max": max_v, "mult": mult})
-        matrix.sort(key=lambda r: r["min"])
-        return matrix
+        self._reset_journal()
+        self._reset_totals()
+
 
+    # sell price for a part/tire cost from the shared PricingMatrix (no DB read per model)
     def _matrix_price_for_cost(self, cost: float | None) -> float | None:
-        if cost is None:
-            return None
-        for r in self._pricing_matrix:
-            if r["min"] <= cost <= r["max"]:
-                return round(cost * r["mult"], 2)
-        return None
+        return pricing_matrix().price_for(cost)
 
     # Public API (called by controllers/managers)
     def clear(self):
         self.beginResetModel()
         self._root = ItemNode('root', [None] * RO_NUM_COLUMNS, None)
+        self._reset_journal()
+        self._reset_totals()
         self.endResetModel()
 
     def add_job(self, name: str, job_id: int | None = None) -> QtCore.QModelIndex:
@@ -111,12 +257,16 @@ class ROTreeModel(QtCore.QAbstractItemModel):
         cols[COL_TYPE] = _strip_status_suffix(name or "New Job")
         job = ItemNode('job', cols, self._root)
         if job_id is not None:
-            job.data_roles[JOB_ID_ROLE] = job_id
-        job.data_roles[JOB_NAME_ROLE] = name
-        job.data_roles[APPROVED_ROLE] = False  # default
+            job.set_role(JOB_ID_ROLE, job_id)
+        job.set_role(JOB_NAME_ROLE, name)
+        job.set_role(APPROVED_ROLE, False)  # default
+        job.amounts = Totals()
         self._root.children.append(job)
         self.endInsertRows()
         self._ensure_job_subtotal(job)
+        if self._tracking:
+            self._dirty_jobs.add(job)
+            self._jobs_moved = True
         return self.index(job.row_in_parent(), COL_TYPE, QtCore.QModelIndex())
 
 
@@ -155,11 +305,14 @@ class ROTreeModel(QtCore.QAbstractItemModel):
 
         node = ItemNode(canonical, row, job_node)
         if item_id is not None:
-            node.data_roles[ITEM_ID_ROLE] = item_id
+            node.set_role(ITEM_ID_ROLE, item_id)
         if line_order is not None:
-            node.data_roles[LINE_ORDER_ROLE] = line_order
+            node.set_role(LINE_ORDER_ROLE, line_order)
         job_node.children.insert(insert_row, node)
         self.endInsertRows()
+        if self._tracking:
+            self._dirty_lines.add(node)
+            self._totals_stale = True
         self._recompute_line_total(node)
         self._recompute_job_subtotal(job_node)
         self.totalsChanged.emit()
@@ -179,7 +332,9 @@ class ROTreeModel(QtCore.QAbstractItemModel):
         self.beginRemoveRows(self.parent(index), row, row)
         parent.children.pop(row)
         self.endRemoveRows()
+        self._journal_removed(node)
         if parent.is_job():
+            self._account(parent, self._counted(node), -1)
             self._recompute_job_subtotal(parent)
         self.totalsChanged.emit()
 
@@ -200,6 +355,11 @@ class ROTreeModel(QtCore.QAbstractItemModel):
         self.beginRemoveRows(QtCore.QModelIndex(), row, row)
         self._root.children.pop(row)
         self.endRemoveRows()
+        self._journal_removed(node)
+        job_totals = self._job_totals(node)
+        self._totals_all.add(job_totals, -1)
+        if not node.role(DECLINED_ROLE):
+            self._totals.add(job_totals, -1)
         self.totalsChanged.emit()
 
 # Return a list[dict] where each dict is a job with its lines, ready for DB service
@@ -209,16 +369,16 @@ class ROTreeModel(QtCore.QAbstractItemModel):
             if not job.is_job():
                 continue
             job_bundle = {
-                "job_id": job.data_roles.get(JOB_ID_ROLE),
-                "job_name": (job.data_roles.get(JOB_NAME_ROLE) or job.get(COL_TYPE)),
-                "approved": bool(job.data_roles.get(APPROVED_ROLE, False)),
+                "job_id": job.role(JOB_ID_ROLE),
+                "job_name": (job.role(JOB_NAME_ROLE) or job.get(COL_TYPE)),
+                "approved": bool(job.role(APPROVED_ROLE, False)),
                 "lines": []
             }
             for ch in job.children:
                 if ch.is_subtotal():
                     continue
                 job_bundle["lines"].append({
-                    "item_id": ch.data_roles.get(ITEM_ID_ROLE),
+                    "item_id": ch.role(ITEM_ID_ROLE),
                     "kind": ch.kind,
                     "description": ch.get(COL_DESC),
                     "qty": ch.get(COL_QTY),
@@ -232,6 +392,175 @@ class ROTreeModel(QtCore.QAbstractItemModel):
             out.append(job_bundle)
         return out
 
+    # -------------------- Change journal --------------------
+    # Recording starts when the loader calls mark_clean(estimate_id): edits, inserts, deletes, renames and drops
+    # are noted per node, so SaveEstimateService can write just those. After clear() (and before the first
+    # mark_clean) nothing is recorded and take_changes() returns None, meaning "save the whole estimate".
+    def _reset_journal(self, estimate_id: int | None = None, tracking: bool = False):
+        self._tracking = tracking
+        self._journal_estimate_id = estimate_id
+        self._dirty_lines: set[ItemNode] = set()
+        self._dirty_jobs: set[ItemNode] = set()        # new or renamed headers
+        self._reordered_jobs: set[ItemNode] = set()    # line order the DB hasn't seen (drag and drop)
+        self._deleted_item_ids: set[int] = set()
+        self._deleted_job_ids: set[int] = set()
+        self._jobs_moved = False                       # a job was added or removed: job_order is renumbered
+        self._totals_stale = False
+
+    def _journal_edit(self, node: ItemNode, col: int):
+        if not self._tracking:
+            return
+        if node.is_job():
+            if col == COL_TYPE:
+                self._dirty_jobs.add(node)
+        elif not node.is_subtotal():
+            self._dirty_lines.add(node)
+            if col in _AMOUNT_COLUMNS:
+                self._totals_stale = True
+
+    def _journal_removed(self, node: ItemNode):
+        if not self._tracking:
+            return
+        lines = [ch for ch in node.children if not ch.is_subtotal()] if node.is_job() else [node]
+        for line in lines:
+            self._dirty_lines.discard(line)
+            item_id = line.role(ITEM_ID_ROLE)
+            if item_id is not None:
+                self._deleted_item_ids.add(int(item_id))
+        if node.is_job():
+            self._dirty_jobs.discard(node)
+            self._reordered_jobs.discard(node)
+            job_id = node.role(JOB_ID_ROLE)
+            if job_id is not None:
+                self._deleted_job_ids.add(int(job_id))
+            self._jobs_moved = True
+        self._totals_stale = True
+
+    def _line_nodes(self):
+        for job in self._root.children:
+            for ch in job.children:
+                if not ch.is_subtotal():
+                    yield ch
+
+    def _attached(self, node: ItemNode) -> bool:
+        while node.parent is not None:
+            if node not in node.parent.children:
+                return False
+            node = node.parent
+        return node is self._root
+
+    @staticmethod
+    def _job_name(job: ItemNode) -> str:
+        return _strip_status_suffix(job.role(JOB_NAME_ROLE) or job.get(COL_TYPE)) or "New Job"
+
+    # one line in the ROTreeView.to_legacy_items shape: labor is flattened to qty=hours, unit_price=rate
+    def _line_record(self, node: ItemNode, job: ItemNode, job_order: int) -> dict:
+        if node.kind == "labor":
+            qty, price, cost = float(node.get(COL_HOURS) or 0), float(node.get(COL_RATE) or 0), 0.0
+        else:
+            qty, price, cost = float(node.get(COL_QTY) or 0), float(node.get(COL_SELL) or 0), float(node.get(COL_UNIT_COST) or 0)
+        return {
+            "node": node,
+            "id": node.role(ITEM_ID_ROLE),
+            "kind": node.kind,
+            "job_node": job,
+            "job_id": job.role(JOB_ID_ROLE),
+            "job_name": self._job_name(job),
+            "job_order": job_order,
+            "line_order": node.role(LINE_ORDER_ROLE),
+            "description": node.get(COL_DESC) or "",
+            "qty": qty,
+            "unit_cost": cost,
+            "unit_price": price,
+            "sku_number": str(node.get(COL_SKU) or ""),
+            "tax_pct": float(node.get(COL_TAX) or 0),
+        }
+
+    # same pre-tax sum SaveEstimateService stores in estimates.total
+    def _estimate_total(self) -> Money:
+        return Money(self._totals_all.base)
+
+    def is_tracking(self) -> bool:
+        return self._tracking
+
+    def has_changes(self) -> bool:
+        return bool(self._dirty_lines or self._dirty_jobs or self._reordered_jobs or self._deleted_item_ids
+                    or self._deleted_job_ids or self._jobs_moved or self._totals_stale)
+
+    ### THE TREE NOW MATCHES WHAT IS STORED FOR estimate_id: START RECORDING FROM HERE ###
+    # item_ids are (id, line_order) pairs in tree line order, handing the ids of a full save back to the lines.
+    def mark_clean(self, estimate_id: int | None, item_ids: list[tuple] | None = None):
+        if item_ids is not None:
+            for node, (item_id, line_order) in zip(self._line_nodes(), item_ids):
+                if item_id is not None:
+                    node.set_role(ITEM_ID_ROLE, int(item_id))
+                if line_order is not None:
+                    node.set_role(LINE_ORDER_ROLE, int(line_order))
+        self._reset_journal(estimate_id, tracking=estimate_id is not None)
+
+    ### EVERYTHING RECORDED SINCE THE LAST SAVE, AND AN EMPTY JOURNAL; None WHEN NOT RECORDING ###
+    # Lines the DB has no order for yet get one here: appended lines go after their job's highest line_order,
+    # jobs in _reordered_jobs (and renamed ones, whose lines carry the job name) are renumbered 0..n-1.
+    def take_changes(self) -> ROChangeSet | None:
+        if not self._tracking or self._journal_estimate_id is None:
+            return None
+        changes = ROChangeSet(estimate_id=self._journal_estimate_id)
+        jobs = [job for job in self._root.children if job.is_job()]
+        for job_order, job in enumerate(jobs, start=1):
+            lines = [ch for ch in job.children if not ch.is_subtotal()]
+            job_id = job.role(JOB_ID_ROLE)
+            resync = job in self._reordered_jobs or (job in self._dirty_jobs and job_id is not None)
+            if resync:
+                for order, line in enumerate(lines):
+                    line.set_role(LINE_ORDER_ROLE, order)
+            else:
+                orders = [int(l.role(LINE_ORDER_ROLE)) for l in lines if l.role(LINE_ORDER_ROLE) is not None]
+                next_order = max(orders, default=-1) + 1
+                for line in lines:
+                    if line in self._dirty_lines and line.role(LINE_ORDER_ROLE) is None:
+                        line.set_role(LINE_ORDER_ROLE, next_order)
+                        next_order += 1
+            changes.items.extend(self._line_record(line, job, job_order) for line in lines if line in self._dirty_lines)
+            # headers without a row are created even if only their lines changed
+            if job in self._dirty_jobs or (job_id is None and (resync or any(l in self._dirty_lines for l in lines))):
+                changes.jobs.append({"node": job, "job_id": job_id, "name": self._job_name(job)})
+            if resync and lines:
+                changes.reordered.append((job, job_id, [(l, l.role(ITEM_ID_ROLE)) for l in lines]))
+        if self._jobs_moved:
+            changes.job_order = [(job, job.role(JOB_ID_ROLE)) for job in jobs]
+        changes.deleted_item_ids = sorted(self._deleted_item_ids)
+        changes.deleted_job_ids = sorted(self._deleted_job_ids)
+        changes.totals_changed = self._totals_stale
+        changes.total = self._estimate_total()
+        self._reset_journal(self._journal_estimate_id, tracking=True)
+        return changes
+
+    ### A SAVE OF changes WENT THROUGH: HAND THE NEW JOB AND ITEM IDS BACK TO THEIR NODES ###
+    # A node removed while it was being saved now has a row it doesn't need; that id goes on the next delete.
+    def commit_changes(self, changes: ROChangeSet, job_ids: dict, item_ids: dict):
+        if changes.estimate_id != self._journal_estimate_id:
+            return  # another RO was loaded in the meantime
+        for node, job_id in job_ids.items():
+            node.set_role(JOB_ID_ROLE, int(job_id))
+            if not self._attached(node) and self._tracking:
+                self._deleted_job_ids.add(int(job_id))
+        for node, item_id in item_ids.items():
+            node.set_role(ITEM_ID_ROLE, int(item_id))
+            if not self._attached(node) and self._tracking:
+                self._deleted_item_ids.add(int(item_id))
+
+    ### A SAVE OF changes FAILED: PUT IT BACK IN THE JOURNAL SO THE NEXT SAVE RETRIES IT ###
+    def restore_changes(self, changes: ROChangeSet):
+        if not self._tracking or changes.estimate_id != self._journal_estimate_id:
+            return
+        self._dirty_lines.update(it["node"] for it in changes.items if self._attached(it["node"]))
+        self._dirty_jobs.update(j["node"] for j in changes.jobs if self._attached(j["node"]))
+        self._reordered_jobs.update(job for job, _job_id, _lines in changes.reordered if self._attached(job))
+        self._deleted_item_ids.update(changes.deleted_item_ids)
+        self._deleted_job_ids.update(changes.deleted_job_ids)
+        self._jobs_moved = self._jobs_moved or changes.job_order is not None
+        self._totals_stale = self._totals_stale or changes.totals_changed
+
     # QAbstractItemModel required overrides, essentially making our own QTreeWidget functions so code
     # still works in managers/
     def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
@@ -260,27 +589,20 @@ class ROTreeModel(QtCore.QAbstractItemModel):
         if not node:
             return None
 
-        # Display/Edit Text
-        if role in (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole):
+        # Display text comes from the node's cache; editors get the typed value
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return node.display(index.column())
+        if role == QtCore.Qt.ItemDataRole.EditRole:
             if node.is_job() and index.column() == COL_TYPE:
-                base = node.data_roles.get(JOB_NAME_ROLE)
-                if not base:
-                    base = _strip_status_suffix(node.get(COL_TYPE) or "New Job")
-                approved = bool(node.data_roles.get(APPROVED_ROLE))
-                declined = bool(node.data_roles.get(DECLINED_ROLE))
-                if approved:
-                    return f"{base} - Approved"
-                if declined:
-                    return f"{base} - Declined"
-                return base
+                return node.display(COL_TYPE)
             return node.get(index.column())
 
 
         if role == QtCore.Qt.ItemDataRole.ForegroundRole and index.column() == COL_TYPE:
             if node.is_job():
-                if node.data_roles.get(APPROVED_ROLE):
+                if node.role(APPROVED_ROLE):
                     return _qcolor(JOB_STATUS_COLOR["approved"])
-                if node.data_roles.get(DECLINED_ROLE):
+                if node.role(DECLINED_ROLE):
                     return _qcolor(JOB_STATUS_COLOR["declined"])
                 return None
 
@@ -290,26 +612,15 @@ class ROTreeModel(QtCore.QAbstractItemModel):
         
 
         if role == QtCore.Qt.ItemDataRole.FontRole and node.is_job():
-            if node.data_roles.get(APPROVED_ROLE) is True or node.data_roles.get(DECLINED_ROLE) is True:
+            if node.role(APPROVED_ROLE) is True or node.role(DECLINED_ROLE) is True:
                 return _BOLD
             return None
 
         if role == ROW_KIND_ROLE:
             return node.kind
         if role in (JOB_ID_ROLE, JOB_NAME_ROLE, ITEM_ID_ROLE, LINE_ORDER_ROLE, APPROVED_ROLE, DECLINED_ROLE):
-            return node.data_roles.get(role)
+            return node.role(role)
         
-        r = index.row()
-        c = index.column()
-
-        if role in (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole):
-            val = node.get(c)
-            if c == COL_TOTAL and role == QtCore.Qt.ItemDataRole.DisplayRole:
-                return f"{(val or 0.0):.2f}"
-            if c in (COL_UNIT_COST, COL_SELL, COL_RATE) and role == QtCore.Qt.ItemDataRole.DisplayRole:
-                 return f"{(val or 0.0):.2f}"
-            return val
-
         return None
 
     def setData(self, index: QtCore.QModelIndex, value, role: int = QtCore.Qt.ItemDataRole.EditRole) -> bool:
@@ -327,11 +638,13 @@ class ROTreeModel(QtCore.QAbstractItemModel):
             if node.is_job() and index.column() == COL_TYPE:
                 base = _strip_status_suffix("" if val is None else str(val))
                 node.set(COL_TYPE, base)
-                node.data_roles[JOB_NAME_ROLE] = base
+                node.set_role(JOB_NAME_ROLE, base)
+                self._journal_edit(node, index.column())
                 self.dataChanged.emit(index, index, [role])
                 return True
 
             node.set(index.column(), val)
+            self._journal_edit(node, index.column())
             if not node.is_job():
                 if index.column() == COL_UNIT_COST and node.kind in ("part", "tire"):
                     cost = node.get(COL_UNIT_COST)
@@ -341,38 +654,52 @@ class ROTreeModel(QtCore.QAbstractItemModel):
                         sell_idx = self.index(index.row(), COL_SELL, index.parent())
                         self.dataChanged.emit(sell_idx, sell_idx, [QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.EditRole])
 
-
-                self._recompute_line_total(node)
-                if node.parent and node.parent.is_job():
-                    self._recompute_job_subtotal(node.parent)
+                # description / SKU edits leave the sums alone
+                if index.column() in _AMOUNT_COLUMNS:
+                    self._recompute_line_total(node)
+                    if node.parent and node.parent.is_job():
+                        self._recompute_job_subtotal(node.parent)
+                    self.totalsChanged.emit()
             self.dataChanged.emit(index, index, [role])
-            self.totalsChanged.emit()
             return True
 
         if role in (JOB_ID_ROLE, JOB_NAME_ROLE, ITEM_ID_ROLE, LINE_ORDER_ROLE):
-            node.data_roles[role] = value
+            node.set_role(role, value)
+            if role == JOB_NAME_ROLE:
+                self._journal_edit(node, COL_TYPE)
             self.dataChanged.emit(index, index, [role])
             return True
 
         # approval roles: make them mutually exclusive
         if role == APPROVED_ROLE:
             v = bool(value)
-            node.data_roles[APPROVED_ROLE] = v
+            node.set_role(APPROVED_ROLE, v)
             if v:
-                node.data_roles[DECLINED_ROLE] = False
+                node.set_role(DECLINED_ROLE, False)
             self.dataChanged.emit(index, index, [APPROVED_ROLE, DECLINED_ROLE])
             return True
 
         if role == DECLINED_ROLE:
             v = bool(value)
-            node.data_roles[DECLINED_ROLE] = v
+            was = bool(node.role(DECLINED_ROLE))
+            counted = self._counted(node) if not node.is_job() else None
+            node.set_role(DECLINED_ROLE, v)
             if v:
-                node.data_roles[APPROVED_ROLE] = False
+                node.set_role(APPROVED_ROLE, False)
+            if v != was:
+                # declined jobs and lines drop out of the estimate totals
+                if node.is_job():
+                    self._totals.add(self._job_totals(node), -1 if v else 1)
+                elif node.parent is not None and node.parent.is_job():
+                    self._account(node.parent, counted, -1)
+                    self._account(node.parent, self._counted(node), 1)
+                    self._recompute_job_subtotal(node.parent)
+                self.totalsChanged.emit()
             self.dataChanged.emit(index, index, [APPROVED_ROLE, DECLINED_ROLE])
             return True
 
         if role in (JOB_ID_ROLE, JOB_NAME_ROLE, ITEM_ID_ROLE, LINE_ORDER_ROLE):
-            node.data_roles[role] = value
+            node.set_role(role, value)
             self.dataChanged.emit(index, index, [role])
             return True
 
@@ -524,6 +851,10 @@ class ROTreeModel(QtCore.QAbstractItemModel):
         dst_job.children.insert(dest_row, moving)
         moving.parent = dst_job
         self.endMoveRows()
+        if dst_job is not src_job:
+            counted = self._counted(moving)
+            self._account(src_job, counted, -1)
+            self._account(dst_job, counted, 1)
 
         self._normalize_job_subtotal(src_job)
         if dst_job is not src_job:
@@ -533,6 +864,15 @@ class ROTreeModel(QtCore.QAbstractItemModel):
         self._recompute_job_subtotal(src_job)
         if dst_job is not src_job:
             self._recompute_job_subtotal(dst_job)
+
+        # number the lines of both jobs 0..n-1 here; the next save (autosave) writes the same numbers
+        for job in dict.fromkeys((dst_job, src_job)):
+            for order, ch in enumerate(c for c in job.children if not c.is_subtotal()):
+                ch.set_role(LINE_ORDER_ROLE, order)
+        if self._tracking:
+            self._reordered_jobs.update((src_job, dst_job))
+            if dst_job is not src_job:
+                self._totals_stale = True
         return True
 
 # Ensure only on job subtotal per job
@@ -587,33 +927,51 @@ class ROTreeModel(QtCore.QAbstractItemModel):
 
 
 
+    # -------------------- Running totals --------------------
+    def _reset_totals(self):
+        self._totals = Totals()        # what the RO hub shows: declined jobs and lines left out
+        self._totals_all = Totals()    # every line, as SaveEstimateService stores estimates.total
+
+    @staticmethod
+    def _job_totals(job: ItemNode) -> Totals:
+        if job.amounts is None:
+            job.amounts = Totals()
+        return job.amounts
+
+    # (kind, base, tax, total) of a line if it counts towards the totals, else None
+    @staticmethod
+    def _counted(node: ItemNode):
+        if node.amounts is None or node.role(DECLINED_ROLE):
+            return None
+        return node.amounts
+
+    def _account(self, job: ItemNode, amounts, sign: int):
+        if amounts is None or job is None or not job.is_job():
+            return
+        self._job_totals(job).add_line(amounts, sign)
+        self._totals_all.add_line(amounts, sign)
+        if not job.role(DECLINED_ROLE):
+            self._totals.add_line(amounts, sign)
+
+    ### RECOMPUTES ONE LINE AND MOVES ITS JOB's AND THE ESTIMATE's SUMS BY THE DIFFERENCE ###
     def _recompute_line_total(self, node: ItemNode):
-        if node.kind == 'labor':
-            hours = Decimal(str(node.get(COL_HOURS) or 0))
-            rate  = Decimal(str(node.get(COL_RATE)  or 0))
-            total = hours * rate
-        elif node.kind == 'subtotal':
+        if node.kind == 'subtotal' or node.is_job():
             return
+        if node.kind == 'labor':
+            base, total = line_amounts(node.get(COL_HOURS), node.get(COL_RATE), node.get(COL_TAX))
         else:
-            qty   = Decimal(str(node.get(COL_QTY) or 0))
-            sell = Decimal(str((node.get(COL_SELL) or 0)))
-            total = qty * sell
-        tax_pct = Decimal(str(node.get(COL_TAX) or 0))
-        total = total * (Decimal("1") + (tax_pct/Decimal("100")))
-        total = _q2(total)
+            base, total = line_amounts(node.get(COL_QTY), node.get(COL_SELL), node.get(COL_TAX))
         node.set(COL_TOTAL, float(total))
+        job = node.parent
+        self._account(job, self._counted(node), -1)
+        node.amounts = (node.kind, base.cents, total.cents - base.cents, total.cents)
+        self._account(job, self._counted(node), 1)
 
+    # the job's running total into its SUBTOTAL row; no walk over the lines
     def _recompute_job_subtotal(self, job: ItemNode):
         # ensure we have a trailing subtotal row
         self._ensure_job_subtotal(job)
-        subtotal_val = Decimal("0")
-        for ch in job.children:
-            if ch.is_subtotal():
-                continue
-            # guarantee each line has current total
-            self._recompute_line_total(ch)
-            subtotal_val += Decimal(str(ch.get(COL_TOTAL) or 0))
-        job.children[-1].set(COL_TOTAL, float(subtotal_val))
+        job.children[-1].set(COL_TOTAL, float(self._job_totals(job).money("total")))
         # notify view: emit dataChanged for subtotal total column
         job_row = self._row_for_node(job)
         sub_row = len(job.children) - 1
@@ -621,17 +979,26 @@ class ROTreeModel(QtCore.QAbstractItemModel):
         self.dataChanged.emit(idx, idx, [QtCore.Qt.ItemDataRole.DisplayRole])
         self.totalsChanged.emit()
 
+    ### RUNNING TOTALS OF THE JOBS THAT AREN'T DECLINED (TotalsController READS THESE) ###
+    def estimate_totals(self) -> Totals:
+        return self._totals
+
+    def job_totals(self, job_index: QtCore.QModelIndex) -> Totals | None:
+        job = self._node(job_index)
+        return self._job_totals(job) if job is not None and job.is_job() else None
+
 
     # Ensure every job header stores the *raw* name (no '- Approved/Declined')
     def sanitize_job_headers(self):
         for job in self._root.children:
             if not job.is_job():
                 continue
-            raw = job.data_roles.get(JOB_NAME_ROLE) or job.get(COL_TYPE) or "Job"
+            raw = job.role(JOB_NAME_ROLE) or job.get(COL_TYPE) or "Job"
             base = _strip_status_suffix(raw)
-            if base != raw or (job.data_roles.get(JOB_NAME_ROLE) or "") != base:
+            if base != raw or (job.role(JOB_NAME_ROLE) or "") != base:
                 job.set(COL_TYPE, base)
-                job.data_roles[JOB_NAME_ROLE] = base
+                job.set_role(JOB_NAME_ROLE, base)
+                self._journal_edit(job, COL_TYPE)
                 r = self._row_for_node(job)
                 idx = self.index(r, COL_TYPE, QtCore.QModelIndex())
                 self.dataChanged.emit(idx, idx, [QtCore.Qt.ItemDataRole.DisplayRole])
\ No newline at end of file
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from PyQt6 import QtCore, QtGui
 
 COL_TYPE        = 0
@@ -68,6 +69,8 @@ HEADER_TITLES = [
     "Type", "SKU / Op Code", "Description", "Qty", "Unit Cost", "Sell", "Hours", "Rate", "Tax %", "Line Total"
 ]
 
+# one brush per color, shared by every paint instead of built per data() call
+@lru_cache(maxsize=None)
 def _qcolor(hex_or_none):
     if not hex_or_none: 
         return None
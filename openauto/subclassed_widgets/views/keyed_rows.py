@@ -0,0 +1,128 @@
+from PyQt6 import QtWidgets, QtCore
+
+
+### KEYED DIFF-APPLY FOR QTABLEWIDGETS FED BY SQLMonitor ###
+    # Rows are addressed by the primary key held in KEY_COLUMN, so an edited record touches one row instead of
+    # rebuilding the whole table. Scroll position and selection survive because untouched rows are never recreated.
+    # If SORT_COLUMN is set, inserted rows land at their sorted position (case-insensitive, like the MySQL collation).
+class KeyedRowsMixin:
+    KEY_COLUMN = 0
+    SORT_COLUMN = None
+    DATA_COLUMNS = None  # how many values of each row tuple are shown; defaults to columnCount()
+
+    def _keyed_init(self):
+        self._key_items: dict[str, QtWidgets.QTableWidgetItem] = {}
+
+    @staticmethod
+    def _row_key(value) -> str:
+        return str(value)
+
+    def _data_columns(self) -> int:
+        return self.DATA_COLUMNS if self.DATA_COLUMNS is not None else self.columnCount()
+
+    def _sort_text(self, r: int) -> str:
+        item = self.item(r, self.SORT_COLUMN)
+        return item.text().casefold() if item else ""
+
+    def _insert_position(self, sort_value) -> int:
+        if self.SORT_COLUMN is None:
+            return self.rowCount()
+        target = str(sort_value).casefold()
+        lo, hi = 0, self.rowCount()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._sort_text(mid) <= target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _write_row(self, r: int, row) -> None:
+        for col in range(self._data_columns()):
+            text = str(row[col])
+            item = self.item(r, col)
+            if item is not None:
+                if item.text() != text:
+                    item.setText(text)
+                continue
+            item = QtWidgets.QTableWidgetItem(text)
+            item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+            self.setItem(r, col, item)
+            if col == self.KEY_COLUMN:
+                self._key_items[text] = item
+
+    ### FULL REPLACE, USED FOR THE FIRST LOAD (NO PER-ROW INSERTS) ###
+    def load_rows(self, rows) -> None:
+        rows = list(rows or [])
+        self.setUpdatesEnabled(False)
+        try:
+            self.clearContents()
+            self._key_items = {}
+            self.setRowCount(len(rows))
+            for r, row in enumerate(rows):
+                self._write_row(r, row)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    ### INSERT NEW KEYS, UPDATE CHANGED CELLS OF EXISTING ONES ###
+    def upsert_rows(self, rows) -> None:
+        rows = list(rows or [])
+        if not rows:
+            return
+        self.setUpdatesEnabled(False)
+        try:
+            for row in rows:
+                key = self._row_key(row[self.KEY_COLUMN])
+                item = self._key_items.get(key)
+                if item is not None and self.SORT_COLUMN is not None:
+                    r = item.row()
+                    if self._sort_text(r) != str(row[self.SORT_COLUMN]).casefold():
+                        # sort key changed: take the row out and put it back in order
+                        self._remove_key(key)
+                        item = None
+                if item is not None:
+                    self._write_row(item.row(), row)
+                    continue
+                r = self._insert_position(row[self.SORT_COLUMN] if self.SORT_COLUMN is not None else None)
+                self.insertRow(r)
+                self._write_row(r, row)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def remove_keys(self, keys) -> None:
+        doomed = [self._row_key(k) for k in (keys or [])]
+        if not doomed:
+            return
+        self.setUpdatesEnabled(False)
+        try:
+            for key in doomed:
+                self._remove_key(key)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _remove_key(self, key: str) -> None:
+        item = self._key_items.pop(key, None)
+        if item is not None:
+            self.removeRow(item.row())
+
+    ### REMOVES EVERY ROW WHOSE column TEXT IS IN values (e.g. vehicles of a deleted customer) ###
+    def remove_where(self, column: int, values) -> None:
+        wanted = {str(v) for v in (values or [])}
+        if not wanted:
+            return
+        keys = []
+        for key, item in self._key_items.items():
+            cell = self.item(item.row(), column)
+            if cell is not None and cell.text() in wanted:
+                keys.append(key)
+        self.remove_keys(keys)
+
+    ### DIFF A FULL SNAPSHOT AGAINST WHAT'S ON SCREEN (FALLBACK POLLING PATH) ###
+    def sync_rows(self, rows) -> None:
+        rows = list(rows or [])
+        if not self._key_items:
+            self.load_rows(rows)
+            return
+        present = {self._row_key(row[self.KEY_COLUMN]) for row in rows}
+        self.remove_keys([k for k in self._key_items if k not in present])
+        self.upsert_rows(rows)
@@ -208,7 +208,7 @@ class PartsTree(QtWidgets.QTreeView):
             return None
         parent = row0.parent()
         def v(col):
-            return m.index(row0.row(), col, parent).data()
+            return m.index(row0.row(), col, parent).data(Qt.ItemDataRole.EditRole)
 
         return {
             "description": v(COL_DESC) or v(COL_TYPE) or "New Part",
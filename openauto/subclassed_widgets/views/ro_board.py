@@ -0,0 +1,248 @@
+from __future__ import annotations
+import os
+import weakref
+
+from PyQt6 import QtWidgets, QtGui, QtCore
+from openauto.subclassed_widgets.models.ro_board_model import ROBoardModel, RO_ROW_ROLE, RO_ID_ROLE
+from openauto.services.ro_snapshot_cache import snapshot_cache, HOVER_PREFETCH_MS
+
+
+TILE_SIZE = QtCore.QSize(200, 186)
+TILE_GAP = 12
+
+# boards alive in this process, so ro_tiles.update_all_tiles can reach them like it reaches widget tiles
+_boards: weakref.WeakSet = weakref.WeakSet()
+
+
+def enabled() -> bool:
+    # OPENAUTO_BOARD=list swaps the widget-per-tile lanes for ROBoardView
+    return os.getenv("OPENAUTO_BOARD", "tiles").strip().lower() == "list"
+
+
+def boards() -> list:
+    return list(_boards)
+
+
+def _vehicle(row: dict) -> str:
+    return " ".join(str(row.get(k)) for k in ("year", "make", "model") if row.get(k)) or "Unknown"
+
+
+### PAINTS ONE RO TILE STRAIGHT FROM ITS board_snapshot ROW ###
+    # Same look as #ro_tile, but no widgets: a tile costs nothing until it is on screen. Colors come from
+    # the view's tile_colors() (qproperty-tile* on QListView#ro_board in the theme QSS).
+class ROTileDelegate(QtWidgets.QStyledItemDelegate):
+    PADDING = 12
+    RADIUS = 12
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._title_font = QtGui.QFont()
+        self._title_font.setPointSize(14)
+        self._title_font.setWeight(QtGui.QFont.Weight.DemiBold)
+        self._body_font = QtGui.QFont()
+        self._body_font.setPointSize(12)
+        self._title_fm = QtGui.QFontMetrics(self._title_font)
+        self._body_fm = QtGui.QFontMetrics(self._body_font)
+
+    def sizeHint(self, option, index) -> QtCore.QSize:
+        return TILE_SIZE
+
+    @staticmethod
+    def lines(row: dict) -> list[str]:
+        created = row.get("created_at")
+        total = row.get("total")
+        try:
+            total_text = f"Estimate Total:  ${total:,.2f}" if total is not None else "Estimate Total: —"
+        except (TypeError, ValueError):
+            total_text = "Estimate Total: -"
+        return [
+            row.get("customer") or "Unknown",
+            _vehicle(row),
+            f"🛠 {row.get('tech') or 'Unassigned'}   💬 {row.get('writer') or 'Unassigned'}",
+            f"Concern:  {row.get('concern') or 'No concern Entered'}",
+            f"Created:  {created:%m/%d/%Y %I:%M%p}" if created else "Created: -",
+            total_text,
+        ]
+
+    def paint(self, painter: QtGui.QPainter, option, index) -> None:
+        row = index.data(RO_ROW_ROLE)
+        if not row:
+            return
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        rect = QtCore.QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+        hot = bool(option.state & (QtWidgets.QStyle.StateFlag.State_MouseOver | QtWidgets.QStyle.StateFlag.State_Selected))
+        view = option.widget
+        colors = view.tile_colors() if isinstance(view, ROBoardView) else ROBoardView.palette_colors(option.palette)
+        painter.setPen(QtGui.QPen(colors["hover_border"] if hot else colors["border"], 1))
+        painter.setBrush(colors["background"])
+        painter.drawRoundedRect(rect, self.RADIUS, self.RADIUS)
+
+        inner = option.rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        width = inner.width()
+        y = inner.top()
+        painter.setPen(colors["text"])
+
+        painter.setFont(self._title_font)
+        painter.drawText(QtCore.QRect(inner.left(), y, width, self._title_fm.height()),
+                         QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter,
+                         self._title_fm.elidedText(f"RO #{row.get('ro_number')}", QtCore.Qt.TextElideMode.ElideRight, width))
+        y += self._title_fm.height() + 4
+
+        painter.setFont(self._body_font)
+        step = self._body_fm.lineSpacing() + 2
+        for text in self.lines(row):
+            if y + self._body_fm.height() > inner.bottom() + 1:
+                break
+            painter.drawText(QtCore.QRect(inner.left(), y, width, self._body_fm.height()),
+                             QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter,
+                             self._body_fm.elidedText(text, QtCore.Qt.TextElideMode.ElideRight, width))
+            y += step
+        painter.restore()
+
+
+def _tile_color(key: str):
+    def fget(view) -> QtGui.QColor:
+        return view.tile_colors()[key]
+
+    def fset(view, color) -> None:
+        view._tile_colors[key] = QtGui.QColor(color)
+        view.viewport().update()
+
+    return QtCore.pyqtProperty(QtGui.QColor, fget, fset)
+
+
+### ONE RO BOARD LANE AS A VIRTUALIZED GRID ###
+    # Drop-in for ROTileContainer when OPENAUTO_BOARD=list: a QListView in icon mode over ROBoardModel.
+    # Uniform item sizes let Qt lay out thousands of tiles arithmetically, and only visible ones are painted.
+class ROBoardView(QtWidgets.QListView):
+    roActivated = QtCore.pyqtSignal(int)
+    moreRequested = QtCore.pyqtSignal()
+
+    # set by the theme QSS (qproperty-tileBackground etc.); anything it leaves out follows the palette
+    tileBackground = _tile_color("background")
+    tileBorder = _tile_color("border")
+    tileHoverBorder = _tile_color("hover_border")
+    tileText = _tile_color("text")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("ro_board")
+        self.setModel(ROBoardModel(self))
+        self.setItemDelegate(ROTileDelegate(self))
+        self.setViewMode(QtWidgets.QListView.ViewMode.IconMode)
+        self.setFlow(QtWidgets.QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
+        self.setMovement(QtWidgets.QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QtWidgets.QListView.LayoutMode.Batched)
+        self.setBatchSize(256)
+        self.setGridSize(TILE_SIZE + QtCore.QSize(TILE_GAP, TILE_GAP))
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.SingleSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.OpenHandCursor))
+        self.clicked.connect(self._on_clicked)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        # resting the pointer on a tile warms the RO snapshot cache so opening it is instant
+        self._hover_index = QtCore.QPersistentModelIndex()
+        self._hover_timer = QtCore.QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(HOVER_PREFETCH_MS)
+        self._hover_timer.timeout.connect(self._prefetch_snapshot)
+        self.entered.connect(self._on_entered)
+        self._query = ""
+        self._filter_ids = None
+        self._tile_colors: dict[str, QtGui.QColor] = {}
+        _boards.add(self)
+
+    @staticmethod
+    def palette_colors(palette: QtGui.QPalette) -> dict[str, QtGui.QColor]:
+        return {
+            "background": palette.color(QtGui.QPalette.ColorRole.Button),
+            "border": palette.color(QtGui.QPalette.ColorRole.Mid),
+            "hover_border": palette.color(QtGui.QPalette.ColorRole.Highlight),
+            "text": palette.color(QtGui.QPalette.ColorRole.ButtonText),
+        }
+
+    def tile_colors(self) -> dict[str, QtGui.QColor]:
+        return {**self.palette_colors(self.palette()), **self._tile_colors}
+
+    def _on_clicked(self, index: QtCore.QModelIndex):
+        ro_id = index.data(RO_ID_ROLE)
+        if ro_id is not None:
+            self.roActivated.emit(int(ro_id))
+
+    def _on_entered(self, index: QtCore.QModelIndex):
+        self._hover_index = QtCore.QPersistentModelIndex(index)
+        self._hover_timer.start()
+
+    def leaveEvent(self, event):
+        self._hover_timer.stop()
+        super().leaveEvent(event)
+
+    def _prefetch_snapshot(self):
+        if not self._hover_index.isValid():
+            return
+        row = self._hover_index.data(RO_ROW_ROLE) or {}
+        if row and self.indexAt(self.viewport().mapFromGlobal(QtGui.QCursor.pos())) == QtCore.QModelIndex(self._hover_index):
+            snapshot_cache().prefetch(row["ro_id"], version=row.get("updated_at"))
+
+    # next page is asked for once the user scrolls within a tile row of the bottom
+    def _on_scrolled(self, value: int):
+        bar = self.verticalScrollBar()
+        if bar.maximum() > 0 and value >= bar.maximum() - self.gridSize().height():
+            self.moreRequested.emit()
+
+    # ---------- same keyed API RepairOrdersManager uses on ROTileContainer ----------
+    def ro_ids(self) -> list[int]:
+        return self.model().ro_ids()
+
+    def last_key(self):
+        return self.model().last_key()
+
+    def append_rows(self, rows) -> None:
+        self.model().append_rows(rows)
+        self._refilter()
+
+    def apply_rows(self, rows) -> None:
+        self.model().apply_rows(rows)
+        self._refilter()
+
+    def upsert_row(self, row: dict) -> None:
+        self.model().upsert_row(row)
+        self._refilter()
+
+    def remove_ro(self, ro_id) -> None:
+        self.model().remove_ro(ro_id)
+
+    def update_ro(self, ro_id, **fields) -> None:
+        self.model().update_fields(ro_id, **fields)
+
+    def clear(self) -> None:
+        self.model().clear()
+
+    ### SAME RULES AS ROTileContainer.filter_tiles, ON ROW DATA INSTEAD OF LABEL TEXT ###
+    def filter_tiles(self, query: str, ro_ids=None):
+        self._query = (query or "").strip().lower()
+        self._filter_ids = set(ro_ids) if ro_ids is not None and self._query else None
+        self._refilter()
+
+    def _refilter(self) -> None:
+        model = self.model()
+        tokens = self._query.split()
+        for i in range(model.rowCount()):
+            row = model.data(model.index(i, 0), RO_ROW_ROLE)
+            if self._filter_ids is not None:
+                hidden = row["ro_id"] not in self._filter_ids
+            elif tokens:
+                blob = f"RO #{row.get('ro_number')} {row.get('customer') or ''} {_vehicle(row)}".lower()
+                hidden = not all(tok in blob for tok in tokens)
+            else:
+                hidden = False
+            if self.isRowHidden(i) != hidden:
+                self.setRowHidden(i, hidden)
@@ -1,36 +1,61 @@
-from PyQt6 import QtWidgets, QtGui, QtCore
-from openauto.repositories.ro_c3_repository import ROC3Repository
+from PyQt6 import QtWidgets, QtGui, QtCore, sip
+from functools import partial
+import weakref
 from openauto.repositories.repair_orders_repository import RepairOrdersRepository
 from openauto.repositories.estimate_jobs_repository import EstimateJobsRepository
+from openauto.subclassed_widgets.views import ro_board
+from openauto.services.ro_snapshot_cache import snapshot_cache, HOVER_PREFETCH_MS
 import os
 
 MAX_TILE_W = 200
 
-def _iter_all_tiles():
-    # Walk all widgets and yield any ROTile instances, even if they’re on hidden pages.
-    for w in QtWidgets.QApplication.allWidgets():
-        try:
-            if isinstance(w, ROTile):
-                yield w
-        except Exception:
-            pass
+### LIVE TILES BY ro_id. TILES JOIN ON CONSTRUCTION AND LEAVE WHEN THE C++ WIDGET IS DESTROYED ###
+    # Only weak references are held, so the registry never keeps a dropped tile alive.
+_tile_registry: dict[int, weakref.WeakSet] = {}
+
+
+def _register_tile(tile) -> None:
+    _tile_registry.setdefault(tile.ro_id, weakref.WeakSet()).add(tile)
+    tile.destroyed.connect(partial(_unregister_tile, tile.ro_id, weakref.ref(tile)))
+
+
+def _unregister_tile(ro_id, tile_ref, *_args) -> None:
+    tiles = _tile_registry.get(ro_id)
+    if tiles is None:
+        return
+    tile = tile_ref()
+    if tile is not None:
+        tiles.discard(tile)
+    if not tiles:
+        _tile_registry.pop(ro_id, None)
+
+
+def tiles_for(ro_id) -> list:
+    tiles = _tile_registry.get(ro_id)
+    if not tiles:
+        return []
+    return [t for t in list(tiles) if not sip.isdeleted(t)]
 
 
 # Update any live ROTile for moving tiles to working, checkout etc..
 def update_all_tiles(ro_id: int, **fields):
-    for tile in _iter_all_tiles():
-        if getattr(tile, "ro_id", None) == ro_id:
-            # quick pathways for common fields
-            if "status" in fields:
-                tile.set_status(fields["status"])
-            if "total" in fields and fields["total"] is not None:
-                try:
-                    tile.total_label.setText(f"Estimate Total:  ${float(fields['total']):,.2f}")
-                except Exception:
-                    pass
-            if fields:
-                tile.update_from_record(fields)
-            tile.update()
+    for tile in tiles_for(ro_id):
+        # quick pathways for common fields
+        if "status" in fields:
+            tile.set_status(fields["status"])
+        if "total" in fields and fields["total"] is not None:
+            try:
+                tile.total_label.setText(f"Estimate Total:  ${float(fields['total']):,.2f}")
+            except Exception:
+                pass
+        if fields:
+            tile.update_from_record(fields)
+        tile.update()
+    # delegate-painted boards (OPENAUTO_BOARD=list) hold rows instead of tiles
+    if "total" in fields and fields["total"] is None:
+        fields = {k: v for k, v in fields.items() if k != "total"}
+    for board in ro_board.boards():
+        board.update_ro(ro_id, **fields)
 
 def _maybe_icon(path: str, fallback_text: str) -> QtWidgets.QLabel:
     lbl = QtWidgets.QLabel()
@@ -136,10 +161,12 @@ class ROTile(QtWidgets.QFrame):
     statusChangeRequested = QtCore.pyqtSignal(int, str)
 
     def __init__(self, ro_id, ro_number, customer_name, vehicle, tech, writer, concern, status,
-                 parent=None, icon_dir: str = "theme/icons", page_context: str = "ro_hub"):
+                 parent=None, icon_dir: str = "theme/icons", page_context: str = "ro_hub", meta: dict | None = None):
         super().__init__(parent)
         self.ro_id = ro_id
+        self.ro_number = ro_number
         self.status = status
+        self.meta = {}
         self.page_context = (page_context or "ro_hub").strip().lower()
         self.setMaximumWidth(MAX_TILE_W)
         layout = QtWidgets.QVBoxLayout(self)
@@ -164,6 +191,7 @@ class ROTile(QtWidgets.QFrame):
         self.tech_box.setLayout(tech_wrap)
         tech_wrap.addWidget(tech_icon)
         tech_wrap.addWidget(tech_lbl)
+        self.tech_label = tech_lbl
 
         writer_wrap = QtWidgets.QHBoxLayout(); writer_wrap.setSpacing(6)
         writer_icon = _maybe_icon(os.path.join(icon_dir, "writer.png"), "💬")
@@ -175,6 +203,7 @@ class ROTile(QtWidgets.QFrame):
         self.writer_box.setLayout(writer_wrap)
         writer_wrap.addWidget(writer_icon)
         writer_wrap.addWidget(writer_lbl)
+        self.writer_label = writer_lbl
 
         roles.addWidget(self.tech_box)
         roles.addWidget(self.writer_box)
@@ -194,7 +223,18 @@ class ROTile(QtWidgets.QFrame):
         layout.addWidget(self.total_label)
         layout.addStretch()
 
-        self.refresh_meta()
+        # boards pass their RepairOrdersRepository.board_snapshot row; a lone tile reads its own
+        if meta is not None:
+            self.apply_meta(meta)
+        else:
+            self.refresh_meta()
+        _register_tile(self)
+
+        # resting the pointer on a tile warms the RO snapshot cache so opening it is instant
+        self._hover_timer = QtCore.QTimer(self)
+        self._hover_timer.setSingleShot(True)
+        self._hover_timer.setInterval(HOVER_PREFETCH_MS)
+        self._hover_timer.timeout.connect(self._prefetch_snapshot)
 
     ### Stub for now.
     # Maybe implement color changes to tiles in the future or any other UI imporvements.
@@ -204,6 +244,7 @@ class ROTile(QtWidgets.QFrame):
     ### Also stub
         # see above function set_status()
     def update_from_record(self, rec: dict):
+        self.meta.update({k: v for k, v in rec.items() if k in self.meta})
         if "status" in rec: self.set_status(rec["status"])
         if "customer" in rec: self.customer_label.setText(rec["customer"] or "")
         if "vehicle" in rec: self.vehicle_label.setText(rec["vehicle"] or "")
@@ -214,35 +255,63 @@ class ROTile(QtWidgets.QFrame):
         if "created_at" in rec and rec["created_at"]:
             self.created_label.setText(f"Created:  {rec['created_at']:%m/%d/%Y %I:%M%p}")
 
+    ### RE-READS THIS TILE'S SNAPSHOT ROW (ONE QUERY) ###
     def refresh_meta(self):
-        concern = None
         try:
-            concern = ROC3Repository.get_primary_concern(self.ro_id)
+            rows = RepairOrdersRepository.board_snapshot(ro_ids=[self.ro_id])
         except Exception:
-            concern = None
-
-        concern_text = concern or "No concern Entered"
+            rows = []
+        self.apply_meta(rows[0] if rows else {})
+
+    ### BRINGS AN EXISTING TILE UP TO DATE WITH A NEWER board_snapshot ROW (NO-OP WHEN NOTHING CHANGED) ###
+    def apply_snapshot(self, row: dict) -> bool:
+        if row == self.meta:
+            return False
+        self.ro_number = row.get("ro_number")
+        self.ro_label.setText(f"RO #{self.ro_number}")
+        vehicle = f"{row.get('year')} {row.get('make')} {row.get('model')}".strip()
+        self.customer_label.setText(row.get("customer") or "Unknown")
+        self.vehicle_label.setText(vehicle or "Unknown")
+        self.tech_label.setText(row.get("tech") or "Unassigned")
+        self.writer_label.setText(row.get("writer") or "Unassigned")
+        self.apply_meta(row)
+        return True
+
+    ### RENDERS CONCERN, CREATED DATE AND TOTAL FROM A board_snapshot ROW ###
+    def apply_meta(self, meta: dict):
+        self.meta = dict(meta or {})
+        if self.meta.get("status"):
+            self.set_status(self.meta["status"])
+
+        concern_text = self.meta.get("concern") or "No concern Entered"
         fm = self.concern_label.fontMetrics()
         self.concern_label.setText(f"Concern:  {concern_text}")
         self.concern_label.setMaximumHeight(fm.lineSpacing() * 2)
 
-        try:
-            meta = RepairOrdersRepository.get_create_altered_date(self.ro_id) or {}
-            created = meta.get("created_at")
-            if created:
-                self.created_label.setText(f"Created:  {created:%m/%d/%Y %I:%M%p}")
-            else:
-                self.created_label.setText("Created: -")
-        except Exception:
-            self.created_label.setText("Created -")
+        created = self.meta.get("created_at")
+        if created:
+            self.created_label.setText(f"Created:  {created:%m/%d/%Y %I:%M%p}")
+        else:
+            self.created_label.setText("Created: -")
 
+        total = self.meta.get("total")
         try:
-            total = RepairOrdersRepository.estimate_total_for_ro(self.ro_id)
             self.total_label.setText(f"Estimate Total:  ${total:,.2f}" if total is not None else "Estimate Total: —")
         except Exception:
             self.total_label.setText("Estimate Total: -")
 
 
+    def enterEvent(self, event):
+        self._hover_timer.start()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        self._hover_timer.stop()
+        super().leaveEvent(event)
+
+    def _prefetch_snapshot(self):
+        snapshot_cache().prefetch(self.ro_id, version=self.meta.get("updated_at"))
+
     def mousePressEvent(self, event):
         if event.button() == QtCore.Qt.MouseButton.RightButton:
             self.clicked.emit()
@@ -278,6 +347,8 @@ class ROTile(QtWidgets.QFrame):
 
     ### SCROLL AREA FOR RO TILES ###
 class ROTileContainer(QtWidgets.QScrollArea):
+    moreRequested = QtCore.pyqtSignal()
+
     def __init__(self, parent=None, columns=4, hgap=12, vgap=12):
         super().__init__(parent)
         self.setWidgetResizable(True)
@@ -298,6 +369,15 @@ class ROTileContainer(QtWidgets.QScrollArea):
         self.setSizePolicy(QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding)
         self._grid.setAlignment(QtCore.Qt.AlignmentFlag.AlignTop | QtCore.Qt.AlignmentFlag.AlignLeft)
         self.setWidget(self._wrap)
+        self._order: list[ROTile] = []
+        self._by_ro: dict[int, ROTile] = {}
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    # next page is asked for once the user scrolls within a tile row of the bottom
+    def _on_scrolled(self, value: int):
+        bar = self.verticalScrollBar()
+        if bar.maximum() > 0 and value >= bar.maximum() - MAX_TILE_W:
+            self.moreRequested.emit()
 
     def clear(self):
         while self._grid.count():
@@ -306,6 +386,80 @@ class ROTileContainer(QtWidgets.QScrollArea):
             if w:
                 w.setParent(None)
                 w.deleteLater()
+        self._order = []
+        self._by_ro = {}
+
+    # ---------- keyed access for the board reconciler (RepairOrdersManager) ----------
+    def tile_for(self, ro_id) -> ROTile | None:
+        return self._by_ro.get(ro_id)
+
+    def tiles(self) -> list[ROTile]:
+        return list(self._order)
+
+    def ro_ids(self) -> list[int]:
+        return [t.ro_id for t in self._order]
+
+    # (ro_number, ro_id) of the last tile: the keyset cursor for the lane's next page
+    def last_key(self):
+        if not self._order:
+            return None
+        return self._order[-1].ro_number, self._order[-1].ro_id
+
+    ### INSERTS tile KEEPING THE LANE IN ro_number ORDER; ONLY TILES AFTER IT CHANGE GRID CELLS ###
+    def insert_tile(self, tile: ROTile) -> None:
+        key = str(tile.ro_number or "")
+        pos = len(self._order)
+        for i, other in enumerate(self._order):
+            if str(other.ro_number or "") > key:
+                pos = i
+                break
+        self._prepare(tile)
+        self._order.insert(pos, tile)
+        self._by_ro[tile.ro_id] = tile
+        self._relayout(start=pos)
+
+    ### TAKES A TILE OUT OF THE LANE WITHOUT DESTROYING IT (IT'S MOVING TO ANOTHER LANE) ###
+    def take_tile(self, ro_id) -> ROTile | None:
+        tile = self._by_ro.pop(ro_id, None)
+        if tile is None:
+            return None
+        pos = self._order.index(tile)
+        self._order.pop(pos)
+        self._grid.removeWidget(tile)
+        tile.setParent(None)
+        self._relayout(start=pos)
+        return tile
+
+    def remove_tile(self, ro_id) -> None:
+        tile = self.take_tile(ro_id)
+        if tile is not None:
+            tile.deleteLater()
+
+    ### PUTS THE LANE IN THE GIVEN ORDER; GRID CELLS ARE REASSIGNED FROM THE FIRST DIFFERENCE ON ###
+    # tiles of the lane that aren't in the new order are destroyed
+    def set_order(self, tiles: list[ROTile]) -> None:
+        first = next((i for i, (a, b) in enumerate(zip(self._order, tiles)) if a is not b),
+                     min(len(self._order), len(tiles)))
+        if first == len(self._order) == len(tiles):
+            return
+        keep = {id(t) for t in tiles}
+        for tile in self._order:
+            if id(tile) not in keep:
+                # gone from the lane: tiles moving lanes were already taken out by the caller
+                self._grid.removeWidget(tile)
+                tile.setParent(None)
+                tile.deleteLater()
+        for tile in tiles:
+            if tile.ro_id not in self._by_ro:
+                self._prepare(tile)
+        self._order = list(tiles)
+        self._by_ro = {t.ro_id: t for t in self._order}
+        self._relayout(start=first)
+
+    def _prepare(self, tile: ROTile) -> None:
+        tile.setSizePolicy(QtWidgets.QSizePolicy.Policy.Fixed, QtWidgets.QSizePolicy.Policy.Maximum)
+        if not tile.sizeHint().isValid() or tile.sizeHint().width() < 150:
+            tile.setFixedWidth(200)
 
 
     def add_tile(self, tile: ROTile, row: int = None, col: int = None):
@@ -321,6 +475,8 @@ class ROTileContainer(QtWidgets.QScrollArea):
         else:
             r, c = row, col
         self._grid.addWidget(tile, r, c)
+        self._order.append(tile)
+        self._by_ro[tile.ro_id] = tile
 
 
 
@@ -344,14 +500,11 @@ class ROTileContainer(QtWidgets.QScrollArea):
             self._relayout()
         super().resizeEvent(e)
 
-    def _relayout(self):
-        widgets = [self._grid.itemAt(i).widget() for i in range(self._grid.count())]
-        while self._grid.count():
-            self._grid.takeAt(0)
-        for i, wdg in enumerate(widgets):
-            r = i // self._columns
-            c = i % self._columns
-            self._grid.addWidget(wdg, r, c)
+    def _relayout(self, start: int = 0):
+        for wdg in self._order[start:]:
+            self._grid.removeWidget(wdg)
+        for i in range(start, len(self._order)):
+            self._grid.addWidget(self._order[i], i // self._columns, i % self._columns)
 
     def _take_out(self, tile: ROTile):
         # remove a specific tile from our grid
@@ -366,15 +519,21 @@ class ROTileContainer(QtWidgets.QScrollArea):
             w = it.widget()
             if w:
                 w.setParent(None)
+        if tile in self._order:
+            self._order.remove(tile)
+            self._by_ro.pop(tile.ro_id, None)
 
 
-    def filter_tiles(self, query: str):
+    # ro_ids: hits from SearchRepository.search_repair_orders; when given they decide instead of the tile text
+    def filter_tiles(self, query: str, ro_ids=None):
         grid = getattr(self, "_grid", None)
         if not grid:
             return
         for i in range(grid.count()):
             w = grid.itemAt(i).widget()
-            if hasattr(w, "matches"):
+            if ro_ids is not None and (query or "").strip() and hasattr(w, "ro_id"):
+                w.setVisible(w.ro_id in ro_ids)
+            elif hasattr(w, "matches"):
                 w.setVisible(w.matches(query))
         # optional: relayout after visibility changes
         self._relayout() if hasattr(self, "_relayout") else None
\ No newline at end of file
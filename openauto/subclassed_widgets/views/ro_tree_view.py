@@ -359,15 +359,17 @@ class ROTreeView(QtWidgets.QTreeView):
                 if kind in ("job", "subtotal"):
                     continue
                 
-                sku = m.index(cr, COL_SKU, job_idx).data()
-                ucost = m.index(cr, COL_UNIT_COST, job_idx).data()
-                desc = m.index(cr, COL_DESC, job_idx).data()
-                qty = m.index(cr, COL_QTY, job_idx).data()
-                price = m.index(cr, COL_SELL, job_idx).data()
-                hours = m.index(cr, COL_HOURS, job_idx).data()
-                rate = m.index(cr, COL_RATE, job_idx).data()
-                tax = m.index(cr, COL_TAX, job_idx).data()
-                total = m.index(cr, COL_TOTAL, job_idx).data()
+                # EditRole: the typed values (DisplayRole is formatted text)
+                edit = QtCore.Qt.ItemDataRole.EditRole
+                sku = m.index(cr, COL_SKU, job_idx).data(edit)
+                ucost = m.index(cr, COL_UNIT_COST, job_idx).data(edit)
+                desc = m.index(cr, COL_DESC, job_idx).data(edit)
+                qty = m.index(cr, COL_QTY, job_idx).data(edit)
+                price = m.index(cr, COL_SELL, job_idx).data(edit)
+                hours = m.index(cr, COL_HOURS, job_idx).data(edit)
+                rate = m.index(cr, COL_RATE, job_idx).data(edit)
+                tax = m.index(cr, COL_TAX, job_idx).data(edit)
+                total = m.index(cr, COL_TOTAL, job_idx).data(edit)
                 item_id = m.index(cr, 0, job_idx).data(ITEM_ID_ROLE)
 
                 # Legacy flattening: labor → qty=hours, unit_price=rate
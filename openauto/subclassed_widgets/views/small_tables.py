@@ -2,7 +2,8 @@ from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem
 from PyQt6 import QtWidgets, QtCore
 from PyQt6 import QtGui
 from PyQt6.QtWidgets import QStyledItemDelegate
-from openauto.repositories import customer_repository, vehicle_repository, settings_repository, db_handlers
+from openauto.repositories import customer_repository, vehicle_repository, settings_repository
+from openauto.subclassed_widgets.views.keyed_rows import KeyedRowsMixin
 import decimal
 import os
 
@@ -18,7 +19,10 @@ def apply_stylesheet(widget, relative_path):
     except FileNotFoundError:
         print(f"⚠️ Could not load theme: {theme_path}")
 
-class CustomerTableSmall(QtWidgets.QTableWidget):
+class CustomerTableSmall(KeyedRowsMixin, QtWidgets.QTableWidget):
+    KEY_COLUMN = 3
+    SORT_COLUMN = 0
+
     def __init__(self, parent=None):
         super().__init__(parent)
         customer_columns = ("LAST", "FIRST NAME", "PHONE", "ID")
@@ -30,34 +34,31 @@ class CustomerTableSmall(QtWidgets.QTableWidget):
         self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.verticalHeader().setVisible(False)
         # self.setAlternatingRowColors(True)
+        self._keyed_init()
         self.load_customer_data()
 
 
 
     def load_customer_data(self):
-        self.setRowCount(db_handlers.customer_rows())
         result = customer_repository.CustomerRepository.get_all_customer_names() or []
-        table_row = 0
-        for row in result:
-            for col in range(4):
-                item = QtWidgets.QTableWidgetItem(str(row[col]))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.setItem(table_row, col, item)
-            table_row += 1
+        self.load_rows(result)
 
     def update_customers(self, customer_small_data):
-        table_row = 0
-        self.setRowCount(db_handlers.customer_rows())
-        for row in customer_small_data:
-            for col in range(4):
-                item = QtWidgets.QTableWidgetItem(str(row[col]))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.setItem(table_row, col, item)
-            table_row += 1
+        self.sync_rows(customer_small_data)
+
+    def apply_row_changes(self, table, ids):
+        if table == "customers":
+            self.upsert_rows(customer_repository.CustomerRepository.get_customer_names_by_ids(ids))
+
+    def apply_row_deletes(self, table, ids):
+        if table == "customers":
+            self.remove_keys(ids)
 
 
 
-class VehicleTableSmall(QTableWidget):
+class VehicleTableSmall(KeyedRowsMixin, QTableWidget):
+    KEY_COLUMN = 5
+
     def __init__(self, parent=None):
         super().__init__(parent)
         vehicle_columns = ("YEAR", "MAKE", "MODEL","OWNER ID", "VIN", "VEHICLE ID")
@@ -71,28 +72,25 @@ class VehicleTableSmall(QTableWidget):
         self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.verticalHeader().setVisible(False)
         # self.setAlternatingRowColors(True)
+        self._keyed_init()
         self.load_vehicle_data()
 
     def load_vehicle_data(self):
-        self.setRowCount(db_handlers.vehicle_rows())
         result = vehicle_repository.VehicleRepository.get_all_vehicles() or []
-        table_row = 0
-        for row in result:
-            for col in range(6):
-                item = QtWidgets.QTableWidgetItem(str(row[col]))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.setItem(table_row, col, item)
-            table_row += 1
+        self.load_rows(result)
 
     def update_vehicles(self, vehicle_small_data):
-        self.setRowCount(db_handlers.vehicle_rows())
-        table_row = 0
-        for row in vehicle_small_data:
-            for col in range(6):
-                item = QtWidgets.QTableWidgetItem(str(row[col]))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.setItem(table_row, col, item)
-            table_row += 1
+        self.sync_rows(vehicle_small_data)
+
+    def apply_row_changes(self, table, ids):
+        if table == "vehicles":
+            self.upsert_rows(vehicle_repository.VehicleRepository.get_vehicles_by_ids(ids))
+
+    def apply_row_deletes(self, table, ids):
+        if table == "vehicles":
+            self.remove_keys(ids)
+        elif table == "customers":
+            self.remove_where(3, ids)
 
 ### SUBCLASSED QTABLEWIDGET TO SHOW PARTS MATRIX DATA ###
 class MatrixTable(QtWidgets.QTableWidget):
@@ -1,13 +1,15 @@
 from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtWidgets import QTableWidget, QApplication
 from PyQt6 import QtWidgets, QtCore, QtGui
-from openauto.repositories import db_handlers, customer_repository, vehicle_repository, repair_orders_repository
+from openauto.repositories import customer_repository, vehicle_repository, repair_orders_repository
 from openauto.managers.customer_options_manager import CustomerOptionsManager
 from openauto.managers.estimate_options_manager import EstimateOptionsManager
+from openauto.subclassed_widgets.models.keyset_table_model import KeysetTableModel
 
 
-### SUBCLASSED QTABLEWIDGET THAT LOADS ALL RECORDED CUSTOMERS AND CONTACT INFO STORED IN MYSQL ###
-class CustomerTable(QTableWidget):
+### SUBCLASSED QTABLEVIEW THAT PAGES IN RECORDED CUSTOMERS AND CONTACT INFO STORED IN MYSQL ###
+    # only the rows scrolled into view are fetched (KeysetTableModel.fetchMore), ordered by last name
+class CustomerTable(QtWidgets.QTableView):
     vehicle_signal_request = pyqtSignal(int)  ### PYQTSIGNALS FOR PUSHBUTTONS IN managers.customer_options_manager.py ###
     ro_signal_request = pyqtSignal()
     estimate_signal_request = pyqtSignal(int)
@@ -15,19 +17,23 @@ class CustomerTable(QTableWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         customer_table_names = ("LAST NAME", "FIRST NAME", "ADDRESS", "CITY", "STATE", "ZIP", "PHONE", "ALT PHONE", "EMAIL", "ID")
-        self.setColumnCount(10)
+        customer_repository.CustomerRepository.ensure_paging_index()
+        self.setModel(KeysetTableModel(customer_table_names,
+                                       customer_repository.CustomerRepository.get_customer_info_page,
+                                       key_column=9, cursor_columns=(0, 9),
+                                       fetch_keys=customer_repository.CustomerRepository.get_customer_info_by_ids,
+                                       parent=self))
         self.setColumnHidden(9, True)
         # self.setGridStyle(QtCore.Qt.PenStyle.DashDotLine)
         self.setShowGrid(False)
         self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
-        self.setHorizontalHeaderLabels(customer_table_names)
         self.verticalHeader().setVisible(False)
         self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         # self.setAlternatingRowColors(True)
         self.customer_id = None
         self.load_customer_data()
-        self.cellDoubleClicked.connect(self.options_load)
+        self.doubleClicked.connect(self.options_load)
 
     def options_load(self):
         self.get_customer_id()
@@ -45,44 +51,44 @@ class CustomerTable(QTableWidget):
 
 
 
-###  LOADS DATA FROM MYSQL TO CUSTOMERS PAGE.  FUNCTION IS ONLY CALLED ONCE ON STARTUP ###
+###  LOADS THE FIRST PAGE OF CUSTOMERS. LATER PAGES ARE FETCHED AS THE VIEW SCROLLS ###
     def load_customer_data(self):
-        self.setRowCount(db_handlers.customer_rows())
-        result = customer_repository.CustomerRepository.get_all_customer_info() or []
-        table_row = 0
-        for row in result:
-            for col in range(10):
-                item = QtWidgets.QTableWidgetItem(str(row[col]))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.setItem(table_row, col, item)
-                # self.setStyleSheet("background-color: #97aabd")
-            table_row += 1
+        self.model().reload()
+
+### NARROWS THE TABLE TO CUSTOMERS MATCHING text (RE-QUERIES, SO UNLOADED PAGES ARE SEARCHED TOO) ###
+    def set_search(self, text):
+        self.model().set_search(text)
 
+### SHOWS THE customer_ids FOUND BY THE SEARCH INDEX; matcher(row) DECIDES IF A LATER CHANGE STILL BELONGS ###
+    def show_matches(self, customer_ids, matcher):
+        self.model().show_keys(customer_ids, matcher)
 
-####  CONNECTED TO QTHREAD THAT MONITORS ALL MYSQL CHANGES FOR EVERY TABLE AND UPDATES QTABLEWIDGET ####
+
+####  CONNECTED TO QTHREAD THAT MONITORS ALL MYSQL CHANGES FOR EVERY TABLE AND UPDATES THE MODEL ####
+    # full snapshot (fallback polling): the loaded window is re-read and diffed
     def update_customers(self, customer_data):
-        table_row = 0
-        self.setRowCount(db_handlers.customer_rows())
-        for row in customer_data:
-            for col in range(10):
-                item = QtWidgets.QTableWidgetItem(str(row[col]))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.setItem(table_row, col, item)
-                # self.setStyleSheet("background-color: #97aabd")
+        self.model().refresh()
 
-            table_row += 1
+    # change feed: only the customers that changed are re-read
+    def apply_row_changes(self, table, ids):
+        if table == "customers":
+            self.model().upsert_rows(customer_repository.CustomerRepository.get_customer_info_by_ids(ids))
+
+    def apply_row_deletes(self, table, ids):
+        if table == "customers":
+            self.model().remove_keys(ids)
+
+    def currentRow(self):
+        return self.currentIndex().row()
+
+    def row_values(self, row):
+        return self.model().row_values(row)
 
 
     ### FINDS PRIMARY KEY ID FOR CUSTOMERS AND RETURNS IT TO MAKE CUSTOMER CHANGES ###
     def get_customer_id(self):
-        selected_row = self.currentRow()
-        selected_column = self.currentColumn()
-        selected_data = []
-        selected_name = self.itemAt(selected_row, selected_column)
-        for column in range(self.model().columnCount()):
-            index = self.model().index(selected_row, column)
-            selected_data.append(index.data())
-        self.customer_id = selected_data[9]
+        selected_data = self.row_values(self.currentRow())
+        self.customer_id = selected_data[9] if selected_data else None
 
 
 class EstimateTable(QTableWidget):
@@ -200,58 +206,74 @@ class CheckoutTable(QtWidgets.QTableWidget):
         self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
 
 
-### SUBCLASSED QTABLEWIDGET FOR vehicles DATABASE TABLE ###
-class VehicleTable(QtWidgets.QTableWidget):
+### SUBCLASSED QTABLEVIEW FOR vehicles DATABASE TABLE, PAGED IN BY MAKE ###
+class VehicleTable(QtWidgets.QTableView):
     ro_signal_request = pyqtSignal()
     def __init__(self, parent=None):
         super().__init__(parent)
-        vehicle_table_names = ("VIN", "YEAR", "MAKE", "MODEL", "ENGINE", "TRIM", "LAST NAME", "FIRST NAME", "ID")
-        self.setColumnCount(9)
+        vehicle_table_names = ("VIN", "YEAR", "MAKE", "MODEL", "ENGINE", "TRIM", "LAST NAME", "FIRST NAME", "ID", "VEHICLE ID")
+        vehicle_repository.VehicleRepository.ensure_paging_index()
+        self.setModel(KeysetTableModel(vehicle_table_names,
+                                       vehicle_repository.VehicleRepository.get_vehicle_info_page,
+                                       key_column=9, cursor_columns=(2, 9),
+                                       fetch_keys=lambda ids: vehicle_repository.VehicleRepository.get_vehicle_info_by_ids(vehicle_ids=ids),
+                                       parent=self))
         self.setColumnHidden(8, True)
+        self.setColumnHidden(9, True)
         self.clearSelection()
-        self.setRowCount(db_handlers.vehicle_rows())
         self.setGridStyle(QtCore.Qt.PenStyle.DashDotLine)
         self.setAlternatingRowColors(True)
         self.setShowGrid(False)
         self.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
-        self.setHorizontalHeaderLabels(vehicle_table_names)
         self.verticalHeader().setVisible(False)
         self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
         self.setFrameStyle(QtWidgets.QFrame.Shape.NoFrame)
         self.vehicle_id = None
         self.load_vehicle_data()
-        self.cellClicked.connect(self.copy_vin)
-        self.cellDoubleClicked.connect(self.on_vehicle_row_clicked)
+        self.clicked.connect(self.copy_vin)
+        self.doubleClicked.connect(self.on_vehicle_row_clicked)
 
 
-### INITIAL LOADING OF VEHICLE DATA FROM DATABASE TABLE TO THE QTABLEWIDGET. CALLED ONLY ONCE ####
+### INITIAL LOADING OF THE FIRST PAGE OF VEHICLES. LATER PAGES ARE FETCHED AS THE VIEW SCROLLS ####
     def load_vehicle_data(self):
-        result = vehicle_repository.VehicleRepository.get_all_vehicle_info() or []
-        table_row = 0
-        for row in result:
-            for col in range(9):
-                item = QtWidgets.QTableWidgetItem(str(row[col]))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.setItem(table_row, col, item)
-                # self.setStyleSheet("background-color: #97aabd")
+        self.model().reload()
 
-            table_row += 1
+    def set_search(self, text):
+        self.model().set_search(text)
 
+    def show_matches(self, vehicle_ids, matcher):
+        self.model().show_keys(vehicle_ids, matcher)
 
 
-### CONNECTED TO SQLMONITOR QTHREAD IN event_handlers TO DO REAL TIME UPDATES TO THE VEHICLE QTABLEWIDGET ###
-    def update_vehicles(self, vehicle_data):
-        self.setRowCount(db_handlers.vehicle_rows())
-        table_row = 0
-        for row in vehicle_data:
-            for col in range(9):
-                item = QtWidgets.QTableWidgetItem(str(row[col]))
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                self.setItem(table_row, col, item)
-                # self.setStyleSheet("background-color: #97aabd")
 
-            table_row += 1
+### CONNECTED TO SQLMONITOR QTHREAD IN event_handlers TO DO REAL TIME UPDATES TO THE VEHICLE MODEL ###
+    def update_vehicles(self, vehicle_data):
+        self.model().refresh()
+
+    def apply_row_changes(self, table, ids):
+        if table == "vehicles":
+            rows = vehicle_repository.VehicleRepository.get_vehicle_info_by_ids(vehicle_ids=ids)
+            # a vehicle that lost its owner drops out of the join, so it leaves the table too
+            found = {str(row[9]) for row in rows}
+            self.model().remove_keys([i for i in ids if str(i) not in found])
+            self.model().upsert_rows(rows)
+        elif table == "customers":
+            # owner names are shown on every vehicle row
+            self.model().upsert_rows(vehicle_repository.VehicleRepository.get_vehicle_info_by_ids(customer_ids=ids))
+
+    def apply_row_deletes(self, table, ids):
+        if table == "vehicles":
+            self.model().remove_keys(ids)
+        elif table == "customers":
+            # ON DELETE CASCADE doesn't fire the vehicles trigger
+            self.model().remove_where(8, ids)
+
+    def currentRow(self):
+        return self.currentIndex().row()
+
+    def row_values(self, row):
+        return self.model().row_values(row)
 
     def on_vehicle_row_clicked(self):
         self.get_vehicle_id()
@@ -259,13 +281,9 @@ class VehicleTable(QtWidgets.QTableWidget):
 
 
     def get_vehicle_id(self):
-        selected_row = self.currentRow()
-        selected_column = self.currentColumn()
-        selected_data = []
-        selected_name = self.itemAt(selected_row, selected_column)
-        for column in range(self.model().columnCount()):
-            index = self.model().index(selected_row, column)
-            selected_data.append(index.data())
+        selected_data = self.row_values(self.currentRow())
+        if not selected_data:
+            return
         self.vehicle_id = selected_data[8]
         # self.vehicle_id = vehicle_repository.VehicleRepository.get_vehicle_id_by_details(selected_data[:6])
         self.vin_veh_id = [selected_data[0], self.vehicle_id]
@@ -284,10 +302,7 @@ class VehicleTable(QtWidgets.QTableWidget):
             )
 
     def copy_vin(self):
-        row = self.currentRow()
-        item = self.item(row, 0)
-        if item:
+        selected_data = self.row_values(self.currentRow())
+        if selected_data:
             clipboard = QApplication.clipboard()
-            clipboard.setText(item.text())
-
-
+            clipboard.setText(selected_data[0])
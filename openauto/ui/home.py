@@ -1,9 +1,11 @@
 from PyQt6 import QtCore, QtWidgets, QtGui
 from PyQt6.QtGui import QDoubleValidator
 from openauto.ui.log_console import LogConsole
-from openauto.subclassed_widgets.views import small_tables, workflow_tables, apt_calendar, ro_tiles
+from openauto.subclassed_widgets.views import small_tables, workflow_tables, apt_calendar, ro_tiles, ro_board
 from openauto.subclassed_widgets import event_handlers
 from openauto.subclassed_widgets.models.ro_tree_model import ROTreeModel
+from openauto.services import search_index, ro_snapshot_cache
+from openauto.repositories import search_repository
 from openauto.ui import main_form
 from openauto.managers.ro_hub import ro_hub_manager
 from openauto.managers.parts_tree import parts_hub_manager
@@ -61,6 +63,7 @@ class MainWindow(QtWidgets.QMainWindow, main_form.Ui_MainWindow):
         self._init_tables()
         self._init_state()
         self._connect_signals()
+        self._prepare_search()
         self._set_privileges()
         self._setup_animations()
      #   self._set_all_buttons_flat(False)
@@ -91,6 +94,23 @@ class MainWindow(QtWidgets.QMainWindow, main_form.Ui_MainWindow):
 
 
 
+    ### SEARCH BACKENDS GET READY ON A WORKER: FULLTEXT INDEXES MAY NEED A TABLE REBUILD ON AN OLDER DATABASE ###
+    def _prepare_search(self):
+        # the in-memory indexes build on their own worker; FULLTEXT falls back to them if its DDL fails
+        self.customer_search_index.load_async()
+        self.vehicle_search_index.load_async()
+        if not search_repository.SearchRepository.configured():
+            return
+
+        class Task(QtCore.QRunnable):
+            def run(self_nonlocal):
+                try:
+                    search_repository.SearchRepository.ensure_indexes()
+                except Exception as e:
+                    print(f"[MainWindow] FULLTEXT search unavailable, using the local index: {e}")
+
+        QtCore.QThreadPool.globalInstance().start(Task())
+
     ### VALIDATORS TO ONLY ALLOW CERTAIN CHARACTERS ENTERED ###
     def _init_validators(self):
         self.float_validator = QDoubleValidator()
@@ -103,12 +123,15 @@ class MainWindow(QtWidgets.QMainWindow, main_form.Ui_MainWindow):
     def _init_tables(self):
         self.customer_table = workflow_tables.CustomerTable(parent=self)
         self.vehicle_table = workflow_tables.VehicleTable(parent=self)
+        self.customer_search_index = search_index.CustomerSearchIndex(parent=self)
+        self.vehicle_search_index = search_index.VehicleSearchIndex(parent=self)
         self.matrix_table = small_tables.MatrixTable(parent=self)
         self.labor_table = small_tables.LaborTable(parent=self)
-        self.estimate_tiles = ro_tiles.ROTileContainer(parent=self)
-        self.working_tiles = ro_tiles.ROTileContainer(parent=self)
-        self.approved_tiles = ro_tiles.ROTileContainer(parent=self)
-        self.checkout_tiles = ro_tiles.ROTileContainer(parent=self)
+        lane_cls = ro_board.ROBoardView if ro_board.enabled() else ro_tiles.ROTileContainer
+        self.estimate_tiles = lane_cls(parent=self)
+        self.working_tiles = lane_cls(parent=self)
+        self.approved_tiles = lane_cls(parent=self)
+        self.checkout_tiles = lane_cls(parent=self)
         self.schedule_calendar = apt_calendar.AptCalendar(parent=self)
         self.hourly_schedule_table = apt_calendar.HourlySchedule(parent=self)
         self.weekly_schedule_table = apt_calendar.WeeklySchedule(parent=self)
@@ -187,6 +210,11 @@ class MainWindow(QtWidgets.QMainWindow, main_form.Ui_MainWindow):
         self.customer_id = None
         self.vin = VIN
         self.current_ro_id = None
+        self._ro_search_text = ""
+        self._ro_search_timer = QtCore.QTimer(self)
+        self._ro_search_timer.setSingleShot(True)
+        self._ro_search_timer.setInterval(customer_manager.SEARCH_DEBOUNCE_MS)
+        self._ro_search_timer.timeout.connect(self._apply_ro_tile_filter)
         self.settings_manager.load_shop_info()
 
 
@@ -278,7 +306,23 @@ class MainWindow(QtWidgets.QMainWindow, main_form.Ui_MainWindow):
         self.weekly_schedule_table.appointment_options.connect(self._open_appointment_options)
         self.sql_monitor.customer_updates.connect(self.customer_table.update_customers)
         self.sql_monitor.ro_updates.connect(self.ro_hub_manager._on_status_changed)
+        ro_cache = ro_snapshot_cache.snapshot_cache()
+        self.sql_monitor.ro_changes.connect(ro_cache.invalidate)
+        self.sql_monitor.rows_updated.connect(ro_cache.apply_row_changes)
+        self.sql_monitor.rows_deleted.connect(ro_cache.apply_row_changes)
         self.sql_monitor.vehicle_update.connect(self.vehicle_table.update_vehicles)
+        # indexes first: a search result table asks them whether a changed row still matches
+        for index in (self.customer_search_index, self.vehicle_search_index):
+            self.sql_monitor.rows_inserted.connect(index.apply_row_changes)
+            self.sql_monitor.rows_updated.connect(index.apply_row_changes)
+            self.sql_monitor.rows_deleted.connect(index.apply_row_deletes)
+        self.sql_monitor.customer_updates.connect(self.customer_search_index.invalidate)
+        self.sql_monitor.customer_updates.connect(self.vehicle_search_index.invalidate)
+        self.sql_monitor.vehicle_update.connect(self.vehicle_search_index.invalidate)
+        for table in (self.customer_table, self.vehicle_table):
+            self.sql_monitor.rows_inserted.connect(table.apply_row_changes)
+            self.sql_monitor.rows_updated.connect(table.apply_row_changes)
+            self.sql_monitor.rows_deleted.connect(table.apply_row_deletes)
         self.sql_monitor.appointment_data.connect(lambda: self.weekly_schedule_table.load_appointments(self.schedule_calendar.selectedDate()))
         self.sql_monitor.appointment_data.connect(lambda: self.hourly_schedule_table.load_schedule_for_day(self.schedule_calendar.selectedDate()))
         self.messaging_button.clicked.connect(self.texting_not_ready)
@@ -372,9 +416,21 @@ class MainWindow(QtWidgets.QMainWindow, main_form.Ui_MainWindow):
         self.message.exec()
 
     def _filter_all_ro_tiles(self, text: str):
+        self._ro_search_text = text
+        if search_repository.SearchRepository.enabled() and text.strip():
+            self._ro_search_timer.start()  # one FULLTEXT query after typing pauses
+        else:
+            self._apply_ro_tile_filter()
+
+    def _apply_ro_tile_filter(self):
+        text = self._ro_search_text
+        ro_ids = None
+        if search_repository.SearchRepository.enabled() and text.strip():
+            ro_ids = set(search_repository.SearchRepository.search_repair_orders(
+                text, statuses=("open", "approved", "working", "checkout")))
         for lane in (self.estimate_tiles, self.working_tiles, self.approved_tiles, self.checkout_tiles):
             if hasattr(lane, "filter_tiles"):
-                lane.filter_tiles(text)
+                lane.filter_tiles(text, ro_ids)
 
     def _fix_ro_input_row_for_dpi(self):
         widgets = [
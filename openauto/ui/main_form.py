@@ -784,8 +784,6 @@ class Ui_MainWindow(object):
         self.customer_table.setStyleSheet("")
         self.customer_table.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
         self.customer_table.setObjectName("customer_table")
-        self.customer_table.setColumnCount(0)
-        self.customer_table.setRowCount(0)
         self.gridLayout_11.addWidget(self.customer_table, 0, 0, 1, 1)
         self.customer_tabs.addWidget(self.customer_tabsPage1)
         self.gridLayout.addWidget(self.customer_tabs, 1, 0, 1, 1)
@@ -875,8 +873,6 @@ class Ui_MainWindow(object):
         self.vehicle_table = VehicleTable(parent=self.vehicle_tabs_page)
         self.vehicle_table.setStyleSheet("")
         self.vehicle_table.setObjectName("vehicle_table")
-        self.vehicle_table.setColumnCount(0)
-        self.vehicle_table.setRowCount(0)
         self.gridLayout_19.addWidget(self.vehicle_table, 0, 0, 1, 1)
         self.vehicle_tabs.addWidget(self.vehicle_tabs_page)
         self.gridLayout_18.addWidget(self.vehicle_tabs, 1, 0, 1, 1)
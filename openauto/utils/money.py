@@ -1,4 +1,10 @@
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
+
+# fixed-point scales, matching the estimate_items columns
+CENTS = 2       # money: unit_price / unit_cost / totals are DECIMAL(12,2)
+MILLS = 3       # quantities and hours: qty is DECIMAL(9,3)
+PCT = 2         # tax_pct is DECIMAL(6,2), so 7.25% is 725
+
 
 def parse_money(text: str) -> float | None:
     t = (text or "").strip().replace(",", "").replace("$", "").replace("%", "")
@@ -11,4 +17,141 @@ def D(x, fallback="0") -> Decimal:
         s = str(x or "").replace(",", "").replace("$", "").strip()
         return Decimal(s if s != "" else fallback)
     except Exception:
-        return Decimal(fallback)
\ No newline at end of file
+        return Decimal(fallback)
+
+
+### n / d ROUNDED HALF AWAY FROM ZERO, LIKE MySQL ROUND() ON DECIMALS ###
+def round_div(n: int, d: int) -> int:
+    q, r = divmod(abs(n), d)
+    if 2 * r >= d:
+        q += 1
+    return -q if (n < 0) != (d < 0) else q
+
+
+### x SCALED BY 10**places TO AN int, ROUNDED HALF AWAY FROM ZERO; UNPARSEABLE INPUT IS 0 ###
+    # Floats go through their shortest repr ("1.005", not 1.00499999...), the same digits the cells show,
+    # and are split by hand so the hot paths (every cell edit, every loaded line) never build a Decimal.
+def to_units(x, places: int) -> int:
+    if x is None or x == "":
+        return 0
+    if isinstance(x, Money):
+        return round_div(x.cents * 10 ** places, 10 ** CENTS)
+    if isinstance(x, bool):
+        return int(x) * 10 ** places
+    if isinstance(x, int):
+        return x * 10 ** places
+    if isinstance(x, Decimal):
+        try:
+            return int(x.scaleb(places).to_integral_value(rounding=ROUND_HALF_UP))
+        except Exception:
+            return 0
+    s = (repr(x) if isinstance(x, float) else str(x)).strip().replace(",", "").replace("$", "").replace("%", "")
+    neg = s.startswith("-")
+    if neg or s.startswith("+"):
+        s = s[1:]
+    whole, _, frac = s.partition(".")
+    if not (whole or frac) or not (whole or "0").isdigit() or not (frac or "0").isdigit():
+        # exponents, inf/nan and anything else unusual take the slow road
+        try:
+            return to_units(Decimal(("-" if neg else "") + s), places)
+        except Exception:
+            return 0
+    units = int(whole or "0") * 10 ** places + int((frac[:places] or "0").ljust(places, "0"))
+    if len(frac) > places and frac[places] >= "5":
+        units += 1
+    return -units if neg else units
+
+
+### x AS THE Decimal A DECIMAL(_, places) COLUMN WILL HOLD (SQL PARAMETERS) ###
+def fixed(x, places: int) -> Decimal:
+    return Decimal(to_units(x, places)).scaleb(-places)
+
+
+### AN AMOUNT OF MONEY AS WHOLE CENTS ###
+    # Immutable and hashable; + and - stay exact, anything that multiplies (qty x price, tax) goes through
+    # line_amounts so the rounding happens in one place. float() / decimal() are for Qt cells and SQL only.
+class Money:
+    __slots__ = ("cents",)
+
+    def __init__(self, cents: int = 0):
+        self.cents = int(cents)
+
+    @classmethod
+    def parse(cls, x) -> "Money":
+        return x if isinstance(x, Money) else cls(to_units(x, CENTS))
+
+    @classmethod
+    def sum(cls, values) -> "Money":
+        return cls(sum(cls.parse(v).cents for v in values))
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        if other == 0:
+            return self
+        return NotImplemented
+
+    __radd__ = __add__      # so sum() works from its int 0 start
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        if isinstance(other, int) and other == 0:
+            return self.cents == 0
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Money):
+            return self.cents <= other.cents
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    def __float__(self):
+        return self.cents / 100
+
+    def decimal(self) -> Decimal:
+        return Decimal(self.cents).scaleb(-CENTS)
+
+    # "1234.50": what the totals labels, the cells and "%.2f" in the print templates show
+    def __str__(self):
+        sign = "-" if self.cents < 0 else ""
+        whole, cents = divmod(abs(self.cents), 100)
+        return f"{sign}{whole}.{cents:02d}"
+
+    def __format__(self, spec):
+        return format(self.decimal(), spec) if spec else str(self)
+
+    def __repr__(self):
+        return f"Money({self})"
+
+
+### (base, total) OF ONE LINE: qty x price, AND THAT WITH tax_pct ADDED, EACH ROUNDED ONCE TO CENTS ###
+    # base is estimate_items.line_total (ROUND(qty * unit_price, 2)); total is the per-line tax-inclusive amount
+    # RepairOrdersRepository.estimate_total_for_ro sums. Labor passes hours and rate.
+def line_amounts(qty, price, tax_pct=0) -> tuple[Money, Money]:
+    product = to_units(qty, MILLS) * to_units(price, CENTS)        # cents x 10**MILLS
+    base = round_div(product, 10 ** MILLS)
+    scale = 100 * 10 ** PCT                                          # 100% in tax_pct units
+    total = round_div(product * (scale + to_units(tax_pct, PCT)), 10 ** MILLS * scale)
+    return Money(base), Money(total)
@@ -28,6 +28,19 @@ CREATE TABLE `appointments` (
 /*!40101 SET character_set_client = @saved_cs_client */;
 /*!40101 SET @saved_cs_client     = @@character_set_client */;
 /*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `change_log` (
+  `seq` bigint unsigned NOT NULL AUTO_INCREMENT,
+  `table_name` varchar(32) NOT NULL,
+  `row_id` int unsigned NOT NULL,
+  `ro_id` int DEFAULT NULL,
+  `op` enum('insert','update','delete') NOT NULL,
+  `changed_at` timestamp(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+  PRIMARY KEY (`seq`),
+  KEY `ix_change_log_changed_at` (`changed_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `customers` (
   `last_name` varchar(30) DEFAULT NULL,
   `first_name` varchar(30) NOT NULL,
@@ -40,7 +53,9 @@ CREATE TABLE `customers` (
   `email` varchar(100) DEFAULT NULL,
   `customer_id` int NOT NULL AUTO_INCREMENT,
   `archived` tinyint(1) DEFAULT (0),
-  PRIMARY KEY (`customer_id`)
+  PRIMARY KEY (`customer_id`),
+  KEY `ix_customers_last_name` (`last_name`,`customer_id`),
+  FULLTEXT KEY `ft_customers_search` (`last_name`,`first_name`,`phone`,`alt_phone`,`email`) /*!50100 WITH PARSER `ngram` */ 
 ) ENGINE=InnoDB AUTO_INCREMENT=59 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 /*!40101 SET @saved_cs_client     = @@character_set_client */;
@@ -117,6 +132,9 @@ CREATE TABLE `estimates` (
   `assigned_tech_id` int DEFAULT NULL,
   `ro_id` int DEFAULT NULL,
   `internal_memo` text,
+  `subtotal` decimal(12,2) NOT NULL DEFAULT '0.00',
+  `grand_total` decimal(12,2) NOT NULL DEFAULT '0.00',
+  `tax_total` decimal(12,2) GENERATED ALWAYS AS ((`grand_total` - `subtotal`)) STORED,
   PRIMARY KEY (`id`),
   KEY `customer_id` (`customer_id`),
   KEY `idx_est_writer` (`assigned_writer_id`),
@@ -385,6 +403,8 @@ CREATE TABLE `repair_orders` (
   KEY `fk_ro_tech` (`assigned_tech_id`),
   KEY `ix_ro_estimate` (`estimate_id`),
   KEY `ix_ro_status` (`status`,`approved_at`),
+  KEY `ix_ro_status_number` (`status`,`ro_number`,`id`),
+  FULLTEXT KEY `ft_repair_orders_search` (`ro_number`) /*!50100 WITH PARSER `ngram` */ ,
   CONSTRAINT `fk_ro_created_by` FOREIGN KEY (`created_by`) REFERENCES `users` (`id`) ON DELETE SET NULL ON UPDATE CASCADE,
   CONSTRAINT `fk_ro_estimate` FOREIGN KEY (`estimate_id`) REFERENCES `estimates` (`id`) ON DELETE SET NULL ON UPDATE CASCADE,
   CONSTRAINT `fk_ro_tech` FOREIGN KEY (`assigned_tech_id`) REFERENCES `users` (`id`) ON DELETE SET NULL ON UPDATE CASCADE,
@@ -418,6 +438,14 @@ CREATE TABLE `ro_c3_lines` (
 /*!40101 SET character_set_client = @saved_cs_client */;
 /*!40101 SET @saved_cs_client     = @@character_set_client */;
 /*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `ro_number_sequence` (
+  `year` smallint unsigned NOT NULL,
+  `n` int unsigned NOT NULL,
+  PRIMARY KEY (`year`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
 CREATE TABLE `shop_info` (
   `shop_name` varchar(255) DEFAULT NULL,
   `facility_id` varchar(255) DEFAULT NULL,
@@ -503,10 +531,37 @@ CREATE TABLE `vehicles` (
   PRIMARY KEY (`id`),
   UNIQUE KEY `uq_vehicles_vin` (`vin`),
   KEY `idx_vehicles_customer` (`customer_id`),
+  KEY `ix_vehicles_make` (`make`,`id`),
   KEY `idx_vehicles_plate_state` (`plate`,`plate_state`),
+  FULLTEXT KEY `ft_vehicles_search` (`vin`,`plate`,`make`,`model`) /*!50100 WITH PARSER `ngram` */ ,
   CONSTRAINT `fk_vehicles_customer` FOREIGN KEY (`customer_id`) REFERENCES `customers` (`customer_id`) ON DELETE CASCADE
 ) ENGINE=InnoDB AUTO_INCREMENT=36 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
+DELIMITER ;;
+CREATE TRIGGER trg_customers_insert_log AFTER INSERT ON customers FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('customers', NEW.customer_id, NULL, 'insert') ;;
+CREATE TRIGGER trg_customers_update_log AFTER UPDATE ON customers FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('customers', NEW.customer_id, NULL, 'update') ;;
+CREATE TRIGGER trg_customers_delete_log AFTER DELETE ON customers FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('customers', OLD.customer_id, NULL, 'delete') ;;
+CREATE TRIGGER trg_vehicles_insert_log AFTER INSERT ON vehicles FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('vehicles', NEW.id, NULL, 'insert') ;;
+CREATE TRIGGER trg_vehicles_update_log AFTER UPDATE ON vehicles FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('vehicles', NEW.id, NULL, 'update') ;;
+CREATE TRIGGER trg_vehicles_delete_log AFTER DELETE ON vehicles FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('vehicles', OLD.id, NULL, 'delete') ;;
+CREATE TRIGGER trg_appointments_insert_log AFTER INSERT ON appointments FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('appointments', NEW.id, NULL, 'insert') ;;
+CREATE TRIGGER trg_appointments_update_log AFTER UPDATE ON appointments FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('appointments', NEW.id, NULL, 'update') ;;
+CREATE TRIGGER trg_appointments_delete_log AFTER DELETE ON appointments FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('appointments', OLD.id, NULL, 'delete') ;;
+CREATE TRIGGER trg_repair_orders_insert_log AFTER INSERT ON repair_orders FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('repair_orders', NEW.id, NEW.id, 'insert') ;;
+CREATE TRIGGER trg_repair_orders_update_log AFTER UPDATE ON repair_orders FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('repair_orders', NEW.id, NEW.id, 'update') ;;
+CREATE TRIGGER trg_repair_orders_delete_log AFTER DELETE ON repair_orders FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('repair_orders', OLD.id, OLD.id, 'delete') ;;
+CREATE TRIGGER trg_estimate_jobs_insert_log AFTER INSERT ON estimate_jobs FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('estimate_jobs', NEW.id, (SELECT e.ro_id FROM estimates e WHERE e.id = NEW.estimate_id), 'insert') ;;
+CREATE TRIGGER trg_estimate_jobs_update_log AFTER UPDATE ON estimate_jobs FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('estimate_jobs', NEW.id, (SELECT e.ro_id FROM estimates e WHERE e.id = NEW.estimate_id), 'update') ;;
+CREATE TRIGGER trg_estimate_jobs_delete_log AFTER DELETE ON estimate_jobs FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('estimate_jobs', OLD.id, (SELECT e.ro_id FROM estimates e WHERE e.id = OLD.estimate_id), 'delete') ;;
+CREATE TRIGGER trg_estimate_items_insert_log AFTER INSERT ON estimate_items FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('estimate_items', NEW.id, NEW.ro_id, 'insert') ;;
+CREATE TRIGGER trg_estimate_items_update_log AFTER UPDATE ON estimate_items FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('estimate_items', NEW.id, NEW.ro_id, 'update') ;;
+CREATE TRIGGER trg_estimate_items_delete_log AFTER DELETE ON estimate_items FOR EACH ROW INSERT INTO change_log (table_name, row_id, ro_id, op) VALUES ('estimate_items', OLD.id, OLD.ro_id, 'delete') ;;
+CREATE TRIGGER trg_estimate_items_insert_totals AFTER INSERT ON estimate_items FOR EACH ROW UPDATE estimates SET subtotal = subtotal + ROUND(COALESCE(NEW.qty, 1) * COALESCE(NEW.unit_price, 0), 2), grand_total = grand_total + ROUND(COALESCE(NEW.qty, 1) * COALESCE(NEW.unit_price, 0) * (1 + (CASE WHEN NEW.taxable = 1 THEN COALESCE(NEW.tax_pct, 0) / 100 ELSE 0 END)), 2) WHERE id = NEW.estimate_id AND (NEW.status <> 'declined' AND NOT EXISTS (SELECT 1 FROM estimate_jobs jd WHERE jd.id = NEW.job_id AND jd.status = 'declined')) ;;
+CREATE TRIGGER trg_estimate_items_update_totals AFTER UPDATE ON estimate_items FOR EACH ROW BEGIN IF NOT (OLD.estimate_id <=> NEW.estimate_id) OR NOT (OLD.job_id <=> NEW.job_id) OR NOT (OLD.status <=> NEW.status) OR NOT (OLD.qty <=> NEW.qty) OR NOT (OLD.unit_price <=> NEW.unit_price) OR NOT (OLD.taxable <=> NEW.taxable) OR NOT (OLD.tax_pct <=> NEW.tax_pct) THEN UPDATE estimates SET subtotal = subtotal - ROUND(COALESCE(OLD.qty, 1) * COALESCE(OLD.unit_price, 0), 2), grand_total = grand_total - ROUND(COALESCE(OLD.qty, 1) * COALESCE(OLD.unit_price, 0) * (1 + (CASE WHEN OLD.taxable = 1 THEN COALESCE(OLD.tax_pct, 0) / 100 ELSE 0 END)), 2) WHERE id = OLD.estimate_id AND (OLD.status <> 'declined' AND NOT EXISTS (SELECT 1 FROM estimate_jobs jd WHERE jd.id = OLD.job_id AND jd.status = 'declined')); UPDATE estimates SET subtotal = subtotal + ROUND(COALESCE(NEW.qty, 1) * COALESCE(NEW.unit_price, 0), 2), grand_total = grand_total + ROUND(COALESCE(NEW.qty, 1) * COALESCE(NEW.unit_price, 0) * (1 + (CASE WHEN NEW.taxable = 1 THEN COALESCE(NEW.tax_pct, 0) / 100 ELSE 0 END)), 2) WHERE id = NEW.estimate_id AND (NEW.status <> 'declined' AND NOT EXISTS (SELECT 1 FROM estimate_jobs jd WHERE jd.id = NEW.job_id AND jd.status = 'declined')); END IF; END ;;
+CREATE TRIGGER trg_estimate_items_delete_totals AFTER DELETE ON estimate_items FOR EACH ROW UPDATE estimates SET subtotal = subtotal - ROUND(COALESCE(OLD.qty, 1) * COALESCE(OLD.unit_price, 0), 2), grand_total = grand_total - ROUND(COALESCE(OLD.qty, 1) * COALESCE(OLD.unit_price, 0) * (1 + (CASE WHEN OLD.taxable = 1 THEN COALESCE(OLD.tax_pct, 0) / 100 ELSE 0 END)), 2) WHERE id = OLD.estimate_id AND (OLD.status <> 'declined' AND NOT EXISTS (SELECT 1 FROM estimate_jobs jd WHERE jd.id = OLD.job_id AND jd.status = 'declined')) ;;
+CREATE TRIGGER trg_estimate_jobs_update_totals AFTER UPDATE ON estimate_jobs FOR EACH ROW BEGIN IF (OLD.status = 'declined') <> (NEW.status = 'declined') THEN IF NEW.status = 'declined' THEN UPDATE estimates e JOIN (SELECT COALESCE(SUM(ROUND(COALESCE(i.qty, 1) * COALESCE(i.unit_price, 0), 2)), 0) AS s, COALESCE(SUM(ROUND(COALESCE(i.qty, 1) * COALESCE(i.unit_price, 0) * (1 + (CASE WHEN i.taxable = 1 THEN COALESCE(i.tax_pct, 0) / 100 ELSE 0 END)), 2)), 0) AS g FROM estimate_items i WHERE i.job_id = NEW.id AND i.status <> 'declined') x SET e.subtotal = e.subtotal - x.s, e.grand_total = e.grand_total - x.g WHERE e.id = NEW.estimate_id; ELSE UPDATE estimates e JOIN (SELECT COALESCE(SUM(ROUND(COALESCE(i.qty, 1) * COALESCE(i.unit_price, 0), 2)), 0) AS s, COALESCE(SUM(ROUND(COALESCE(i.qty, 1) * COALESCE(i.unit_price, 0) * (1 + (CASE WHEN i.taxable = 1 THEN COALESCE(i.tax_pct, 0) / 100 ELSE 0 END)), 2)), 0) AS g FROM estimate_items i WHERE i.job_id = NEW.id AND i.status <> 'declined') x SET e.subtotal = e.subtotal + x.s, e.grand_total = e.grand_total + x.g WHERE e.id = NEW.estimate_id; END IF; END IF; END ;;
+CREATE TRIGGER trg_estimate_jobs_delete_totals BEFORE DELETE ON estimate_jobs FOR EACH ROW BEGIN IF OLD.status = 'declined' THEN UPDATE estimates e JOIN (SELECT COALESCE(SUM(ROUND(COALESCE(i.qty, 1) * COALESCE(i.unit_price, 0), 2)), 0) AS s, COALESCE(SUM(ROUND(COALESCE(i.qty, 1) * COALESCE(i.unit_price, 0) * (1 + (CASE WHEN i.taxable = 1 THEN COALESCE(i.tax_pct, 0) / 100 ELSE 0 END)), 2)), 0) AS g FROM estimate_items i WHERE i.job_id = OLD.id AND i.status <> 'declined') x SET e.subtotal = e.subtotal + x.s, e.grand_total = e.grand_total + x.g WHERE e.id = OLD.estimate_id; END IF; END ;;
+DELIMITER ;
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
 
 /*!40101 SET SQL_MODE=@OLD_SQL_MODE */;